@@ -0,0 +1,371 @@
+"""
+Measures the overhead of the voice pipeline itself, using scripted STT, LLM and TTS models that
+take a fixed amount of time, so nothing goes over the network. Run it via:
+`python -m examples.voice.benchmark.main --sessions 50`
+
+For every session, it records the time from the end of speech (when the pipeline is run) to the
+first audio, and the gaps between audio chunks. It reports those with the CPU time and memory
+used per session, and the latency the scripted models account for on their own.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import tracemalloc
+from collections.abc import AsyncIterator
+from dataclasses import asdict, dataclass
+
+import numpy as np
+from openai.types.responses import (
+    Response,
+    ResponseCompletedEvent,
+    ResponseOutputMessage,
+    ResponseOutputText,
+    ResponseTextDeltaEvent,
+)
+
+from agents import Agent, set_tracing_disabled
+from agents.agent_output import AgentOutputSchemaBase
+from agents.handoffs import Handoff
+from agents.items import ModelResponse, TResponseInputItem, TResponseStreamEvent
+from agents.model_settings import ModelSettings
+from agents.models.interface import Model, ModelTracing
+from agents.tool import Tool
+from agents.voice import (
+    AudioInput,
+    SingleAgentVoiceWorkflow,
+    StreamedAudioInput,
+    StreamedTranscriptionSession,
+    STTModel,
+    STTModelSettings,
+    TTSModel,
+    TTSModelSettings,
+    TTSScheduler,
+    VoicePipeline,
+    VoicePipelineConfig,
+)
+
+SAMPLE_RATE = 24000
+SENTENCE = "This is a scripted sentence that the benchmark model streams word by word."
+
+
+@dataclass
+class BenchmarkConfig:
+    sessions: int = 10
+    """The number of sessions that run at the same time."""
+
+    sentences: int = 5
+    """The number of sentences in each response."""
+
+    stt_latency_ms: float = 200
+    """How long the STT model takes to transcribe the audio."""
+
+    llm_first_token_ms: float = 300
+    """How long the LLM takes to stream its first word."""
+
+    llm_words_per_second: float = 40
+    """How fast the LLM streams words after the first one."""
+
+    tts_first_byte_ms: float = 150
+    """How long the TTS model takes to stream its first audio chunk."""
+
+    tts_chunk_ms: float = 20
+    """The length of the audio in each TTS chunk."""
+
+    tts_realtime_factor: float = 4
+    """How much faster than real time the TTS model produces audio."""
+
+    buffer_size: int = TTSModelSettings.buffer_size
+    """The number of TTS chunks the pipeline buffers before it emits audio."""
+
+    tts_concurrency: int | None = None
+    """The maximum number of concurrent TTS requests across all sessions. If not set, the
+    process-wide TTS scheduler is used."""
+
+    track_memory: bool = False
+    """Whether to measure the memory used per session with tracemalloc, which slows things down."""
+
+
+class ScriptedSTTModel(STTModel):
+    def __init__(self, config: BenchmarkConfig):
+        self.config = config
+
+    @property
+    def model_name(self) -> str:
+        return "scripted_stt"
+
+    async def transcribe(
+        self,
+        input: AudioInput,
+        settings: STTModelSettings,
+        trace_include_sensitive_data: bool,
+        trace_include_sensitive_audio_data: bool,
+    ) -> str:
+        await asyncio.sleep(self.config.stt_latency_ms / 1000)
+        return "Tell me something."
+
+    async def create_session(
+        self,
+        input: StreamedAudioInput,
+        settings: STTModelSettings,
+        trace_include_sensitive_data: bool,
+        trace_include_sensitive_audio_data: bool,
+    ) -> StreamedTranscriptionSession:
+        raise NotImplementedError("The benchmark only runs single-turn sessions")
+
+
+class ScriptedLLM(Model):
+    """Streams the same response word by word, at a fixed rate."""
+
+    def __init__(self, config: BenchmarkConfig):
+        self.config = config
+        self.text = " ".join([SENTENCE] * config.sentences)
+
+    async def get_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *,
+        previous_response_id: str | None,
+    ) -> ModelResponse:
+        raise NotImplementedError("The voice workflow streams its responses")
+
+    async def stream_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *,
+        previous_response_id: str | None,
+    ) -> AsyncIterator[TResponseStreamEvent]:
+        await asyncio.sleep(self.config.llm_first_token_ms / 1000)
+        for i, word in enumerate(self.text.split(" ")):
+            if i:
+                await asyncio.sleep(1 / self.config.llm_words_per_second)
+            yield ResponseTextDeltaEvent(
+                content_index=0,
+                delta=word if i == 0 else f" {word}",
+                type="response.output_text.delta",
+                output_index=0,
+                item_id="msg",
+            )
+
+        message = ResponseOutputMessage(
+            id="msg",
+            type="message",
+            role="assistant",
+            content=[ResponseOutputText(text=self.text, type="output_text", annotations=[])],
+            status="completed",
+        )
+        yield ResponseCompletedEvent(
+            type="response.completed",
+            response=Response(
+                id="resp",
+                created_at=0,
+                model="scripted_llm",
+                object="response",
+                output=[message],
+                tool_choice="none",
+                tools=[],
+                parallel_tool_calls=False,
+            ),
+        )
+
+
+class ScriptedTTSModel(TTSModel):
+    """Streams silence, as long as the text would take to say, faster than real time."""
+
+    def __init__(self, config: BenchmarkConfig):
+        self.config = config
+        samples = int(SAMPLE_RATE * config.tts_chunk_ms / 1000)
+        self.chunk = np.zeros(samples, dtype=np.int16).tobytes()
+
+    @property
+    def model_name(self) -> str:
+        return "scripted_tts"
+
+    async def run(self, text: str, settings: TTSModelSettings) -> AsyncIterator[bytes]:
+        # Roughly 60ms of speech per character
+        num_chunks = max(1, int(len(text) * 60 / self.config.tts_chunk_ms))
+        await asyncio.sleep(self.config.tts_first_byte_ms / 1000)
+        for i in range(num_chunks):
+            if i:
+                await asyncio.sleep(
+                    self.config.tts_chunk_ms / self.config.tts_realtime_factor / 1000
+                )
+            yield self.chunk
+
+
+@dataclass
+class SessionStats:
+    first_audio_ms: float
+    gaps_ms: list[float]
+    audio_events: int
+
+
+@dataclass
+class BenchmarkReport:
+    sessions: int
+    model_latency_floor_ms: float
+    first_audio_p50_ms: float
+    first_audio_p95_ms: float
+    first_audio_max_ms: float
+    overhead_p50_ms: float
+    gap_p50_ms: float
+    gap_p95_ms: float
+    gap_max_ms: float
+    jitter_ms: float
+    cpu_per_session_ms: float
+    memory_per_session_kib: float | None
+
+
+async def run_session(
+    config: BenchmarkConfig, llm: ScriptedLLM, scheduler: TTSScheduler | None
+) -> SessionStats:
+    pipeline = VoicePipeline(
+        workflow=SingleAgentVoiceWorkflow(Agent(name="Assistant", model=llm)),
+        stt_model=ScriptedSTTModel(config),
+        tts_model=ScriptedTTSModel(config),
+        config=VoicePipelineConfig(
+            tracing_disabled=True,
+            tts_settings=TTSModelSettings(buffer_size=config.buffer_size),
+            tts_scheduler=scheduler,
+        ),
+    )
+    audio_input = AudioInput(buffer=np.zeros(SAMPLE_RATE, dtype=np.int16))
+
+    end_of_speech = time.perf_counter()
+    result = await pipeline.run(audio_input)
+    arrivals: list[float] = []
+    async for event in result.stream():
+        if event.type == "voice_stream_event_audio":
+            arrivals.append(time.perf_counter())
+
+    return SessionStats(
+        first_audio_ms=(arrivals[0] - end_of_speech) * 1000,
+        gaps_ms=[(b - a) * 1000 for a, b in zip(arrivals, arrivals[1:])],
+        audio_events=len(arrivals),
+    )
+
+
+def model_latency_floor_ms(config: BenchmarkConfig) -> float:
+    """The time to first audio the scripted models account for, without any pipeline overhead."""
+    words_in_first_sentence = len(SENTENCE.split(" "))
+    first_sentence_ms = (words_in_first_sentence - 1) / config.llm_words_per_second * 1000
+    tts_chunks_in_first_buffer = min(
+        config.buffer_size, max(1, int(len(SENTENCE) * 60 / config.tts_chunk_ms))
+    )
+    first_buffer_ms = (
+        (tts_chunks_in_first_buffer - 1) * config.tts_chunk_ms / config.tts_realtime_factor
+    )
+    return (
+        config.stt_latency_ms
+        + config.llm_first_token_ms
+        + first_sentence_ms
+        + config.tts_first_byte_ms
+        + first_buffer_ms
+    )
+
+
+def _percentile(values: list[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(percentile * len(ordered)))]
+
+
+async def run_benchmark(config: BenchmarkConfig) -> BenchmarkReport:
+    set_tracing_disabled(True)
+    llm = ScriptedLLM(config)
+    scheduler = TTSScheduler(config.tts_concurrency) if config.tts_concurrency else None
+
+    if config.track_memory:
+        tracemalloc.start()
+    cpu_start = time.process_time()
+    stats = await asyncio.gather(
+        *(run_session(config, llm, scheduler) for _ in range(config.sessions))
+    )
+    cpu_ms = (time.process_time() - cpu_start) * 1000
+    memory_kib = None
+    if config.track_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        memory_kib = peak / 1024 / config.sessions
+
+    first_audio = [session.first_audio_ms for session in stats]
+    gaps = [gap for session in stats for gap in session.gaps_ms]
+    floor = model_latency_floor_ms(config)
+    return BenchmarkReport(
+        sessions=config.sessions,
+        model_latency_floor_ms=floor,
+        first_audio_p50_ms=_percentile(first_audio, 0.5),
+        first_audio_p95_ms=_percentile(first_audio, 0.95),
+        first_audio_max_ms=max(first_audio),
+        overhead_p50_ms=_percentile(first_audio, 0.5) - floor,
+        gap_p50_ms=_percentile(gaps, 0.5),
+        gap_p95_ms=_percentile(gaps, 0.95),
+        gap_max_ms=max(gaps, default=0.0),
+        jitter_ms=statistics.pstdev(gaps) if gaps else 0.0,
+        cpu_per_session_ms=cpu_ms / config.sessions,
+        memory_per_session_kib=memory_kib,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    defaults = BenchmarkConfig()
+    parser.add_argument("--sessions", type=int, default=defaults.sessions)
+    parser.add_argument("--sentences", type=int, default=defaults.sentences)
+    parser.add_argument("--stt-latency-ms", type=float, default=defaults.stt_latency_ms)
+    parser.add_argument("--llm-first-token-ms", type=float, default=defaults.llm_first_token_ms)
+    parser.add_argument("--llm-words-per-second", type=float, default=defaults.llm_words_per_second)
+    parser.add_argument("--tts-first-byte-ms", type=float, default=defaults.tts_first_byte_ms)
+    parser.add_argument("--tts-chunk-ms", type=float, default=defaults.tts_chunk_ms)
+    parser.add_argument("--tts-realtime-factor", type=float, default=defaults.tts_realtime_factor)
+    parser.add_argument("--buffer-size", type=int, default=defaults.buffer_size)
+    parser.add_argument("--tts-concurrency", type=int, default=defaults.tts_concurrency)
+    parser.add_argument("--memory", action="store_true", help="Measure memory per session")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    config = BenchmarkConfig(
+        sessions=args.sessions,
+        sentences=args.sentences,
+        stt_latency_ms=args.stt_latency_ms,
+        llm_first_token_ms=args.llm_first_token_ms,
+        llm_words_per_second=args.llm_words_per_second,
+        tts_first_byte_ms=args.tts_first_byte_ms,
+        tts_chunk_ms=args.tts_chunk_ms,
+        tts_realtime_factor=args.tts_realtime_factor,
+        buffer_size=args.buffer_size,
+        tts_concurrency=args.tts_concurrency,
+        track_memory=args.memory,
+    )
+    report = asyncio.run(run_benchmark(config))
+
+    if args.json:
+        print(json.dumps(asdict(report), indent=2))
+        return
+    for name, value in asdict(report).items():
+        if isinstance(value, float):
+            value = f"{value:.2f}"
+        print(f"{name:>26}: {value}")
+
+
+if __name__ == "__main__":
+    main()
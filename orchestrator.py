@@ -3,11 +3,11 @@ from __future__ import annotations
 import argparse
 import asyncio
 import json
-from typing import Any, Dict, List
+from typing import Any, cast
 
 import openai
 
-from agents import Runner
+from agents import RunConfig, Runner, TResponseInputItem
 from agents.stream_events import RawResponsesStreamEvent, AgentUpdatedStreamEvent
 from csv_mcp.agents import (
     build_primary_interaction_agent,
@@ -16,6 +16,7 @@ from csv_mcp.agents import (
     QnAOutput,
 )
 from csv_loader import load_csv, write_csv, csv_string_to_dataframe, dataframe_to_csv_string
+from session_store import SessionStore
 
 
 async def stream_result(result_stream) -> Any:
@@ -42,7 +43,11 @@ async def stream_result(result_stream) -> Any:
 async def main() -> None:
     """Run the interactive CSV agent orchestration workflow."""
     parser = argparse.ArgumentParser(description="Interactive CSV Agent Orchestrator")
-    parser.add_argument("input_path", help="Path to the initial CSV file to load.")
+    parser.add_argument(
+        "input_path",
+        nargs="?",
+        help="Path to the CSV file to load. Optional when resuming a session that has data.",
+    )
     parser.add_argument(
         "--models",
         nargs="*",
@@ -54,6 +59,24 @@ async def main() -> None:
         action="store_true",
         help="Stream agent responses to the console",
     )
+    parser.add_argument(
+        "--chain",
+        action="store_true",
+        help="Chain turns on the server via previous_response_id instead of resending the whole "
+        "conversation (and dataset) every turn. Requires the Responses API.",
+    )
+    parser.add_argument(
+        "--session-db",
+        default="orchestrator_sessions.db",
+        help="SQLite database that sessions are persisted to.",
+    )
+    parser.add_argument("--session", help="ID of a previous session to resume.")
+    parser.add_argument(
+        "--tail",
+        type=int,
+        default=20,
+        help="Number of recent messages sent verbatim; older ones are summarized.",
+    )
     args = parser.parse_args()
 
     models_config = {}
@@ -74,35 +97,79 @@ async def main() -> None:
         qna_agent_model=models_config.get("qna", "gpt-4.1"),
     )
 
-    async def run_agent(messages: list[dict]):
-        if args.stream:
-            result_stream = Runner.run_streamed(primary_agent, messages)
-            final = await stream_result(result_stream)
-            return final
-        result = await Runner.run(primary_agent, messages)
-        return result.final_output
-
-    try:
-        current_data_rows: List[Dict[str, Any]] = load_csv(args.input_path)
-        print(f"Successfully loaded {len(current_data_rows)} rows from {args.input_path}")
-    except FileNotFoundError:
-        print(f"CSV file not found: {args.input_path}")
-        return
-    except ValueError as e:
-        print(f"Invalid CSV: {e}")
-        return
-    except Exception as e:
-        print(f"Error loading CSV from {args.input_path}: {e}")
+    store = SessionStore(args.session_db)
+    if args.session:
+        try:
+            session = store.open_session(args.session)
+        except KeyError:
+            print(f"Unknown session: {args.session}")
+            return
+        print(f"Resumed session {session.session_id} ({session.message_count} messages)")
+    else:
+        session = store.create_session()
+        print(f"Started session {session.session_id}; resume it with --session <id>")
+
+    if args.input_path:
+        try:
+            current_data_rows: list[dict[str, Any]] = load_csv(args.input_path)
+            print(f"Successfully loaded {len(current_data_rows)} rows from {args.input_path}")
+        except FileNotFoundError:
+            print(f"CSV file not found: {args.input_path}")
+            return
+        except ValueError as e:
+            print(f"Invalid CSV: {e}")
+            return
+        except Exception as e:
+            print(f"Error loading CSV from {args.input_path}: {e}")
+            return
+
+        version = session.add_dataset_version(current_data_rows, source=args.input_path)
+        session.append_message(
+            "user", "Here is the data we will be working with:", dataset_version=version
+        )
+    elif session.latest_dataset() is None:
+        print("No data in this session yet; pass the path of a CSV file to load.")
         return
 
-    initial_data_message_content = (
-        f"Here is the data we will be working with: {json.dumps(current_data_rows)}"
-    )
-    current_conversation_messages: list[dict] = [
-        {"role": "user", "content": initial_data_message_content}
-    ]
+    run_config = RunConfig(auto_previous_response_id=args.chain)
+    last_response_id: str | None = None
+
+    async def run_agent(
+        extra_messages: list[TResponseInputItem] | None = None, record_chain: bool = True
+    ):
+        """Run the primary agent on the session history plus `extra_messages`. When chaining, only
+        the messages the server hasn't seen yet are sent."""
+        nonlocal last_response_id
+        previous_response_id, chained_upto = session.chain_state() if args.chain else (None, 0)
+        if previous_response_id is not None:
+            history = session.messages(after=chained_upto)
+        else:
+            history = session.context_view(tail=args.tail)
+        # The stored messages are plain role/content dicts, i.e. easy input messages
+        messages = cast(list[TResponseInputItem], history) + (extra_messages or [])
 
-    session_reports: List[Dict[str, Any]] = []
+        if args.stream:
+            result_stream = Runner.run_streamed(
+                primary_agent,
+                messages,
+                run_config=run_config,
+                previous_response_id=previous_response_id,
+            )
+            final = await stream_result(result_stream)
+            response_id = result_stream.last_response_id
+        else:
+            result = await Runner.run(
+                primary_agent,
+                messages,
+                run_config=run_config,
+                previous_response_id=previous_response_id,
+            )
+            final = result.final_output
+            response_id = result.last_response_id
+
+        if record_chain:
+            last_response_id = response_id
+        return final
 
     print(
         "Starting interactive CSV agent. Type 'quit' to exit, or 'summarize session' for a report."
@@ -118,6 +185,7 @@ async def main() -> None:
                 continue
 
             if user_query.lower() == "summarize session":
+                session_reports = session.reports()
                 if not session_reports:
                     print("Assistant: No reports generated yet in this session.")
                     continue
@@ -127,37 +195,37 @@ async def main() -> None:
                     f"Here are the session reports to summarize: {json.dumps(session_reports)}"
                 )
 
-                summary_messages = [
+                summary_messages: list[TResponseInputItem] = [
                     {"role": "system", "content": reports_message_content},
                     {"role": "user", "content": summary_request_message},
                 ]
 
                 print("Agent is generating session summary...")
-                assistant_response = await run_agent(
-                    current_conversation_messages + summary_messages
-                )
+                # Side question: don't move the chain forward, so the reports aren't part of it.
+                assistant_response = await run_agent(summary_messages, record_chain=False)
                 if assistant_response is None:
                     print("Assistant did not return a summary.")
                 else:
                     print(f"Assistant (Summary): {assistant_response}")
                 continue
 
-            current_conversation_messages.append({"role": "user", "content": user_query})
+            session.append_message("user", user_query)
 
             print("Agent is thinking...")
-            assistant_response = await run_agent(current_conversation_messages)
+            assistant_response = await run_agent()
             if assistant_response is None:
                 print("Assistant returned no output.")
                 continue
 
             display_response_str = ""
+            dataset_version: int | None = None
 
             if isinstance(assistant_response, TransformOutput):
                 display_response_str = (
                     f"Transformation Applied: {assistant_response.transform_summary}"
                 )
                 print(f"Assistant: {display_response_str}")
-                session_reports.append(
+                session.append_report(
                     {
                         "type": "transform",
                         "summary": assistant_response.transform_summary,
@@ -168,20 +236,16 @@ async def main() -> None:
                 )
 
                 new_data_rows = csv_string_to_dataframe(assistant_response.cleaned_data_csv_string)
-                current_data_rows = new_data_rows
+                dataset_version = session.add_dataset_version(new_data_rows, source="transform")
                 output_file = "output.csv"
-                write_csv(current_data_rows, output_file)
+                write_csv(new_data_rows, output_file)
                 print(f"Transformed data saved to {output_file}")
-                transformed_data_message = f"The data was just transformed. Here is the new data: {json.dumps(current_data_rows)}. Please use this for subsequent operations unless otherwise specified."
-                current_conversation_messages.append(
-                    {"role": "system", "content": transformed_data_message}
-                )
                 print("(System: Conversation context updated with transformed data.)")
 
             elif isinstance(assistant_response, AnalysisOutput):
                 display_response_str = f"Analysis Complete: {assistant_response.analysis_summary}"
                 print(f"Assistant: {display_response_str}")
-                session_reports.append(
+                session.append_report(
                     {"type": "analysis", "summary": assistant_response.analysis_summary}
                 )
 
@@ -193,7 +257,7 @@ async def main() -> None:
                 else:
                     display_response_str = f"Q&A Response Type: {assistant_response.response_type}"
                 print(f"Assistant: {display_response_str}")
-                session_reports.append(
+                session.append_report(
                     {
                         "type": "qna",
                         "response_type": assistant_response.response_type,
@@ -209,9 +273,17 @@ async def main() -> None:
                 display_response_str = str(assistant_response)
                 print(f"Assistant (Unknown Format): {display_response_str}")
 
-            current_conversation_messages.append(
-                {"role": "assistant", "content": display_response_str}
-            )
+            session.append_message("assistant", display_response_str)
+            if args.chain:
+                # The server already has everything up to and including the assistant's reply.
+                session.set_chain_state(last_response_id, session.message_count)
+            if dataset_version is not None:
+                session.append_message(
+                    "system",
+                    "The data was just transformed. Please use the new data for subsequent "
+                    "operations unless otherwise specified. Here is the new data:",
+                    dataset_version=dataset_version,
+                )
 
         except KeyboardInterrupt:
             print("\nExiting...")
@@ -225,6 +297,8 @@ async def main() -> None:
         except Exception as e:
             print(f"An unexpected error occurred: {e}")
 
+    store.close()
+
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    last_response_id TEXT,
+    chained_upto INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS messages (
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    dataset_version INTEGER,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (session_id, seq)
+);
+CREATE TABLE IF NOT EXISTS reports (
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    report TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (session_id, seq)
+);
+CREATE TABLE IF NOT EXISTS dataset_versions (
+    session_id TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    rows TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (session_id, version)
+);
+"""
+
+# Older messages outside the tail are abbreviated to this many characters.
+SUMMARY_LINE_CHARS = 200
+
+
+@dataclass
+class DatasetVersion:
+    """A version of a session's dataset, e.g. the loaded CSV or the result of a transform."""
+
+    version: int
+    source: str
+    rows: list[dict[str, Any]]
+
+
+class SessionStore:
+    """Append-only SQLite store for orchestrator sessions.
+
+    Messages, reports and dataset versions are written as they happen and are only read back
+    when needed, so sessions can be resumed after a restart and served by a long-lived process.
+    """
+
+    def __init__(self, path: str = "orchestrator_sessions.db") -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+
+    def _query(self, sql: str, params: tuple[Any, ...] = ()) -> list[tuple[Any, ...]]:
+        with self._lock, self._conn:
+            return self._conn.execute(sql, params).fetchall()
+
+    def create_session(self, session_id: str | None = None) -> Session:
+        """Create a new, empty session."""
+        session_id = session_id or uuid.uuid4().hex
+        self._query(
+            "INSERT INTO sessions (session_id, created_at) VALUES (?, ?)", (session_id, time.time())
+        )
+        return Session(self, session_id)
+
+    def open_session(self, session_id: str) -> Session:
+        """Open an existing session. Nothing is loaded until it's needed."""
+        if not self._query("SELECT 1 FROM sessions WHERE session_id = ?", (session_id,)):
+            raise KeyError(f"Unknown session: {session_id}")
+        return Session(self, session_id)
+
+    def list_sessions(self) -> list[str]:
+        return [
+            row[0] for row in self._query("SELECT session_id FROM sessions ORDER BY created_at")
+        ]
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class Session:
+    """A handle to a single session in a `SessionStore`."""
+
+    def __init__(self, store: SessionStore, session_id: str) -> None:
+        self.store = store
+        self.session_id = session_id
+        self._latest_dataset: DatasetVersion | None = None
+
+    # Messages
+
+    def append_message(self, role: str, content: str, dataset_version: int | None = None) -> int:
+        """Append a message and return its sequence number (starting at 1).
+
+        If `dataset_version` is set, the message introduces that version of the dataset; its rows
+        are appended to the content when the message is rendered, as long as it's the latest
+        version.
+        """
+        with self.store._lock, self.store._conn as conn:
+            (seq,) = conn.execute(
+                "SELECT COALESCE(MAX(seq), 0) + 1 FROM messages WHERE session_id = ?",
+                (self.session_id,),
+            ).fetchone()
+            conn.execute(
+                "INSERT INTO messages VALUES (?, ?, ?, ?, ?, ?)",
+                (self.session_id, seq, role, content, dataset_version, time.time()),
+            )
+        return int(seq)
+
+    @property
+    def message_count(self) -> int:
+        ((count,),) = self.store._query(
+            "SELECT COALESCE(MAX(seq), 0) FROM messages WHERE session_id = ?", (self.session_id,)
+        )
+        return int(count)
+
+    def messages(self, after: int = 0) -> list[dict[str, str]]:
+        """Return the rendered messages with a sequence number greater than `after`."""
+        rows = self.store._query(
+            "SELECT role, content, dataset_version FROM messages "
+            "WHERE session_id = ? AND seq > ? ORDER BY seq",
+            (self.session_id, after),
+        )
+        latest = self.latest_dataset() if any(row[2] is not None for row in rows) else None
+        return [self._render(role, content, version, latest) for role, content, version in rows]
+
+    @staticmethod
+    def _render(
+        role: str, content: str, dataset_version: int | None, latest: DatasetVersion | None
+    ) -> dict[str, str]:
+        if dataset_version is not None:
+            if latest is not None and dataset_version == latest.version:
+                content = f"{content} {json.dumps(latest.rows)}"
+            else:
+                content = f"{content} (superseded by a later version of the data)"
+        return {"role": role, "content": content}
+
+    def context_view(self, tail: int = 20) -> list[dict[str, str]]:
+        """Build a compact message list for the next request: the older messages abbreviated to a
+        line each, the latest dataset, and the last `tail` messages verbatim.
+        """
+        count = self.message_count
+        if count <= tail:
+            return self.messages()
+
+        cutoff = count - tail
+        view: list[dict[str, str]] = [{"role": "system", "content": self._summary(cutoff)}]
+        latest = self.latest_dataset()
+        if latest is not None:
+            rows = self.store._query(
+                "SELECT role, content FROM messages "
+                "WHERE session_id = ? AND dataset_version = ? AND seq <= ?",
+                (self.session_id, latest.version, cutoff),
+            )
+            view.extend(
+                self._render(role, content, latest.version, latest) for role, content in rows
+            )
+        return view + self.messages(after=cutoff)
+
+    def _summary(self, upto: int) -> str:
+        rows = self.store._query(
+            "SELECT role, substr(content, 1, ?), dataset_version FROM messages "
+            "WHERE session_id = ? AND seq <= ? ORDER BY seq",
+            (SUMMARY_LINE_CHARS, self.session_id, upto),
+        )
+        parts = ["Earlier messages in this conversation, abbreviated:"]
+        for role, content, dataset_version in rows:
+            if dataset_version is not None:
+                content = f"[dataset version {dataset_version}]"
+            parts.append(f"- {role}: {content}")
+        return "\n".join(parts)
+
+    # Server-side conversation chaining
+
+    def chain_state(self) -> tuple[str | None, int]:
+        """Return the last response ID and the number of messages the server already has."""
+        ((response_id, upto),) = self.store._query(
+            "SELECT last_response_id, chained_upto FROM sessions WHERE session_id = ?",
+            (self.session_id,),
+        )
+        return response_id, upto
+
+    def set_chain_state(self, response_id: str | None, upto: int) -> None:
+        self.store._query(
+            "UPDATE sessions SET last_response_id = ?, chained_upto = ? WHERE session_id = ?",
+            (response_id, upto, self.session_id),
+        )
+
+    # Reports
+
+    def append_report(self, report: dict[str, Any]) -> None:
+        with self.store._lock, self.store._conn as conn:
+            conn.execute(
+                "INSERT INTO reports SELECT ?, COALESCE(MAX(seq), 0) + 1, ?, ? FROM reports "
+                "WHERE session_id = ?",
+                (self.session_id, json.dumps(report), time.time(), self.session_id),
+            )
+
+    def reports(self) -> list[dict[str, Any]]:
+        rows = self.store._query(
+            "SELECT report FROM reports WHERE session_id = ? ORDER BY seq", (self.session_id,)
+        )
+        return [json.loads(row[0]) for row in rows]
+
+    # Dataset versions
+
+    def add_dataset_version(self, rows: list[dict[str, Any]], source: str) -> int:
+        """Store a new version of the dataset and return its version number (starting at 1)."""
+        with self.store._lock, self.store._conn as conn:
+            (version,) = conn.execute(
+                "SELECT COALESCE(MAX(version), 0) + 1 FROM dataset_versions WHERE session_id = ?",
+                (self.session_id,),
+            ).fetchone()
+            conn.execute(
+                "INSERT INTO dataset_versions VALUES (?, ?, ?, ?, ?)",
+                (self.session_id, version, source, json.dumps(rows), time.time()),
+            )
+        return int(version)
+
+    def latest_dataset(self) -> DatasetVersion | None:
+        """Return the latest dataset version. The rows are only reloaded when a new version has
+        been added since the last call.
+        """
+        ((version,),) = self.store._query(
+            "SELECT MAX(version) FROM dataset_versions WHERE session_id = ?", (self.session_id,)
+        )
+        if version is None:
+            return None
+        if self._latest_dataset is None or self._latest_dataset.version != version:
+            ((source, data),) = self.store._query(
+                "SELECT source, rows FROM dataset_versions WHERE session_id = ? AND version = ?",
+                (self.session_id, version),
+            )
+            self._latest_dataset = DatasetVersion(
+                version=version, source=source, rows=json.loads(data)
+            )
+        return self._latest_dataset
@@ -1,6 +1,7 @@
+import importlib
 import logging
 import sys
-from typing import Literal
+from typing import TYPE_CHECKING, Any, Literal
 
 from openai import AsyncOpenAI
 
@@ -13,6 +14,7 @@ from .build import (
     build_qna_agent,
     build_transform_agent,
 )
+from .checkpoint import CheckpointStore, FileCheckpointStore, RunState, SQLiteCheckpointStore
 from .computer import AsyncComputer, Button, Computer, Environment
 from .exceptions import (
     AgentsException,
@@ -24,13 +26,20 @@ from .exceptions import (
 )
 from .fallback import retry_with_fallbacks
 from .guardrail import (
+    GuardrailCache,
     GuardrailFunctionOutput,
+    GuardrailPrefilter,
+    GuardrailStats,
     InputGuardrail,
     InputGuardrailResult,
     OutputGuardrail,
     OutputGuardrailResult,
+    default_guardrail_cache,
     input_guardrail,
+    keyword_prefilter,
+    length_prefilter,
     output_guardrail,
+    regex_prefilter,
 )
 from .handoffs import Handoff, HandoffInputData, HandoffInputFilter, handoff
 from .items import (
@@ -49,6 +58,7 @@ from .lifecycle import AgentHooks, RunHooks
 from .model_settings import ModelSettings
 from .models.interface import Model, ModelProvider, ModelTracing
 from .models.openai_chatcompletions import OpenAIChatCompletionsModel
+from .models.openai_client_pool import ClientPoolStats, HTTPClientConfig, OpenAIClientPool
 from .models.openai_provider import OpenAIProvider
 from .models.openai_responses import OpenAIResponsesModel
 from .result import RunResult, RunResultStreaming
@@ -58,7 +68,9 @@ from .stream_events import (
     AgentUpdatedStreamEvent,
     RawResponsesStreamEvent,
     RunItemStreamEvent,
+    StreamBackpressurePolicy,
     StreamEvent,
+    StreamEventType,
 )
 from .tool import (
     ComputerTool,
@@ -70,6 +82,7 @@ from .tool import (
     default_tool_error_function,
     function_tool,
 )
+from .tool_cache import ToolCacheVersionFunction, ToolResultCache, default_tool_result_cache
 from .tracing import (
     AgentSpanData,
     CustomSpanData,
@@ -109,6 +122,53 @@ from .tracing import (
 from .usage import Usage
 from .version import __version__
 
+if TYPE_CHECKING:
+    from . import extensions as extensions, mcp as mcp, voice as voice
+    from .extensions.models.litellm_model import LitellmModel as LitellmModel
+    from .extensions.models.litellm_provider import LitellmProvider as LitellmProvider
+    from .extensions.visualization import draw_graph as draw_graph
+    from .mcp import (
+        MCPServer as MCPServer,
+        MCPServerPool as MCPServerPool,
+        MCPServerSse as MCPServerSse,
+        MCPServerStdio as MCPServerStdio,
+        MCPServerStreamableHttp as MCPServerStreamableHttp,
+        MCPUtil as MCPUtil,
+    )
+
+# Submodules that are slow to import or depend on optional extras (MCP, voice, LiteLLM, graphviz).
+# They are imported on first attribute access (PEP 562), so `import agents` stays fast.
+_LAZY_SUBMODULES = {"extensions", "mcp", "voice"}
+
+_LAZY_ATTRIBUTES = {
+    "MCPServer": ".mcp",
+    "MCPServerPool": ".mcp",
+    "MCPServerSse": ".mcp",
+    "MCPServerStdio": ".mcp",
+    "MCPServerStreamableHttp": ".mcp",
+    "MCPUtil": ".mcp",
+    "LitellmModel": ".extensions.models.litellm_model",
+    "LitellmProvider": ".extensions.models.litellm_provider",
+    "draw_graph": ".extensions.visualization",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+        # Cache the value so that __getattr__ isn't called again for this name.
+        globals()[name] = value
+        return value
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | _LAZY_SUBMODULES | set(_LAZY_ATTRIBUTES))
+
 
 def set_default_openai_key(key: str, use_for_tracing: bool = True) -> None:
     """Set the default OpenAI API key to use for LLM requests (and optionally tracing(). This is
@@ -163,9 +223,16 @@ __all__ = [
     "ModelSettings",
     "OpenAIChatCompletionsModel",
     "OpenAIProvider",
+    "OpenAIClientPool",
+    "HTTPClientConfig",
+    "ClientPoolStats",
     "OpenAIResponsesModel",
     "AgentOutputSchema",
     "AgentOutputSchemaBase",
+    "CheckpointStore",
+    "FileCheckpointStore",
+    "SQLiteCheckpointStore",
+    "RunState",
     "Computer",
     "AsyncComputer",
     "Environment",
@@ -181,8 +248,15 @@ __all__ = [
     "OutputGuardrail",
     "OutputGuardrailResult",
     "GuardrailFunctionOutput",
+    "GuardrailPrefilter",
+    "GuardrailCache",
+    "GuardrailStats",
     "input_guardrail",
     "output_guardrail",
+    "regex_prefilter",
+    "keyword_prefilter",
+    "length_prefilter",
+    "default_guardrail_cache",
     "handoff",
     "Handoff",
     "HandoffInputData",
@@ -209,6 +283,8 @@ __all__ = [
     "RunItemStreamEvent",
     "AgentUpdatedStreamEvent",
     "StreamEvent",
+    "StreamEventType",
+    "StreamBackpressurePolicy",
     "FunctionTool",
     "FunctionToolResult",
     "ComputerTool",
@@ -216,6 +292,9 @@ __all__ = [
     "Tool",
     "WebSearchTool",
     "function_tool",
+    "ToolResultCache",
+    "ToolCacheVersionFunction",
+    "default_tool_result_cache",
     "Usage",
     "add_trace_processor",
     "agent_span",
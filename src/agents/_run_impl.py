@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import dataclasses
 import inspect
 from collections.abc import Awaitable
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Any, cast
+from typing import TYPE_CHECKING, Any, Callable, cast
 
 from openai.types.responses import (
     ResponseComputerToolCall,
@@ -49,9 +50,10 @@ from .items import (
 from .lifecycle import RunHooks
 from .logger import logger
 from .model_settings import ModelSettings
-from .models.interface import ModelTracing
+from .models.fake_id import FAKE_RESPONSES_ID
+from .models.interface import Model, ModelTracing
 from .run_context import RunContextWrapper, TContext
-from .stream_events import RunItemStreamEvent, StreamEvent
+from .stream_events import RunItemStreamEvent
 from .tool import ComputerTool, FunctionTool, FunctionToolResult, Tool
 from .tracing import (
     SpanError,
@@ -65,6 +67,7 @@ from .tracing import (
 from .util import _coro, _error_tracing
 
 if TYPE_CHECKING:
+    from ._stream_queue import StreamEventQueue
     from .run import RunConfig
 
 
@@ -94,6 +97,101 @@ class AgentToolUseTracker:
         return existing_data is not None and len(existing_data[1]) > 0
 
 
+@dataclass
+class ResponseChainTracker:
+    """Tracks which conversation items the model provider already holds server-side, so that each
+    turn can be chained to the previous response via `previous_response_id` and only send the
+    items generated since then (e.g. tool outputs).
+
+    The chain is only continued while the local history is an append-only extension of what was
+    sent to (or produced by) the server, and while the same model is used. Otherwise we fall back
+    to sending the full input.
+    """
+
+    enabled: bool
+    """Whether automatic chaining is enabled."""
+
+    previous_response_id: str | None = None
+    """The previous response ID passed in by the caller. Used whenever we send the full input."""
+
+    _chained_response_id: str | None = None
+    _chained_model: Model | None = None
+    # Maps id() -> object for every item the server knows about. We keep the objects themselves so
+    # their ids can't be reused while we're tracking them.
+    _server_items: dict[int, Any] = field(default_factory=dict)
+    _sent_items: list[Any] = field(default_factory=list)
+
+    @staticmethod
+    def _history(
+        original_input: str | list[TResponseInputItem], generated_items: list[RunItem]
+    ) -> list[Any]:
+        history: list[Any] = [original_input] if isinstance(original_input, str) else []
+        if isinstance(original_input, list):
+            history.extend(original_input)
+        history.extend(item.raw_item for item in generated_items)
+        return history
+
+    def _num_server_items(self, model: Model, history: list[Any]) -> int | None:
+        """Returns the length of the history prefix held by the server, or None if the current
+        history can't be chained to the previous response."""
+        if self._chained_response_id is None or model is not self._chained_model:
+            return None
+
+        num_known = 0
+        for obj in history:
+            if id(obj) not in self._server_items:
+                break
+            num_known += 1
+
+        # Everything the server knows must still be in the history, in front of the new items. If
+        # not, the history was rewritten (e.g. by a handoff input filter).
+        if num_known != len(self._server_items) or any(
+            id(obj) in self._server_items for obj in history[num_known:]
+        ):
+            return None
+
+        return num_known
+
+    def prepare_input(
+        self,
+        model: Model,
+        original_input: str | list[TResponseInputItem],
+        generated_items: list[RunItem],
+    ) -> tuple[list[TResponseInputItem], str | None]:
+        """Returns the input to send for the next turn, and the previous response ID to use."""
+        history = self._history(original_input, generated_items)
+        self._sent_items = history
+
+        num_known = self._num_server_items(model, history)
+        num_input_items = len(history) - len(generated_items)
+        # We can only chain if the server has the whole original input, and there's something new
+        # to send.
+        if num_known is not None and num_input_items <= num_known < len(history):
+            new_items = generated_items[num_known - num_input_items :]
+            return [item.to_input_item() for item in new_items], self._chained_response_id
+
+        input = ItemHelpers.input_to_new_input_list(original_input)
+        input.extend([item.to_input_item() for item in generated_items])
+        return input, self.previous_response_id
+
+    def record_response(self, model: Model, response: ModelResponse) -> None:
+        """Records a model response, so the next turn can be chained to it."""
+        if not self.enabled:
+            return
+
+        if not response.response_id or response.response_id == FAKE_RESPONSES_ID:
+            # This model doesn't store responses server-side, so there's nothing to chain to.
+            self._chained_response_id = None
+            self._chained_model = None
+            self._server_items = {}
+            return
+
+        self._chained_response_id = response.response_id
+        self._chained_model = model
+        self._server_items = {id(obj): obj for obj in self._sent_items}
+        self._server_items.update({id(obj): obj for obj in response.output})
+
+
 @dataclass
 class ToolRunHandoff:
     handoff: Handoff
@@ -171,6 +269,17 @@ class SingleStepResult:
         `original_input`)."""
         return self.pre_step_items + self.new_step_items
 
+    def append_to(self, generated_items: list[RunItem]) -> list[RunItem]:
+        """Returns the items generated during the agent run. If this step continued from
+        `generated_items`, the new items are appended to it in place instead of copying the whole
+        list, which would be quadratic over a long run. Otherwise (e.g. a handoff input filter
+        replaced the earlier items), a new list is returned.
+        """
+        if self.pre_step_items is generated_items:
+            generated_items.extend(self.new_step_items)
+            return generated_items
+        return self.generated_items
+
 
 def get_model_tracing_impl(
     tracing_disabled: bool, trace_include_sensitive_data: bool
@@ -199,12 +308,14 @@ class RunImpl:
         hooks: RunHooks[TContext],
         context_wrapper: RunContextWrapper[TContext],
         run_config: RunConfig,
+        # If set, called with items as soon as they're created, e.g. to stream them
+        stream_item: Callable[[RunItem], None] | None = None,
     ) -> SingleStepResult:
-        # Make a copy of the generated items
-        pre_step_items = list(pre_step_items)
-
         new_step_items: list[RunItem] = []
         new_step_items.extend(processed_response.new_items)
+        if stream_item is not None:
+            for item in processed_response.new_items:
+                stream_item(item)
 
         # First, lets run the tool calls - function tools and computer actions
         function_results, computer_results = await asyncio.gather(
@@ -214,6 +325,7 @@ class RunImpl:
                 hooks=hooks,
                 context_wrapper=context_wrapper,
                 config=run_config,
+                stream_item=stream_item,
             ),
             cls.execute_computer_actions(
                 agent=agent,
@@ -428,7 +540,39 @@ class RunImpl:
         hooks: RunHooks[TContext],
         context_wrapper: RunContextWrapper[TContext],
         config: RunConfig,
+        stream_item: Callable[[RunItem], None] | None = None,
     ) -> list[FunctionToolResult]:
+        run_limit = (
+            asyncio.Semaphore(config.max_concurrent_tool_calls)
+            if config.max_concurrent_tool_calls is not None
+            else None
+        )
+        tool_limits = {
+            tool.name: asyncio.Semaphore(tool.max_concurrency)
+            for tool in {id(run.function_tool): run.function_tool for run in tool_runs}.values()
+            if tool.max_concurrency is not None
+        }
+
+        async def invoke_tool(func_tool: FunctionTool, tool_call: ResponseFunctionToolCall) -> Any:
+            timeout = func_tool.timeout if func_tool.timeout is not None else config.tool_timeout
+            if timeout is None:
+                return await func_tool.on_invoke_tool(context_wrapper, tool_call.arguments)
+            try:
+                return await asyncio.wait_for(
+                    func_tool.on_invoke_tool(context_wrapper, tool_call.arguments), timeout
+                )
+            except asyncio.TimeoutError:
+                _error_tracing.attach_error_to_current_span(
+                    SpanError(
+                        message="Tool call timed out",
+                        data={"tool_name": func_tool.name, "timeout": timeout},
+                    )
+                )
+                return (
+                    f"The tool {func_tool.name} did not finish within {timeout} seconds and was "
+                    "cancelled."
+                )
+
         async def run_single_tool(
             func_tool: FunctionTool, tool_call: ResponseFunctionToolCall
         ) -> Any:
@@ -443,7 +587,7 @@ class RunImpl:
                             if agent.hooks
                             else _coro.noop_coroutine()
                         ),
-                        func_tool.on_invoke_tool(context_wrapper, tool_call.arguments),
+                        invoke_tool(func_tool, tool_call),
                     )
 
                     await asyncio.gather(
@@ -469,16 +613,18 @@ class RunImpl:
                     span_fn.span_data.output = result
             return result
 
-        tasks = []
-        for tool_run in tool_runs:
-            function_tool = tool_run.function_tool
-            tasks.append(run_single_tool(function_tool, tool_run.tool_call))
-
-        results = await asyncio.gather(*tasks)
-
-        return [
-            FunctionToolResult(
-                tool=tool_run.function_tool,
+        async def run_tool(tool_run: ToolRunFunction) -> FunctionToolResult:
+            func_tool = tool_run.function_tool
+            async with contextlib.AsyncExitStack() as stack:
+                # Take the tool's own slot first, so calls waiting for it don't hold a run slot.
+                if (tool_limit := tool_limits.get(func_tool.name)) is not None:
+                    await stack.enter_async_context(tool_limit)
+                if run_limit is not None:
+                    await stack.enter_async_context(run_limit)
+                result = await run_single_tool(func_tool, tool_run.tool_call)
+
+            function_result = FunctionToolResult(
+                tool=func_tool,
                 output=result,
                 run_item=ToolCallOutputItem(
                     output=result,
@@ -486,8 +632,12 @@ class RunImpl:
                     agent=agent,
                 ),
             )
-            for tool_run, result in zip(tool_runs, results)
-        ]
+            if stream_item is not None:
+                # Stream each output as soon as it's ready, rather than after the slowest tool.
+                stream_item(function_result.run_item)
+            return function_result
+
+        return list(await asyncio.gather(*(run_tool(tool_run) for tool_run in tool_runs)))
 
     @classmethod
     async def execute_computer_actions(
@@ -627,7 +777,7 @@ class RunImpl:
                     )
                     raise UserError(f"Invalid input filter result: {filtered}")
 
-                original_input = (
+                original_input = ItemHelpers.freeze_input(
                     filtered.input_history
                     if isinstance(filtered.input_history, str)
                     else list(filtered.input_history)
@@ -712,9 +862,20 @@ class RunImpl:
     def stream_step_result_to_queue(
         cls,
         step_result: SingleStepResult,
-        queue: asyncio.Queue[StreamEvent | QueueCompleteSentinel],
+        queue: StreamEventQueue,
     ):
-        for item in step_result.new_step_items:
+        cls.stream_items_to_queue(step_result.new_step_items, queue)
+
+    @classmethod
+    def stream_items_to_queue(
+        cls,
+        items: list[RunItem],
+        queue: StreamEventQueue,
+    ):
+        if not queue.accepts("run_item_stream_event"):
+            return
+
+        for item in items:
             if isinstance(item, MessageOutputItem):
                 event = RunItemStreamEvent(item=item, name="message_output_created")
             elif isinstance(item, HandoffCallItem):
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Iterable
+from typing import Union
+
+from openai.types.responses import ResponseTextDeltaEvent
+from typing_extensions import TypeAlias
+
+from ._run_impl import QueueCompleteSentinel
+from .items import TResponseStreamEvent
+from .stream_events import (
+    RawResponsesStreamEvent,
+    StreamBackpressurePolicy,
+    StreamEvent,
+    StreamEventType,
+)
+
+
+class _TextDeltaRun:
+    """Consecutive text deltas for the same content part, which are merged into one event when
+    they're dequeued.
+    """
+
+    __slots__ = ("first", "deltas", "deadline")
+
+    def __init__(self, event: ResponseTextDeltaEvent, deadline: float):
+        self.first = event
+        self.deltas = [event.delta]
+        self.deadline = deadline
+
+    def accepts(self, event: ResponseTextDeltaEvent, now: float) -> bool:
+        return (
+            now < self.deadline
+            and event.item_id == self.first.item_id
+            and event.output_index == self.first.output_index
+            and event.content_index == self.first.content_index
+        )
+
+    def add(self, event: ResponseTextDeltaEvent) -> None:
+        self.deltas.append(event.delta)
+
+    def to_event(self) -> RawResponsesStreamEvent:
+        if len(self.deltas) == 1:
+            return RawResponsesStreamEvent(data=self.first)
+        merged = self.first.model_copy(update={"delta": "".join(self.deltas)})
+        return RawResponsesStreamEvent(data=merged)
+
+
+_Entry: TypeAlias = Union[StreamEvent, QueueCompleteSentinel, _TextDeltaRun]
+
+
+class StreamEventQueue:
+    """The queue between a streamed run and `RunResultStreaming.stream_events()`.
+
+    Raw response events are only created for consumers that want them, can be coalesced, and are
+    subject to the queue's size limit. Everything else is always queued, since the consumer needs
+    it to follow the run.
+    """
+
+    def __init__(
+        self, maxsize: int | None = None, backpressure: StreamBackpressurePolicy = "block"
+    ):
+        self.maxsize = maxsize
+        self.backpressure = backpressure
+        self.types: frozenset[StreamEventType] | None = None
+        """The event types the consumer wants. None means all types."""
+        self.coalesce_window: float | None = None
+        """How long (in seconds) text deltas for the same content part are merged for."""
+        self.dropped = 0
+        """The number of raw response events dropped because the queue was full."""
+
+        self._entries: deque[_Entry] = deque()
+        self._raw_count = 0
+        self._put_event = asyncio.Event()
+        self._get_event = asyncio.Event()
+
+    def subscribe(
+        self, types: Iterable[StreamEventType] | None, coalesce_text_ms: float | None
+    ) -> None:
+        self.types = frozenset(types) if types is not None else None
+        self.coalesce_window = coalesce_text_ms / 1000 if coalesce_text_ms else None
+
+    def accepts(self, event_type: StreamEventType) -> bool:
+        return self.types is None or event_type in self.types
+
+    def qsize(self) -> int:
+        return len(self._entries)
+
+    def empty(self) -> bool:
+        return not self._entries
+
+    def put_nowait(self, item: StreamEvent | QueueCompleteSentinel) -> None:
+        """Queue an event, regardless of the size limit. Events of types the consumer doesn't want
+        are discarded.
+        """
+        if not isinstance(item, QueueCompleteSentinel) and not self.accepts(item.type):
+            return
+        if isinstance(item, RawResponsesStreamEvent):
+            self._raw_count += 1
+        self._append(item)
+
+    async def put_raw(self, data: TResponseStreamEvent) -> None:
+        """Queue a raw response event from the model, applying the subscription's filter and
+        coalescing, and the backpressure policy.
+        """
+        if not self.accepts("raw_response_event"):
+            return
+
+        now = time.monotonic()
+        if self.coalesce_window is not None and isinstance(data, ResponseTextDeltaEvent):
+            tail = self._entries[-1] if self._entries else None
+            if isinstance(tail, _TextDeltaRun) and tail.accepts(data, now):
+                tail.add(data)
+                return
+
+        if self.maxsize and self._raw_count >= self.maxsize:
+            if self.backpressure == "drop_newest":
+                self.dropped += 1
+                return
+            if self.backpressure == "drop_oldest":
+                self._drop_oldest_raw()
+            else:
+                while self._raw_count >= self.maxsize:
+                    self._get_event.clear()
+                    await self._get_event.wait()
+
+        entry: _Entry
+        if self.coalesce_window is not None and isinstance(data, ResponseTextDeltaEvent):
+            entry = _TextDeltaRun(data, deadline=time.monotonic() + self.coalesce_window)
+        else:
+            entry = RawResponsesStreamEvent(data=data)
+        self._raw_count += 1
+        self._append(entry)
+
+    async def get(self) -> StreamEvent | QueueCompleteSentinel:
+        while True:
+            if not self._entries:
+                self._put_event.clear()
+                await self._put_event.wait()
+                continue
+
+            head = self._entries[0]
+            if isinstance(head, _TextDeltaRun) and len(self._entries) == 1:
+                # The run can still grow; wait until its window closes or another event arrives.
+                remaining = head.deadline - time.monotonic()
+                if remaining > 0:
+                    self._put_event.clear()
+                    try:
+                        await asyncio.wait_for(self._put_event.wait(), timeout=remaining)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+            return self.get_nowait()
+
+    def get_nowait(self) -> StreamEvent | QueueCompleteSentinel:
+        if not self._entries:
+            raise asyncio.QueueEmpty
+        entry = self._entries.popleft()
+        if isinstance(entry, (RawResponsesStreamEvent, _TextDeltaRun)):
+            self._raw_count -= 1
+            self._get_event.set()
+        if isinstance(entry, _TextDeltaRun):
+            return entry.to_event()
+        return entry
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._raw_count = 0
+        self._get_event.set()
+
+    def _append(self, entry: _Entry) -> None:
+        self._entries.append(entry)
+        self._put_event.set()
+
+    def _drop_oldest_raw(self) -> None:
+        for i, entry in enumerate(self._entries):
+            if isinstance(entry, (RawResponsesStreamEvent, _TextDeltaRun)):
+                del self._entries[i]
+                self._raw_count -= 1
+                self.dropped += len(entry.deltas) if isinstance(entry, _TextDeltaRun) else 1
+                return
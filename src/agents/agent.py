@@ -13,7 +13,6 @@ from .guardrail import InputGuardrail, OutputGuardrail
 from .handoffs import Handoff
 from .items import ItemHelpers
 from .logger import logger
-from .mcp import MCPUtil
 from .model_settings import ModelSettings
 from .models.interface import Model
 from .run_context import RunContextWrapper, TContext
@@ -243,6 +242,12 @@ class Agent(Generic[TContext]):
 
     async def get_mcp_tools(self) -> list[Tool]:
         """Fetches the available tools from the MCP servers."""
+        if not self.mcp_servers:
+            return []
+
+        # Imported lazily, since the MCP SDK is slow to import and most agents don't use it.
+        from .mcp import MCPUtil
+
         convert_schemas_to_strict = self.mcp_config.get("convert_schemas_to_strict", False)
         return await MCPUtil.get_all_function_tools(self.mcp_servers, convert_schemas_to_strict)
 
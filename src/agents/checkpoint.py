@@ -0,0 +1,352 @@
+from __future__ import annotations
+
+import abc
+import asyncio
+import json
+import os
+import re
+import sqlite3
+import time
+import uuid
+from contextlib import closing
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from openai.types.responses import ResponseFunctionToolCall, ResponseOutputMessage
+from openai.types.responses.response_reasoning_item import ResponseReasoningItem
+from pydantic import BaseModel, TypeAdapter
+
+from ._run_impl import AgentToolUseTracker
+from .agent import Agent
+from .exceptions import UserError
+from .handoffs import Handoff
+from .items import (
+    HandoffCallItem,
+    HandoffOutputItem,
+    MessageOutputItem,
+    ModelResponse,
+    ReasoningItem,
+    RunItem,
+    ToolCallItem,
+    ToolCallItemTypes,
+    ToolCallOutputItem,
+    TResponseInputItem,
+    TResponseOutputItem,
+)
+from .usage import Usage
+
+_SCHEMA_VERSION = 1
+
+_tool_call_adapter: TypeAdapter[ToolCallItemTypes] = TypeAdapter(ToolCallItemTypes)
+_output_items_adapter: TypeAdapter[list[TResponseOutputItem]] = TypeAdapter(
+    list[TResponseOutputItem]
+)
+
+
+def gen_run_id() -> str:
+    """Generates a new run ID."""
+    return f"run_{uuid.uuid4().hex}"
+
+
+@dataclass
+class RunState:
+    """A snapshot of an agent run, taken after a turn completes. It contains everything needed to
+    continue the run from the next turn without calling the model again for earlier turns.
+
+    Agents can't be serialized, so they are stored by name and resolved against the starting
+    agent's handoff graph when the state is loaded. Tool outputs that aren't JSON serializable are
+    restored as their string representation.
+    """
+
+    run_id: str
+    """The ID of the run."""
+
+    current_agent: Agent[Any]
+    """The agent that will run the next turn."""
+
+    current_turn: int
+    """The number of turns completed so far."""
+
+    original_input: str | list[TResponseInputItem]
+    """The original input to the run, after any handoff input filters were applied."""
+
+    generated_items: list[RunItem]
+    """The items generated so far."""
+
+    model_responses: list[ModelResponse]
+    """The raw model responses received so far."""
+
+    usage: Usage
+    """The usage of the run so far."""
+
+    tool_use_tracker: AgentToolUseTracker
+    """Which tools each agent has used so far."""
+
+    previous_response_id: str | None = None
+    """The `previous_response_id` the run was started with."""
+
+    def to_json(self) -> str:
+        """Serializes the state to a JSON string."""
+        return json.dumps(
+            {
+                "schema_version": _SCHEMA_VERSION,
+                "run_id": self.run_id,
+                "current_agent": self.current_agent.name,
+                "current_turn": self.current_turn,
+                "original_input": self.original_input,
+                "generated_items": [_item_to_json(item) for item in self.generated_items],
+                "model_responses": [
+                    {
+                        "output": [_dump(output) for output in response.output],
+                        "usage": asdict(response.usage),
+                        "response_id": response.response_id,
+                    }
+                    for response in self.model_responses
+                ],
+                "usage": asdict(self.usage),
+                "tool_use_tracker": [
+                    [agent.name, tool_names]
+                    for agent, tool_names in self.tool_use_tracker.agent_to_tools
+                ],
+                "previous_response_id": self.previous_response_id,
+            }
+        )
+
+    @classmethod
+    def from_json(cls, data: str, starting_agent: Agent[Any]) -> RunState:
+        """Deserializes a state created by `to_json()`.
+
+        Args:
+            data: The serialized state.
+            starting_agent: The agent the run was started with. Agents referenced by the state are
+                looked up by name among this agent and the agents reachable via its handoffs.
+        """
+        state = json.loads(data)
+        if state.get("schema_version") != _SCHEMA_VERSION:
+            raise UserError(f"Unsupported run state schema version: {state.get('schema_version')}")
+
+        agents = _agents_by_name(starting_agent)
+
+        def get_agent(name: str) -> Agent[Any]:
+            if name not in agents:
+                raise UserError(
+                    f"Agent {name!r} from the run state is not reachable from the starting agent "
+                    f"{starting_agent.name!r}"
+                )
+            return agents[name]
+
+        tool_use_tracker = AgentToolUseTracker()
+        for agent_name, tool_names in state["tool_use_tracker"]:
+            tool_use_tracker.add_tool_use(get_agent(agent_name), tool_names)
+
+        return cls(
+            run_id=state["run_id"],
+            current_agent=get_agent(state["current_agent"]),
+            current_turn=state["current_turn"],
+            original_input=state["original_input"],
+            generated_items=[_item_from_json(item, get_agent) for item in state["generated_items"]],
+            model_responses=[
+                ModelResponse(
+                    output=_output_items_adapter.validate_python(response["output"]),
+                    usage=Usage(**response["usage"]),
+                    response_id=response["response_id"],
+                )
+                for response in state["model_responses"]
+            ],
+            usage=Usage(**state["usage"]),
+            tool_use_tracker=tool_use_tracker,
+            previous_response_id=state["previous_response_id"],
+        )
+
+
+def _agents_by_name(starting_agent: Agent[Any]) -> dict[str, Agent[Any]]:
+    agents: dict[str, Agent[Any]] = {}
+    pending = [starting_agent]
+    while pending:
+        agent = pending.pop()
+        if agent.name in agents:
+            continue
+        agents[agent.name] = agent
+        for handoff in agent.handoffs:
+            if isinstance(handoff, Agent):
+                pending.append(handoff)
+            elif isinstance(handoff, Handoff) and handoff._agent is not None:
+                pending.append(handoff._agent)
+    return agents
+
+
+def _dump(raw_item: Any) -> Any:
+    if isinstance(raw_item, BaseModel):
+        # Keep track of which fields were set, so `to_input_item()` behaves the same after a
+        # round trip.
+        return raw_item.model_dump(mode="json", exclude_unset=True)
+    return raw_item
+
+
+def _item_to_json(item: RunItem) -> dict[str, Any]:
+    data: dict[str, Any] = {
+        "type": item.type,
+        "agent": item.agent.name,
+        "raw_item": _dump(item.raw_item),
+    }
+    if isinstance(item, HandoffOutputItem):
+        data["source_agent"] = item.source_agent.name
+        data["target_agent"] = item.target_agent.name
+    elif isinstance(item, ToolCallOutputItem):
+        try:
+            json.dumps(item.output)
+            data["output"] = item.output
+        except (TypeError, ValueError):
+            data["output"] = str(item.output)
+    return data
+
+
+def _item_from_json(data: dict[str, Any], get_agent: Any) -> RunItem:
+    agent = get_agent(data["agent"])
+    raw_item = data["raw_item"]
+    item_type = data["type"]
+    if item_type == "message_output_item":
+        return MessageOutputItem(
+            agent=agent, raw_item=ResponseOutputMessage.model_validate(raw_item)
+        )
+    elif item_type == "handoff_call_item":
+        return HandoffCallItem(
+            agent=agent, raw_item=ResponseFunctionToolCall.model_validate(raw_item)
+        )
+    elif item_type == "handoff_output_item":
+        return HandoffOutputItem(
+            agent=agent,
+            raw_item=raw_item,
+            source_agent=get_agent(data["source_agent"]),
+            target_agent=get_agent(data["target_agent"]),
+        )
+    elif item_type == "tool_call_item":
+        return ToolCallItem(agent=agent, raw_item=_tool_call_adapter.validate_python(raw_item))
+    elif item_type == "tool_call_output_item":
+        return ToolCallOutputItem(agent=agent, raw_item=raw_item, output=data["output"])
+    elif item_type == "reasoning_item":
+        return ReasoningItem(agent=agent, raw_item=ResponseReasoningItem.model_validate(raw_item))
+    else:
+        raise UserError(f"Unknown run item type in run state: {item_type}")
+
+
+class CheckpointStore(abc.ABC):
+    """Stores run checkpoints, so that a run can be continued via `Runner.resume()` after the
+    process running it dies. Checkpoints are serialized `RunState`s.
+    """
+
+    @abc.abstractmethod
+    async def save(self, run_id: str, data: str) -> None:
+        """Saves the checkpoint for a run, replacing any previous checkpoint for it."""
+        pass
+
+    @abc.abstractmethod
+    async def load(self, run_id: str) -> str | None:
+        """Returns the latest checkpoint for a run, or None if there is none."""
+        pass
+
+    @abc.abstractmethod
+    async def delete(self, run_id: str) -> None:
+        """Deletes the checkpoint for a run, if any."""
+        pass
+
+    @abc.abstractmethod
+    async def list_run_ids(self) -> list[str]:
+        """Returns the IDs of all runs with a checkpoint, i.e. runs that haven't completed."""
+        pass
+
+
+class SQLiteCheckpointStore(CheckpointStore):
+    """Stores checkpoints in a local SQLite database."""
+
+    def __init__(self, path: str | os.PathLike[str] = "agents_checkpoints.db") -> None:
+        """Create a new SQLite checkpoint store.
+
+        Args:
+            path: The path to the database file. It's created if it doesn't exist.
+        """
+        self.path = str(path)
+        with closing(sqlite3.connect(self.path)) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS checkpoints "
+                "(run_id TEXT PRIMARY KEY, data TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+
+    def _execute(self, sql: str, params: tuple[Any, ...] = ()) -> list[Any]:
+        with closing(sqlite3.connect(self.path)) as conn, conn:
+            return conn.execute(sql, params).fetchall()
+
+    async def save(self, run_id: str, data: str) -> None:
+        await asyncio.to_thread(
+            self._execute,
+            "INSERT OR REPLACE INTO checkpoints (run_id, data, updated_at) VALUES (?, ?, ?)",
+            (run_id, data, time.time()),
+        )
+
+    async def load(self, run_id: str) -> str | None:
+        rows = await asyncio.to_thread(
+            self._execute, "SELECT data FROM checkpoints WHERE run_id = ?", (run_id,)
+        )
+        return rows[0][0] if rows else None
+
+    async def delete(self, run_id: str) -> None:
+        await asyncio.to_thread(
+            self._execute, "DELETE FROM checkpoints WHERE run_id = ?", (run_id,)
+        )
+
+    async def list_run_ids(self) -> list[str]:
+        rows = await asyncio.to_thread(
+            self._execute, "SELECT run_id FROM checkpoints ORDER BY updated_at"
+        )
+        return [row[0] for row in rows]
+
+
+_VALID_RUN_ID = re.compile(r"^[A-Za-z0-9_.\-]+$")
+
+
+class FileCheckpointStore(CheckpointStore):
+    """Stores each checkpoint as a JSON file in a local directory. Files are replaced atomically,
+    so a crash mid-write leaves the previous checkpoint intact.
+    """
+
+    def __init__(self, directory: str | os.PathLike[str]) -> None:
+        """Create a new file checkpoint store.
+
+        Args:
+            directory: The directory to store checkpoints in. It's created if it doesn't exist.
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, run_id: str) -> Path:
+        if not _VALID_RUN_ID.match(run_id) or run_id.startswith("."):
+            raise UserError(f"Invalid run ID for a file checkpoint: {run_id!r}")
+        return self.directory / f"{run_id}.json"
+
+    def _write(self, path: Path, data: str) -> None:
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def _read(self, path: Path) -> str | None:
+        try:
+            return path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    async def save(self, run_id: str, data: str) -> None:
+        await asyncio.to_thread(self._write, self._path(run_id), data)
+
+    async def load(self, run_id: str) -> str | None:
+        return await asyncio.to_thread(self._read, self._path(run_id))
+
+    async def delete(self, run_id: str) -> None:
+        self._path(run_id).unlink(missing_ok=True)
+
+    async def list_run_ids(self) -> list[str]:
+        paths = sorted(self.directory.glob("*.json"), key=lambda path: path.stat().st_mtime)
+        return [path.stem for path in paths]
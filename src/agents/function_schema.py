@@ -7,7 +7,6 @@ import re
 from dataclasses import dataclass
 from typing import Any, Callable, Literal, get_args, get_origin, get_type_hints
 
-from griffe import Docstring, DocstringSectionKind
 from pydantic import BaseModel, Field, create_model
 
 from .exceptions import UserError
@@ -161,6 +160,9 @@ def generate_func_documentation(
     if not doc:
         return FuncDocumentation(name=name, description=None, param_descriptions=None)
 
+    # Imported lazily, since griffe is slow to import and is only needed for function tools.
+    from griffe import Docstring, DocstringSectionKind
+
     with _suppress_griffe_logging():
         docstring = Docstring(doc, lineno=1, parser=style or _detect_docstring_style(doc))
         parsed = docstring.parse()
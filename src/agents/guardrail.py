@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+import dataclasses
 import inspect
-from collections.abc import Awaitable
-from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any, Callable, Generic, Union, overload
-
+import json
+import re
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Hashable, Iterable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Generic, Literal, Union, overload
+
+from pydantic import BaseModel
 from typing_extensions import TypeVar
 
 from .exceptions import UserError
@@ -32,6 +38,294 @@ class GuardrailFunctionOutput:
     """
 
 
+@dataclass
+class GuardrailPrefilter:
+    """A cheap, local check (e.g. a regex or a keyword list) that runs before a guardrail. If the
+    check matches, its verdict is used and the guardrail function doesn't run at all. Prefilters
+    run in order; if none of them match, the guardrail function runs as usual.
+
+    Prefilters receive the guardrail input as text: strings as-is, the text content of input
+    items, and a JSON dump of structured outputs.
+    """
+
+    check: Callable[[str], bool]
+    """Returns True if the prefilter can decide on the input."""
+
+    verdict: Literal["pass", "trip"]
+    """What a match means: "pass" skips the guardrail, "trip" triggers the tripwire."""
+
+    name: str = "prefilter"
+    """The name of the prefilter, reported in the `output_info` of the guardrail output."""
+
+
+def regex_prefilter(
+    pattern: str | re.Pattern[str], verdict: Literal["pass", "trip"], name: str | None = None
+) -> GuardrailPrefilter:
+    """A prefilter that matches when the regex is found anywhere in the input."""
+    regex = re.compile(pattern)
+    return GuardrailPrefilter(
+        check=lambda text: regex.search(text) is not None,
+        verdict=verdict,
+        name=name or f"regex:{regex.pattern}",
+    )
+
+
+def keyword_prefilter(
+    keywords: Iterable[str], verdict: Literal["pass", "trip"], name: str | None = None
+) -> GuardrailPrefilter:
+    """A prefilter that matches when any of the keywords appears in the input, ignoring case."""
+    words = [keyword.casefold() for keyword in keywords]
+
+    def check(text: str) -> bool:
+        folded = text.casefold()
+        return any(word in folded for word in words)
+
+    return GuardrailPrefilter(check=check, verdict=verdict, name=name or "keywords")
+
+
+def length_prefilter(
+    verdict: Literal["pass", "trip"],
+    *,
+    min_chars: int = 0,
+    max_chars: int | None = None,
+    name: str | None = None,
+) -> GuardrailPrefilter:
+    """A prefilter that matches when the length of the input is between `min_chars` and
+    `max_chars` (inclusive). For example, `length_prefilter("trip", min_chars=10_000)` rejects very
+    long inputs without calling the guardrail.
+    """
+    return GuardrailPrefilter(
+        check=lambda text: min_chars <= len(text) and (max_chars is None or len(text) <= max_chars),
+        verdict=verdict,
+        name=name or "length",
+    )
+
+
+class GuardrailCache:
+    """An in-memory cache of guardrail outputs, keyed by the guardrail and the normalized input
+    (surrounding and repeated whitespace is ignored). Entries expire after `ttl` seconds, and the
+    least recently used entries are evicted once there are more than `max_size`.
+
+    Guardrails key their outputs by their function, the agent and the context they ran with, and
+    the whole input, including roles and non-text content. Contexts that can be serialized to JSON
+    are compared by value, other contexts by identity.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float | None = 600.0):
+        """
+        Args:
+            max_size: The maximum number of outputs to keep.
+            ttl: How long (in seconds) an output is reused. None means outputs don't expire.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[tuple[Hashable, str], tuple[float, GuardrailFunctionOutput]] = (
+            OrderedDict()
+        )
+
+    @property
+    def size(self) -> int:
+        return len(self._entries)
+
+    def get(self, guardrail_key: Hashable, text: str) -> GuardrailFunctionOutput | None:
+        key = (guardrail_key, _normalize(text))
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, output = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return output
+
+    def set(self, guardrail_key: Hashable, text: str, output: GuardrailFunctionOutput) -> None:
+        key = (guardrail_key, _normalize(text))
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+        self._entries[key] = (expires_at, output)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+_default_cache: GuardrailCache | None = None
+
+
+def default_guardrail_cache() -> GuardrailCache:
+    """The process-wide cache used by guardrails created with `cache=True`."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = GuardrailCache()
+    return _default_cache
+
+
+@dataclass
+class GuardrailStats:
+    """Counters for a single guardrail, to see how often its function actually runs and how long
+    it takes.
+    """
+
+    calls: int = 0
+    """The number of times the guardrail was run."""
+
+    prefilter_hits: int = 0
+    """Calls decided by a prefilter, without running the guardrail function."""
+
+    cache_hits: int = 0
+    """Calls answered from the cache, without running the guardrail function."""
+
+    evaluations: int = 0
+    """Calls that ran the guardrail function."""
+
+    tripwires: int = 0
+    """Calls that triggered the tripwire."""
+
+    total_latency: float = 0.0
+    """The total time (in seconds) spent in all calls."""
+
+    evaluation_latency: float = 0.0
+    """The total time (in seconds) spent running the guardrail function."""
+
+    @property
+    def hit_rate(self) -> float:
+        """The fraction of calls that didn't need to run the guardrail function."""
+        return (self.prefilter_hits + self.cache_hits) / self.calls if self.calls else 0.0
+
+    @property
+    def average_latency(self) -> float:
+        return self.total_latency / self.calls if self.calls else 0.0
+
+    @property
+    def average_evaluation_latency(self) -> float:
+        return self.evaluation_latency / self.evaluations if self.evaluations else 0.0
+
+
+def _resolve_cache(cache: bool | GuardrailCache) -> GuardrailCache | None:
+    if isinstance(cache, GuardrailCache):
+        return cache
+    return default_guardrail_cache() if cache else None
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.split())
+
+
+def _input_text(input: str | list[TResponseInputItem]) -> str:
+    if isinstance(input, str):
+        return input
+    parts = []
+    for item in input:
+        content = item.get("content") if isinstance(item, dict) else None
+        if isinstance(content, str):
+            parts.append(content)
+        elif isinstance(content, list):
+            parts.extend(
+                str(part["text"]) for part in content if isinstance(part, dict) and "text" in part
+            )
+        else:
+            parts.append(json.dumps(item, sort_keys=True, default=str))
+    return "\n".join(parts)
+
+
+def _input_cache_text(input: str | list[TResponseInputItem]) -> str:
+    if isinstance(input, str):
+        return input
+    # All of every item, so inputs with the same text but other roles or attachments don't match
+    return json.dumps(input, sort_keys=True, default=str)
+
+
+class _Identity:
+    """Hashes and compares an object by identity. It keeps the object alive, so its ID can't be
+    reused by another object while it's part of a cache key."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __hash__(self) -> int:
+        return id(self.value)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Identity) and other.value is self.value
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    raise TypeError(f"Can't serialize {type(value).__name__}")
+
+
+def _context_key(context: Any) -> Hashable:
+    try:
+        return json.dumps(context, sort_keys=True, default=_json_default)
+    except (TypeError, ValueError):
+        return _Identity(context)
+
+
+def _guardrail_key(
+    name: str, function: Callable[..., Any], agent: Agent[Any], context: Any, kind: str
+) -> Hashable:
+    # The function itself, not just its name, so different guardrails never share outputs
+    return (name, _Identity(function), _Identity(agent), _context_key(context), kind)
+
+
+def _output_text(agent_output: Any) -> str:
+    if isinstance(agent_output, str):
+        return agent_output
+    if isinstance(agent_output, BaseModel):
+        return agent_output.model_dump_json()
+    return json.dumps(agent_output, sort_keys=True, default=str)
+
+
+async def _run_guardrail_function(
+    prefilters: list[GuardrailPrefilter],
+    cache: GuardrailCache | None,
+    stats: GuardrailStats,
+    text: Callable[[], str],
+    cache_key: Callable[[], tuple[Hashable, str]],
+    call: Callable[[], MaybeAwaitable[GuardrailFunctionOutput]],
+) -> GuardrailFunctionOutput:
+    start = time.perf_counter()
+    stats.calls += 1
+    try:
+        input_text = text() if prefilters else ""
+
+        for prefilter in prefilters:
+            if prefilter.check(input_text):
+                stats.prefilter_hits += 1
+                output = GuardrailFunctionOutput(
+                    output_info={"prefilter": prefilter.name},
+                    tripwire_triggered=prefilter.verdict == "trip",
+                )
+                break
+        else:
+            guardrail_key, cache_text = cache_key() if cache is not None else (None, "")
+            cached = cache.get(guardrail_key, cache_text) if cache is not None else None
+            if cached is not None:
+                stats.cache_hits += 1
+                output = cached
+            else:
+                evaluation_start = time.perf_counter()
+                result = call()
+                output = await result if inspect.isawaitable(result) else result
+                stats.evaluations += 1
+                stats.evaluation_latency += time.perf_counter() - evaluation_start
+                if cache is not None:
+                    cache.set(guardrail_key, cache_text, output)
+    finally:
+        stats.total_latency += time.perf_counter() - start
+
+    if output.tripwire_triggered:
+        stats.tripwires += 1
+    return output
+
+
 @dataclass
 class InputGuardrailResult:
     """The result of a guardrail run."""
@@ -96,6 +390,21 @@ class InputGuardrail(Generic[TContext]):
     function's name.
     """
 
+    prefilters: list[GuardrailPrefilter] = field(default_factory=list)
+    """Cheap local checks that run, in order, before the guardrail function. The first one that
+    matches decides the result, and the guardrail function is skipped.
+    """
+
+    cache: GuardrailCache | None = None
+    """If set, outputs are cached and reused for identical inputs, when the guardrail runs with the
+    same agent and context. See `GuardrailCache`.
+    """
+
+    stats: GuardrailStats = field(default_factory=GuardrailStats, repr=False, compare=False)
+    """Counts how often this guardrail ran, was answered by a prefilter or the cache, and how long
+    it took.
+    """
+
     def get_name(self) -> str:
         if self.name:
             return self.name
@@ -111,13 +420,20 @@ class InputGuardrail(Generic[TContext]):
         if not callable(self.guardrail_function):
             raise UserError(f"Guardrail function must be callable, got {self.guardrail_function}")
 
-        output = self.guardrail_function(context, agent, input)
-        if inspect.isawaitable(output):
-            return InputGuardrailResult(
-                guardrail=self,
-                output=await output,
-            )
-
+        kind = "text" if isinstance(input, str) else "items"
+        output = await _run_guardrail_function(
+            self.prefilters,
+            self.cache,
+            self.stats,
+            lambda: _input_text(input),
+            lambda: (
+                _guardrail_key(
+                    self.get_name(), self.guardrail_function, agent, context.context, kind
+                ),
+                _input_cache_text(input),
+            ),
+            lambda: self.guardrail_function(context, agent, input),
+        )
         return InputGuardrailResult(
             guardrail=self,
             output=output,
@@ -150,6 +466,21 @@ class OutputGuardrail(Generic[TContext]):
     function's name.
     """
 
+    prefilters: list[GuardrailPrefilter] = field(default_factory=list)
+    """Cheap local checks that run, in order, before the guardrail function. The first one that
+    matches decides the result, and the guardrail function is skipped.
+    """
+
+    cache: GuardrailCache | None = None
+    """If set, outputs are cached and reused for identical agent outputs, when the guardrail runs
+    with the same agent and context. See `GuardrailCache`.
+    """
+
+    stats: GuardrailStats = field(default_factory=GuardrailStats, repr=False, compare=False)
+    """Counts how often this guardrail ran, was answered by a prefilter or the cache, and how long
+    it took.
+    """
+
     def get_name(self) -> str:
         if self.name:
             return self.name
@@ -162,15 +493,21 @@ class OutputGuardrail(Generic[TContext]):
         if not callable(self.guardrail_function):
             raise UserError(f"Guardrail function must be callable, got {self.guardrail_function}")
 
-        output = self.guardrail_function(context, agent, agent_output)
-        if inspect.isawaitable(output):
-            return OutputGuardrailResult(
-                guardrail=self,
-                agent=agent,
-                agent_output=agent_output,
-                output=await output,
-            )
-
+        # The type is part of the key, so e.g. the string "42" and the number 42 don't match
+        kind = type(agent_output).__qualname__
+        output = await _run_guardrail_function(
+            self.prefilters,
+            self.cache,
+            self.stats,
+            lambda: _output_text(agent_output),
+            lambda: (
+                _guardrail_key(
+                    self.get_name(), self.guardrail_function, agent, context.context, kind
+                ),
+                _output_text(agent_output),
+            ),
+            lambda: self.guardrail_function(context, agent, agent_output),
+        )
         return OutputGuardrailResult(
             guardrail=self,
             agent=agent,
@@ -208,6 +545,8 @@ def input_guardrail(
 def input_guardrail(
     *,
     name: str | None = None,
+    prefilters: list[GuardrailPrefilter] | None = None,
+    cache: bool | GuardrailCache = False,
 ) -> Callable[
     [_InputGuardrailFuncSync[TContext_co] | _InputGuardrailFuncAsync[TContext_co]],
     InputGuardrail[TContext_co],
@@ -220,6 +559,8 @@ def input_guardrail(
     | None = None,
     *,
     name: str | None = None,
+    prefilters: list[GuardrailPrefilter] | None = None,
+    cache: bool | GuardrailCache = False,
 ) -> (
     InputGuardrail[TContext_co]
     | Callable[
@@ -236,12 +577,21 @@ def input_guardrail(
 
         @input_guardrail(name="guardrail_name")
         async def my_async_guardrail(...): ...
+
+    `prefilters` are cheap local checks that run before the guardrail and can decide on their
+    own. If `cache` is True, outputs are cached in the process-wide `GuardrailCache`; you can also
+    pass your own cache.
     """
 
     def decorator(
         f: _InputGuardrailFuncSync[TContext_co] | _InputGuardrailFuncAsync[TContext_co],
     ) -> InputGuardrail[TContext_co]:
-        return InputGuardrail(guardrail_function=f, name=name)
+        return InputGuardrail(
+            guardrail_function=f,
+            name=name,
+            prefilters=list(prefilters or []),
+            cache=_resolve_cache(cache),
+        )
 
     if func is not None:
         # Decorator was used without parentheses
@@ -277,6 +627,8 @@ def output_guardrail(
 def output_guardrail(
     *,
     name: str | None = None,
+    prefilters: list[GuardrailPrefilter] | None = None,
+    cache: bool | GuardrailCache = False,
 ) -> Callable[
     [_OutputGuardrailFuncSync[TContext_co] | _OutputGuardrailFuncAsync[TContext_co]],
     OutputGuardrail[TContext_co],
@@ -289,6 +641,8 @@ def output_guardrail(
     | None = None,
     *,
     name: str | None = None,
+    prefilters: list[GuardrailPrefilter] | None = None,
+    cache: bool | GuardrailCache = False,
 ) -> (
     OutputGuardrail[TContext_co]
     | Callable[
@@ -305,12 +659,21 @@ def output_guardrail(
 
         @output_guardrail(name="guardrail_name")
         async def my_async_guardrail(...): ...
+
+    `prefilters` are cheap local checks that run before the guardrail and can decide on their
+    own. If `cache` is True, outputs are cached in the process-wide `GuardrailCache`; you can also
+    pass your own cache.
     """
 
     def decorator(
         f: _OutputGuardrailFuncSync[TContext_co] | _OutputGuardrailFuncAsync[TContext_co],
     ) -> OutputGuardrail[TContext_co]:
-        return OutputGuardrail(guardrail_function=f, name=name)
+        return OutputGuardrail(
+            guardrail_function=f,
+            name=name,
+            prefilters=list(prefilters or []),
+            cache=_resolve_cache(cache),
+        )
 
     if func is not None:
         # Decorator was used without parentheses
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import inspect
 from collections.abc import Awaitable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any, Callable, Generic, cast, overload
 
 from pydantic import TypeAdapter
@@ -98,6 +98,11 @@ class Handoff(Generic[TContext]):
     True, as it increases the likelihood of correct JSON input.
     """
 
+    _agent: Agent[Any] | None = field(default=None, repr=False)
+    """The agent being handed off to, if known. Used to resolve agents by name, e.g. when resuming
+    a run from a checkpoint.
+    """
+
     def get_transfer_message(self, agent: Agent[Any]) -> str:
         base = f"{{'assistant': '{agent.name}'}}"
         return base
@@ -233,4 +238,5 @@ def handoff(
         on_invoke_handoff=_invoke_handoff,
         input_filter=input_filter,
         agent_name=agent.name,
+        _agent=agent,
     )
@@ -25,6 +25,8 @@ from typing_extensions import TypeAlias
 
 from .exceptions import AgentsException, ModelBehaviorError
 from .usage import Usage
+from .util import _frozen
+from .util._dataclasses import add_slots
 
 if TYPE_CHECKING:
     from .agent import Agent
@@ -44,6 +46,7 @@ TResponseStreamEvent = ResponseStreamEvent
 T = TypeVar("T", bound=Union[TResponseOutputItem, TResponseInputItem])
 
 
+@add_slots
 @dataclass
 class RunItemBase(Generic[T], abc.ABC):
     agent: Agent[Any]
@@ -67,6 +70,7 @@ class RunItemBase(Generic[T], abc.ABC):
             raise AgentsException(f"Unexpected raw item type: {type(self.raw_item)}")
 
 
+@add_slots
 @dataclass
 class MessageOutputItem(RunItemBase[ResponseOutputMessage]):
     """Represents a message from the LLM."""
@@ -77,6 +81,7 @@ class MessageOutputItem(RunItemBase[ResponseOutputMessage]):
     type: Literal["message_output_item"] = "message_output_item"
 
 
+@add_slots
 @dataclass
 class HandoffCallItem(RunItemBase[ResponseFunctionToolCall]):
     """Represents a tool call for a handoff from one agent to another."""
@@ -87,6 +92,7 @@ class HandoffCallItem(RunItemBase[ResponseFunctionToolCall]):
     type: Literal["handoff_call_item"] = "handoff_call_item"
 
 
+@add_slots
 @dataclass
 class HandoffOutputItem(RunItemBase[TResponseInputItem]):
     """Represents the output of a handoff."""
@@ -112,6 +118,7 @@ ToolCallItemTypes: TypeAlias = Union[
 """A type that represents a tool call item."""
 
 
+@add_slots
 @dataclass
 class ToolCallItem(RunItemBase[ToolCallItemTypes]):
     """Represents a tool call e.g. a function call or computer action call."""
@@ -122,6 +129,7 @@ class ToolCallItem(RunItemBase[ToolCallItemTypes]):
     type: Literal["tool_call_item"] = "tool_call_item"
 
 
+@add_slots
 @dataclass
 class ToolCallOutputItem(RunItemBase[Union[FunctionCallOutput, ComputerCallOutput]]):
     """Represents the output of a tool call."""
@@ -137,6 +145,7 @@ class ToolCallOutputItem(RunItemBase[Union[FunctionCallOutput, ComputerCallOutpu
     type: Literal["tool_call_output_item"] = "tool_call_output_item"
 
 
+@add_slots
 @dataclass
 class ReasoningItem(RunItemBase[ResponseReasoningItem]):
     """Represents a reasoning item."""
@@ -158,6 +167,7 @@ RunItem: TypeAlias = Union[
 """An item generated by an agent."""
 
 
+@add_slots
 @dataclass
 class ModelResponse:
     output: list[TResponseOutputItem]
@@ -210,7 +220,9 @@ class ItemHelpers:
     def input_to_new_input_list(
         cls, input: str | list[TResponseInputItem]
     ) -> list[TResponseInputItem]:
-        """Converts a string or list of input items into a list of input items."""
+        """Converts a string or list of input items into a new list of input items. Frozen items
+        (see `freeze_input()`) are shared rather than copied.
+        """
         if isinstance(input, str):
             return [
                 {
@@ -218,7 +230,20 @@ class ItemHelpers:
                     "role": "user",
                 }
             ]
-        return copy.deepcopy(input)
+        return [item if _frozen.is_frozen(item) else copy.deepcopy(item) for item in input]
+
+    @classmethod
+    def freeze_input(cls, input: str | list[TResponseInputItem]) -> str | list[TResponseInputItem]:
+        """Returns a read-only version of the input. The runner freezes its input once, instead of
+        copying it, so the input can be shared with guardrails and models without copies, and
+        changes the caller makes to its own input can't leak into the run. Items of a frozen input
+        (e.g. the items returned by `RunResult.to_input_list()`) can be passed to later runs
+        without being copied again.
+
+        Frozen lists and dicts raise a `TypeError` when modified; `copy.deepcopy()` returns a
+        regular, mutable copy.
+        """
+        return _frozen.freeze(input)
 
     @classmethod
     def text_message_outputs(cls, items: list[RunItem]) -> str:
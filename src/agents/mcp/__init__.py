@@ -1,4 +1,5 @@
 try:
+    from .pool import MCPServerPool
     from .server import (
         MCPServer,
         MCPServerSse,
@@ -15,6 +16,7 @@ from .util import MCPUtil
 
 __all__ = [
     "MCPServer",
+    "MCPServerPool",
     "MCPServerSse",
     "MCPServerSseParams",
     "MCPServerStdio",
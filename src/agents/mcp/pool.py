@@ -0,0 +1,306 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Callable
+
+from mcp import Tool as MCPTool
+from mcp.types import CallToolResult
+
+from ..exceptions import UserError
+from ..logger import logger
+from .server import MCPServer
+
+
+class _PoolMember:
+    """A server in the pool. The server is connected and cleaned up in a dedicated task, because
+    the MCP clients require both to happen in the same task.
+    """
+
+    def __init__(self, server: MCPServer):
+        self.server = server
+        self.in_flight = 0
+        self.last_used = time.monotonic()
+        self._stop = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        ready: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._task = asyncio.create_task(self._run(ready))
+        await ready
+
+    async def _run(self, ready: asyncio.Future[None]) -> None:
+        try:
+            await self.server.connect()
+        except Exception as e:
+            ready.set_exception(e)
+            return
+
+        ready.set_result(None)
+        try:
+            await self._stop.wait()
+        finally:
+            await self.server.cleanup()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            await self._task
+
+
+class MCPServerPool(MCPServer):
+    """Runs several connections (e.g. several subprocesses for stdio servers) to the same MCP
+    server, so that concurrent tool calls don't all queue up behind one session.
+
+    Tool calls are dispatched to the least busy connection. When all connections are busy, a new
+    one is opened, up to `max_size`. Idle connections are pinged periodically; dead ones are
+    replaced, and connections that stay idle are closed down to `min_size`.
+
+    ```python
+    pool = MCPServerPool(
+        lambda: MCPServerStdio(params={"command": "python", "args": ["csv_server.py"]}),
+        max_size=8,
+    )
+    async with pool:
+        agent = Agent(name="Assistant", mcp_servers=[pool])
+    ```
+    """
+
+    def __init__(
+        self,
+        server_factory: Callable[[], MCPServer],
+        *,
+        min_size: int = 1,
+        max_size: int = 4,
+        name: str | None = None,
+        health_check_interval: float | None = 30.0,
+        idle_timeout: float = 60.0,
+        drain_timeout: float | None = 30.0,
+    ):
+        """Create a new pool.
+
+        Args:
+            server_factory: Creates a new, unconnected server. Called whenever the pool opens a
+                connection, so it should be cheap; all the built-in servers only do I/O in
+                `connect()`.
+            min_size: The number of connections to keep open.
+            max_size: The maximum number of connections to open.
+            name: A readable name for the pool. If not provided, we'll create one from the name of
+                the servers.
+            health_check_interval: How often (in seconds) to ping idle connections, replace dead
+                ones and close ones that have been idle for too long. None disables the periodic
+                check; you can still call `check_health()` yourself.
+            idle_timeout: How long (in seconds) a connection above `min_size` can stay idle before
+                it is closed.
+            drain_timeout: How long (in seconds) `cleanup()` waits for in-flight calls to finish
+                before closing the connections. None waits indefinitely.
+        """
+        if min_size < 1 or max_size < min_size:
+            raise UserError("MCPServerPool requires 1 <= min_size <= max_size")
+
+        self.server_factory = server_factory
+        self.min_size = min_size
+        self.max_size = max_size
+        self.health_check_interval = health_check_interval
+        self.idle_timeout = idle_timeout
+        self.drain_timeout = drain_timeout
+        self._name = name or f"pool: {server_factory().name}"
+
+        self._members: list[_PoolMember] = []
+        self._starting = 0
+        self._lock = asyncio.Lock()
+        self._connected = False
+        self._closing = False
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._health_check_task: asyncio.Task[None] | None = None
+
+        self._tools_list: list[MCPTool] | None = None
+        self._tools_list_version = 0
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.cleanup()
+
+    @property
+    def name(self) -> str:
+        """A readable name for the server."""
+        return self._name
+
+    @property
+    def size(self) -> int:
+        """The number of open connections."""
+        return len(self._members)
+
+    @property
+    def in_flight(self) -> int:
+        """The number of requests currently being handled by the pool."""
+        return sum(member.in_flight for member in self._members)
+
+    @property
+    def tools_list_version(self) -> int | None:
+        return self._tools_list_version
+
+    async def connect(self):
+        """Open `min_size` connections and start the periodic health check."""
+        self._closing = False
+        self._connected = True
+        await asyncio.gather(*(self._add_member() for _ in range(self.min_size - self.size)))
+        if self.health_check_interval is not None and self._health_check_task is None:
+            self._health_check_task = asyncio.create_task(self._health_check_loop())
+
+    async def list_tools(self) -> list[MCPTool]:
+        """List the tools available on the server."""
+        member = await self._acquire()
+        try:
+            tools = await member.server.list_tools()
+        finally:
+            self._release(member)
+
+        if tools != self._tools_list:
+            self._tools_list_version += 1
+        self._tools_list = list(tools)
+        return tools
+
+    async def call_tool(self, tool_name: str, arguments: dict[str, Any] | None) -> CallToolResult:
+        """Invoke a tool on the least busy connection."""
+        member = await self._acquire()
+        try:
+            return await member.server.call_tool(tool_name, arguments)
+        except Exception:
+            # Calls aren't retried, since tools may not be idempotent. But if the connection is
+            # dead, replace it so later calls don't fail too.
+            if not await self._ping(member):
+                logger.warning(f"MCP server connection in {self.name} is dead, replacing it")
+                await self._remove_member(member)
+            raise
+        finally:
+            self._release(member)
+
+    async def check_health(self) -> None:
+        """Ping idle connections and replace dead ones, close connections above `min_size` that
+        have been idle for longer than `idle_timeout`, and open connections up to `min_size`.
+        """
+        idle_members = [member for member in self._members if member.in_flight == 0]
+        healthy = await asyncio.gather(*(self._ping(member) for member in idle_members))
+        for member, is_healthy in zip(idle_members, healthy):
+            if not is_healthy and member.in_flight == 0:
+                logger.warning(f"MCP server connection in {self.name} is dead, replacing it")
+                await self._remove_member(member)
+
+        now = time.monotonic()
+        for member in list(self._members):
+            if self.size <= self.min_size:
+                break
+            if member.in_flight == 0 and now - member.last_used > self.idle_timeout:
+                await self._remove_member(member)
+
+        while not self._closing and self.size + self._starting < self.min_size:
+            try:
+                await self._add_member()
+            except Exception as e:
+                logger.error(f"Error opening MCP server connection in {self.name}: {e}")
+                break
+
+    async def cleanup(self):
+        """Stop accepting calls, wait for in-flight calls to finish, and close all connections."""
+        self._closing = True
+        if self._health_check_task is not None:
+            self._health_check_task.cancel()
+            try:
+                await self._health_check_task
+            except asyncio.CancelledError:
+                pass
+            self._health_check_task = None
+
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=self.drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Closing {self.name} with {self.in_flight} calls still in flight after "
+                f"{self.drain_timeout}s"
+            )
+
+        members, self._members = self._members, []
+        self._connected = False
+        await asyncio.gather(*(member.stop() for member in members), return_exceptions=True)
+
+    async def _health_check_loop(self) -> None:
+        assert self.health_check_interval is not None
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            try:
+                await self.check_health()
+            except Exception as e:
+                logger.error(f"Error checking health of {self.name}: {e}")
+
+    async def _add_member(self) -> _PoolMember:
+        self._starting += 1
+        try:
+            member = _PoolMember(self.server_factory())
+            await member.start()
+        finally:
+            self._starting -= 1
+
+        if self._closing:
+            await member.stop()
+            raise UserError(f"{self.name} was closed while connecting")
+        self._members.append(member)
+        return member
+
+    async def _remove_member(self, member: _PoolMember) -> None:
+        if member in self._members:
+            self._members.remove(member)
+            await member.stop()
+
+    async def _acquire(self) -> _PoolMember:
+        async with self._lock:
+            if self._closing:
+                raise UserError(f"{self.name} is closed")
+            if not self._connected:
+                raise UserError(
+                    f"{self.name} is not connected. Make sure you call `connect()` first."
+                )
+            member = min(self._members, key=lambda m: m.in_flight, default=None)
+            grow = member is None or member.in_flight > 0
+            if grow and self.size + self._starting < self.max_size:
+                # Reserve the slot now; the connection is opened outside of the lock.
+                self._starting += 1
+            else:
+                grow = False
+
+        if grow:
+            self._starting -= 1
+            try:
+                member = await self._add_member()
+            except Exception as e:
+                if member is None or member not in self._members:
+                    raise
+                logger.error(f"Error opening MCP server connection in {self.name}: {e}")
+
+        if member is None:
+            raise UserError(f"{self.name} has no open connections")
+
+        member.in_flight += 1
+        self._idle.clear()
+        return member
+
+    def _release(self, member: _PoolMember) -> None:
+        member.in_flight -= 1
+        member.last_used = time.monotonic()
+        if self.in_flight == 0:
+            self._idle.set()
+
+    async def _ping(self, member: _PoolMember) -> bool:
+        try:
+            session = getattr(member.server, "session", None)
+            if session is not None:
+                await session.send_ping()
+            else:
+                await member.server.list_tools()
+            return True
+        except Exception:
+            return False
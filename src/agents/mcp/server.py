@@ -12,7 +12,15 @@ from mcp import ClientSession, StdioServerParameters, Tool as MCPTool, stdio_cli
 from mcp.client.sse import sse_client
 from mcp.client.streamable_http import GetSessionIdCallback, streamablehttp_client
 from mcp.shared.message import SessionMessage
-from mcp.types import CallToolResult, InitializeResult
+from mcp.shared.session import RequestResponder
+from mcp.types import (
+    CallToolResult,
+    ClientResult,
+    InitializeResult,
+    ServerNotification,
+    ServerRequest,
+    ToolListChangedNotification,
+)
 from typing_extensions import NotRequired, TypedDict
 
 from ..exceptions import UserError
@@ -53,11 +61,31 @@ class MCPServer(abc.ABC):
         """Invoke a tool on the server."""
         pass
 
+    @property
+    def tools_list_version(self) -> int | None:
+        """A number that changes whenever the list returned by `list_tools()` changes. It lets
+        callers reuse whatever they derived from the previous list (e.g. converted function
+        tools). None, the default, means the server doesn't track versions.
+        """
+        return None
+
+    @property
+    def cache_tool_results(self) -> bool:
+        """Whether the results of the server's read-only, closed-world tools (see
+        `MCPUtil.is_cacheable`) are cached. Off by default.
+        """
+        return False
+
 
 class _MCPServerWithClientSession(MCPServer, abc.ABC):
     """Base class for MCP servers that use a `ClientSession` to communicate with the server."""
 
-    def __init__(self, cache_tools_list: bool, client_session_timeout_seconds: float | None):
+    def __init__(
+        self,
+        cache_tools_list: bool,
+        client_session_timeout_seconds: float | None,
+        cache_tool_results: bool = False,
+    ):
         """
         Args:
             cache_tools_list: Whether to cache the tools list. If `True`, the tools list will be
@@ -68,6 +96,9 @@ class _MCPServerWithClientSession(MCPServer, abc.ABC):
             (by avoiding a round-trip to the server every time).
 
             client_session_timeout_seconds: the read timeout passed to the MCP ClientSession.
+
+            cache_tool_results: Whether to cache the results of tools that are annotated as
+            read-only and closed-world, in the process-wide `ToolResultCache`.
         """
         self.session: ClientSession | None = None
         self.exit_stack: AsyncExitStack = AsyncExitStack()
@@ -80,6 +111,8 @@ class _MCPServerWithClientSession(MCPServer, abc.ABC):
         # The cache is always dirty at startup, so that we fetch tools at least once
         self._cache_dirty = True
         self._tools_list: list[MCPTool] | None = None
+        self._tools_list_version = 0
+        self._cache_tool_results = cache_tool_results
 
     @abc.abstractmethod
     def create_streams(
@@ -105,6 +138,32 @@ class _MCPServerWithClientSession(MCPServer, abc.ABC):
         """Invalidate the tools cache."""
         self._cache_dirty = True
 
+    @property
+    def tools_list_version(self) -> int | None:
+        return self._tools_list_version
+
+    @property
+    def cache_tool_results(self) -> bool:
+        return self._cache_tool_results
+
+    @property
+    def _server_notifies_tools_list_changes(self) -> bool:
+        """Whether the server sends `notifications/tools/list_changed` when its tools change."""
+        if self.server_initialize_result is None:
+            return False
+        tools_capability = self.server_initialize_result.capabilities.tools
+        return bool(tools_capability and tools_capability.listChanged)
+
+    async def _handle_message(
+        self,
+        message: RequestResponder[ServerRequest, ClientResult] | ServerNotification | Exception,
+    ) -> None:
+        if isinstance(message, ServerNotification) and isinstance(
+            message.root, ToolListChangedNotification
+        ):
+            logger.debug(f"Tools list changed on MCP server {self.name}")
+            self.invalidate_tools_cache()
+
     async def connect(self):
         """Connect to the server."""
         try:
@@ -121,6 +180,7 @@ class _MCPServerWithClientSession(MCPServer, abc.ABC):
                     timedelta(seconds=self.client_session_timeout_seconds)
                     if self.client_session_timeout_seconds
                     else None,
+                    message_handler=self._handle_message,
                 )
             )
             server_result = await session.initialize()
@@ -136,15 +196,20 @@ class _MCPServerWithClientSession(MCPServer, abc.ABC):
         if not self.session:
             raise UserError("Server not initialized. Make sure you call `connect()` first.")
 
-        # Return from cache if caching is enabled, we have tools, and the cache is not dirty
-        if self.cache_tools_list and not self._cache_dirty and self._tools_list:
+        # Return from cache if caching is enabled, we have tools, and the cache is not dirty. If the
+        # server notifies us of changes to its tools, the cache is always safe to use.
+        use_cache = self.cache_tools_list or self._server_notifies_tools_list_changes
+        if use_cache and not self._cache_dirty and self._tools_list:
             return self._tools_list
 
         # Reset the cache dirty to False
         self._cache_dirty = False
 
         # Fetch the tools from the server
-        self._tools_list = (await self.session.list_tools()).tools
+        tools = (await self.session.list_tools()).tools
+        if tools != self._tools_list:
+            self._tools_list_version += 1
+        self._tools_list = tools
         return self._tools_list
 
     async def call_tool(self, tool_name: str, arguments: dict[str, Any] | None) -> CallToolResult:
@@ -206,6 +271,7 @@ class MCPServerStdio(_MCPServerWithClientSession):
         cache_tools_list: bool = False,
         name: str | None = None,
         client_session_timeout_seconds: float | None = 5,
+        cache_tool_results: bool = False,
     ):
         """Create a new MCP server based on the stdio transport.
 
@@ -219,12 +285,19 @@ class MCPServerStdio(_MCPServerWithClientSession):
                 fetched from the server on each call to `list_tools()`. The cache can be
                 invalidated by calling `invalidate_tools_cache()`. You should set this to `True`
                 if you know the server will not change its tools list, because it can drastically
-                improve latency (by avoiding a round-trip to the server every time).
+                improve latency (by avoiding a round-trip to the server every time). Servers that
+                send `tools/list_changed` notifications are always cached, and the cache is
+                invalidated when a notification arrives.
             name: A readable name for the server. If not provided, we'll create one from the
                 command.
             client_session_timeout_seconds: the read timeout passed to the MCP ClientSession.
+            cache_tool_results: Whether to cache the results of tools that are annotated as
+                read-only (`readOnlyHint`) and closed-world (`openWorldHint=False`). Results are
+                kept in the process-wide `ToolResultCache`, for this server instance and tools list
+                version only, and expire after the cache's TTL. Only enable this if the data the
+                tools read doesn't change while the results are cached.
         """
-        super().__init__(cache_tools_list, client_session_timeout_seconds)
+        super().__init__(cache_tools_list, client_session_timeout_seconds, cache_tool_results)
 
         self.params = StdioServerParameters(
             command=params["command"],
@@ -283,6 +356,7 @@ class MCPServerSse(_MCPServerWithClientSession):
         cache_tools_list: bool = False,
         name: str | None = None,
         client_session_timeout_seconds: float | None = 5,
+        cache_tool_results: bool = False,
     ):
         """Create a new MCP server based on the HTTP with SSE transport.
 
@@ -296,14 +370,22 @@ class MCPServerSse(_MCPServerWithClientSession):
                 fetched from the server on each call to `list_tools()`. The cache can be
                 invalidated by calling `invalidate_tools_cache()`. You should set this to `True`
                 if you know the server will not change its tools list, because it can drastically
-                improve latency (by avoiding a round-trip to the server every time).
+                improve latency (by avoiding a round-trip to the server every time). Servers that
+                send `tools/list_changed` notifications are always cached, and the cache is
+                invalidated when a notification arrives.
 
             name: A readable name for the server. If not provided, we'll create one from the
                 URL.
 
             client_session_timeout_seconds: the read timeout passed to the MCP ClientSession.
+
+            cache_tool_results: Whether to cache the results of tools that are annotated as
+                read-only (`readOnlyHint`) and closed-world (`openWorldHint=False`). Results are
+                kept in the process-wide `ToolResultCache`, for this server instance and tools list
+                version only, and expire after the cache's TTL. Only enable this if the data the
+                tools read doesn't change while the results are cached.
         """
-        super().__init__(cache_tools_list, client_session_timeout_seconds)
+        super().__init__(cache_tools_list, client_session_timeout_seconds, cache_tool_results)
 
         self.params = params
         self._name = name or f"sse: {self.params['url']}"
@@ -362,6 +444,7 @@ class MCPServerStreamableHttp(_MCPServerWithClientSession):
         cache_tools_list: bool = False,
         name: str | None = None,
         client_session_timeout_seconds: float | None = 5,
+        cache_tool_results: bool = False,
     ):
         """Create a new MCP server based on the Streamable HTTP transport.
 
@@ -376,14 +459,22 @@ class MCPServerStreamableHttp(_MCPServerWithClientSession):
                 fetched from the server on each call to `list_tools()`. The cache can be
                 invalidated by calling `invalidate_tools_cache()`. You should set this to `True`
                 if you know the server will not change its tools list, because it can drastically
-                improve latency (by avoiding a round-trip to the server every time).
+                improve latency (by avoiding a round-trip to the server every time). Servers that
+                send `tools/list_changed` notifications are always cached, and the cache is
+                invalidated when a notification arrives.
 
             name: A readable name for the server. If not provided, we'll create one from the
                 URL.
 
             client_session_timeout_seconds: the read timeout passed to the MCP ClientSession.
+
+            cache_tool_results: Whether to cache the results of tools that are annotated as
+                read-only (`readOnlyHint`) and closed-world (`openWorldHint=False`). Results are
+                kept in the process-wide `ToolResultCache`, for this server instance and tools list
+                version only, and expire after the cache's TTL. Only enable this if the data the
+                tools read doesn't change while the results are cached.
         """
-        super().__init__(cache_tools_list, client_session_timeout_seconds)
+        super().__init__(cache_tools_list, client_session_timeout_seconds, cache_tool_results)
 
         self.params = params
         self._name = name or f"streamable_http: {self.params['url']}"
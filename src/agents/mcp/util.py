@@ -1,5 +1,7 @@
+import asyncio
 import functools
 import json
+import weakref
 from typing import TYPE_CHECKING, Any
 
 from agents.strict_schema import ensure_strict_json_schema
@@ -9,6 +11,7 @@ from ..exceptions import AgentsException, ModelBehaviorError, UserError
 from ..logger import logger
 from ..run_context import RunContextWrapper
 from ..tool import FunctionTool, Tool
+from ..tool_cache import default_tool_result_cache, invoke_with_cache
 from ..tracing import FunctionSpanData, get_current_span, mcp_tools_span
 
 if TYPE_CHECKING:
@@ -17,6 +20,13 @@ if TYPE_CHECKING:
     from .server import MCPServer
 
 
+# Function tools converted from each server's tools list, keyed by server. Each entry is
+# (tools_list_version, convert_schemas_to_strict, tools).
+_function_tools_cache: "weakref.WeakKeyDictionary[MCPServer, tuple[int, bool, list[Tool]]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
 class MCPUtil:
     """Set of utilities for interop between MCP and Agents SDK tools."""
 
@@ -24,11 +34,14 @@ class MCPUtil:
     async def get_all_function_tools(
         cls, servers: list["MCPServer"], convert_schemas_to_strict: bool
     ) -> list[Tool]:
-        """Get all function tools from a list of MCP servers."""
+        """Get all function tools from a list of MCP servers, querying them concurrently."""
+        all_server_tools = await asyncio.gather(
+            *(cls.get_function_tools(server, convert_schemas_to_strict) for server in servers)
+        )
+
         tools = []
         tool_names: set[str] = set()
-        for server in servers:
-            server_tools = await cls.get_function_tools(server, convert_schemas_to_strict)
+        for server_tools in all_server_tools:
             server_tool_names = {tool.name for tool in server_tools}
             if len(server_tool_names & tool_names) > 0:
                 raise UserError(
@@ -44,20 +57,39 @@ class MCPUtil:
     async def get_function_tools(
         cls, server: "MCPServer", convert_schemas_to_strict: bool
     ) -> list[Tool]:
-        """Get all function tools from a single MCP server."""
+        """Get all function tools from a single MCP server. If the server tracks a tools list
+        version, the converted tools are reused until the version changes.
+        """
 
         with mcp_tools_span(server=server.name) as span:
             tools = await server.list_tools()
             span.span_data.result = [tool.name for tool in tools]
 
-        return [cls.to_function_tool(tool, server, convert_schemas_to_strict) for tool in tools]
+        version = server.tools_list_version
+        if version is not None:
+            cached = _function_tools_cache.get(server)
+            if cached is not None and cached[:2] == (version, convert_schemas_to_strict):
+                return list(cached[2])
+
+        function_tools: list[Tool] = [
+            cls.to_function_tool(tool, server, convert_schemas_to_strict) for tool in tools
+        ]
+        if version is not None:
+            _function_tools_cache[server] = (version, convert_schemas_to_strict, function_tools)
+        return list(function_tools)
 
     @classmethod
     def to_function_tool(
         cls, tool: "MCPTool", server: "MCPServer", convert_schemas_to_strict: bool
     ) -> FunctionTool:
         """Convert an MCP tool to an Agents SDK function tool."""
-        invoke_func = functools.partial(cls.invoke_mcp_tool, server, tool)
+        invoke_func = functools.partial(
+            cls.invoke_cached_mcp_tool
+            if server.cache_tool_results and cls.is_cacheable(tool)
+            else cls.invoke_mcp_tool,
+            server,
+            tool,
+        )
         schema, is_strict = tool.inputSchema, False
 
         # MCP spec doesn't require the inputSchema to have `properties`, but OpenAI spec does.
@@ -79,6 +111,37 @@ class MCPUtil:
             strict_json_schema=is_strict,
         )
 
+    @staticmethod
+    def is_cacheable(tool: "MCPTool") -> bool:
+        """Whether the tool's results can be cached. The tool must be annotated as read-only and
+        as not interacting with the outside world (`openWorldHint` defaults to True). Results are
+        only cached if the server also enables `cache_tool_results`.
+        """
+        annotations = getattr(tool, "annotations", None)
+        return (
+            annotations is not None
+            and annotations.readOnlyHint is True
+            and annotations.openWorldHint is False
+        )
+
+    @classmethod
+    async def invoke_cached_mcp_tool(
+        cls, server: "MCPServer", tool: "MCPTool", context: RunContextWrapper[Any], input_json: str
+    ) -> str:
+        """Invoke an MCP tool through the default `ToolResultCache`. Results are keyed by the
+        server instance (not just its name) and its current tools list version, so servers with the
+        same name don't share results, and a new tools list invalidates them.
+        """
+        result: str = await invoke_with_cache(
+            default_tool_result_cache(),
+            f"{server.name}/{tool.name}",
+            context,
+            input_json,
+            lambda _: (server, server.tools_list_version),
+            lambda: cls.invoke_mcp_tool(server, tool, context, input_json),
+        )
+        return result
+
     @classmethod
     async def invoke_mcp_tool(
         cls, server: "MCPServer", tool: "MCPTool", context: RunContextWrapper[Any], input_json: str
@@ -4,6 +4,7 @@ from openai import AsyncOpenAI
 
 from ..exceptions import UserError
 from .interface import Model, ModelProvider
+from .openai_client_pool import OpenAIClientPool
 from .openai_provider import OpenAIProvider
 
 
@@ -70,6 +71,8 @@ class MultiProvider(ModelProvider):
         openai_organization: str | None = None,
         openai_project: str | None = None,
         openai_use_responses: bool | None = None,
+        openai_client_pool: OpenAIClientPool | None = None,
+        openai_cache_models: bool = True,
     ) -> None:
         """Create a new OpenAI provider.
 
@@ -86,6 +89,10 @@ class MultiProvider(ModelProvider):
             openai_organization: The organization to use for the OpenAI provider.
             openai_project: The project to use for the OpenAI provider.
             openai_use_responses: Whether to use the OpenAI responses API.
+            openai_client_pool: An optional pool to get the OpenAI client from. See
+                `OpenAIProvider` for details.
+            openai_cache_models: Whether the OpenAI provider should reuse model instances across
+                `get_model` calls.
         """
         self.provider_map = provider_map
         self.openai_provider = OpenAIProvider(
@@ -95,6 +102,8 @@ class MultiProvider(ModelProvider):
             organization=openai_organization,
             project=openai_project,
             use_responses=openai_use_responses,
+            client_pool=openai_client_pool,
+            cache_models=openai_cache_models,
         )
 
         self._fallback_providers: dict[str, ModelProvider] = {}
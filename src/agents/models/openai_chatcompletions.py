@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import time
 from collections.abc import AsyncIterator
@@ -16,7 +17,7 @@ from ..handoffs import Handoff
 from ..items import ModelResponse, TResponseInputItem, TResponseStreamEvent
 from ..logger import logger
 from ..tool import Tool
-from ..tracing import generation_span
+from ..tracing import SpanError, generation_span
 from ..tracing.span_data import GenerationSpanData
 from ..tracing.spans import Span
 from ..usage import Usage
@@ -135,11 +136,21 @@ class OpenAIChatCompletionsModel(Model):
             )
 
             final_response: Response | None = None
-            async for chunk in ChatCmplStreamHandler.handle_stream(response, stream):
-                yield chunk
+            try:
+                async for chunk in ChatCmplStreamHandler.handle_stream(response, stream):
+                    yield chunk
 
-                if chunk.type == "response.completed":
-                    final_response = chunk.response
+                    if chunk.type == "response.completed":
+                        final_response = chunk.response
+            except (asyncio.CancelledError, GeneratorExit):
+                span_generation.set_error(SpanError(message="Response stream cancelled", data={}))
+                raise
+            finally:
+                # Close the HTTP response as soon as we stop reading, e.g. because the run was
+                # cancelled. This stops the generation server-side and releases the connection.
+                close = getattr(stream, "close", None)
+                if close is not None:
+                    await close()
 
             if tracing.include_data() and final_response:
                 span_generation.span_data.output = [final_response.model_dump()]
@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import threading
+from dataclasses import dataclass, field
+from typing import Optional
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+from ..logger import logger
+
+
+@dataclass(frozen=True)
+class HTTPClientConfig:
+    """Connection settings for the httpx client backing a pooled `AsyncOpenAI` client."""
+
+    max_connections: int | None = 1000
+    """The maximum number of concurrent connections to the endpoint."""
+
+    max_keepalive_connections: int | None = 100
+    """The maximum number of idle connections kept open for reuse."""
+
+    keepalive_expiry: float | None = 5.0
+    """How long (in seconds) an idle connection is kept open before being closed."""
+
+    http2: bool = False
+    """Whether to enable HTTP/2. Requires the `h2` package (`pip install "httpx[http2]"`)."""
+
+    timeout: float | None = 600.0
+    """The overall request timeout, in seconds."""
+
+    connect_timeout: float | None = 5.0
+    """The timeout for establishing a connection, in seconds."""
+
+    def create_http_client(self) -> httpx.AsyncClient:
+        """Creates a new httpx client with these settings."""
+        return DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(timeout=self.timeout, connect=self.connect_timeout),
+            http2=self.http2,
+        )
+
+
+@dataclass
+class EndpointStats:
+    """Usage statistics for a single pooled client."""
+
+    base_url: str | None
+    """The base URL of the endpoint, or None for the default OpenAI endpoint."""
+
+    requests: int = 0
+    """The number of requests sent through this client."""
+
+    open_connections: int = 0
+    """The number of connections currently open to the endpoint."""
+
+    idle_connections: int = 0
+    """The number of open connections that are idle and available for reuse."""
+
+
+@dataclass
+class ClientPoolStats:
+    """A snapshot of the state of an `OpenAIClientPool`."""
+
+    clients_created: int = 0
+    """The total number of clients created by the pool."""
+
+    client_hits: int = 0
+    """The number of times an existing client was reused."""
+
+    endpoints: list[EndpointStats] = field(default_factory=list)
+    """Per-client statistics."""
+
+
+_ClientKey = tuple[Optional[str], str, Optional[str], Optional[str]]
+
+
+@dataclass
+class _PooledClient:
+    client: AsyncOpenAI
+    http_client: httpx.AsyncClient
+    base_url: str | None
+    requests: int = 0
+
+
+class OpenAIClientPool:
+    """A pool of `AsyncOpenAI` clients, keyed by base URL and credentials. Each client gets its own
+    httpx connection pool, so connections are reused across requests to the same endpoint, and
+    connection limits, keepalive and HTTP/2 can be tuned per endpoint.
+
+    ```python
+    pool = OpenAIClientPool(
+        endpoint_configs={"https://my-proxy.example.com/v1": HTTPClientConfig(http2=True)},
+    )
+    provider = OpenAIProvider(base_url="https://my-proxy.example.com/v1", client_pool=pool)
+    ```
+    """
+
+    def __init__(
+        self,
+        *,
+        default_config: HTTPClientConfig | None = None,
+        endpoint_configs: dict[str, HTTPClientConfig] | None = None,
+    ) -> None:
+        """Create a new client pool.
+
+        Args:
+            default_config: The HTTP settings to use for endpoints that aren't listed in
+                `endpoint_configs`.
+            endpoint_configs: Per base URL HTTP settings.
+        """
+        self._default_config = default_config or HTTPClientConfig()
+        self._endpoint_configs = {
+            self._normalize_url(url): config for url, config in (endpoint_configs or {}).items()
+        }
+        self._clients: dict[_ClientKey, _PooledClient] = {}
+        self._lock = threading.Lock()
+        self._clients_created = 0
+        self._client_hits = 0
+
+    @staticmethod
+    def _normalize_url(url: str | None) -> str | None:
+        return url.rstrip("/") if url else None
+
+    def _make_key(
+        self,
+        base_url: str | None,
+        api_key: str | None,
+        organization: str | None,
+        project: str | None,
+    ) -> _ClientKey:
+        # Don't keep the raw API key around in the pool keys.
+        key_digest = hashlib.sha256((api_key or "").encode()).hexdigest()
+        return (self._normalize_url(base_url), key_digest, organization, project)
+
+    def get_config(self, base_url: str | None) -> HTTPClientConfig:
+        """Returns the HTTP settings used for the given base URL."""
+        return self._endpoint_configs.get(self._normalize_url(base_url), self._default_config)
+
+    def get_client(
+        self,
+        *,
+        base_url: str | None = None,
+        api_key: str | None = None,
+        organization: str | None = None,
+        project: str | None = None,
+    ) -> AsyncOpenAI:
+        """Returns a client for the given endpoint and credentials, creating it if needed.
+
+        Args:
+            base_url: The base URL of the endpoint. If not provided, the default OpenAI base URL
+                is used.
+            api_key: The API key to use.
+            organization: The organization to use.
+            project: The project to use.
+        """
+        key = self._make_key(base_url, api_key, organization, project)
+        with self._lock:
+            pooled = self._clients.get(key)
+            if pooled is not None:
+                self._client_hits += 1
+                return pooled.client
+
+            http_client = self.get_config(base_url).create_http_client()
+            pooled = _PooledClient(
+                client=AsyncOpenAI(
+                    api_key=api_key,
+                    base_url=base_url,
+                    organization=organization,
+                    project=project,
+                    http_client=http_client,
+                ),
+                http_client=http_client,
+                base_url=self._normalize_url(base_url),
+            )
+            http_client.event_hooks["request"].append(self._make_request_counter(pooled))
+            self._clients[key] = pooled
+            self._clients_created += 1
+            return pooled.client
+
+    @staticmethod
+    def _make_request_counter(pooled: _PooledClient):
+        async def _count_request(request: httpx.Request) -> None:
+            pooled.requests += 1
+
+        return _count_request
+
+    async def warmup(self, connections: int = 1) -> None:
+        """Opens connections to every endpoint in the pool ahead of the first real request, so that
+        the TCP and TLS handshakes are not on the critical path. Errors are logged and ignored.
+
+        Args:
+            connections: The number of connections to open per endpoint.
+        """
+        with self._lock:
+            pooled_clients = list(self._clients.values())
+
+        async def _connect(pooled: _PooledClient) -> None:
+            try:
+                await pooled.http_client.head(str(pooled.client.base_url))
+            except httpx.HTTPError as e:
+                logger.debug(f"Warmup request to {pooled.client.base_url} failed: {e}")
+
+        await asyncio.gather(
+            *(_connect(pooled) for pooled in pooled_clients for _ in range(connections))
+        )
+
+    def stats(self) -> ClientPoolStats:
+        """Returns a snapshot of the pool's statistics."""
+        with self._lock:
+            endpoints = [self._endpoint_stats(pooled) for pooled in self._clients.values()]
+            return ClientPoolStats(
+                clients_created=self._clients_created,
+                client_hits=self._client_hits,
+                endpoints=endpoints,
+            )
+
+    @staticmethod
+    def _endpoint_stats(pooled: _PooledClient) -> EndpointStats:
+        stats = EndpointStats(base_url=pooled.base_url, requests=pooled.requests)
+        # httpx doesn't expose pool state publicly, so we peek at the transport's connection pool.
+        # If the internals change we just report zero connections.
+        transport = getattr(pooled.http_client, "_transport", None)
+        connections = getattr(getattr(transport, "_pool", None), "connections", None) or []
+        for connection in connections:
+            stats.open_connections += 1
+            if connection.is_idle():
+                stats.idle_connections += 1
+        return stats
+
+    async def aclose(self) -> None:
+        """Closes all clients in the pool."""
+        with self._lock:
+            pooled_clients = list(self._clients.values())
+            self._clients.clear()
+
+        for pooled in pooled_clients:
+            await pooled.http_client.aclose()
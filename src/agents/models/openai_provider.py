@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import os
+
 import httpx
 from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 
 from . import _openai_shared
 from .interface import Model, ModelProvider
 from .openai_chatcompletions import OpenAIChatCompletionsModel
+from .openai_client_pool import OpenAIClientPool
 from .openai_responses import OpenAIResponsesModel
 
 DEFAULT_MODEL: str = "gpt-4o"
@@ -33,6 +36,8 @@ class OpenAIProvider(ModelProvider):
         organization: str | None = None,
         project: str | None = None,
         use_responses: bool | None = None,
+        client_pool: OpenAIClientPool | None = None,
+        cache_models: bool = True,
     ) -> None:
         """Create a new OpenAI provider.
 
@@ -46,11 +51,18 @@ class OpenAIProvider(ModelProvider):
             organization: The organization to use for the OpenAI client.
             project: The project to use for the OpenAI client.
             use_responses: Whether to use the OpenAI responses API.
+            client_pool: An optional pool to get the OpenAI client from. Providers that share a
+                pool share clients (and therefore connections) for the same base URL and
+                credentials. If not provided, we use a client backed by a global shared httpx
+                client.
+            cache_models: Whether to reuse model instances across `get_model` calls for the same
+                model name and API.
         """
         if openai_client is not None:
             assert api_key is None and base_url is None, (
                 "Don't provide api_key or base_url if you provide openai_client"
             )
+            assert client_pool is None, "Don't provide client_pool if you provide openai_client"
             self._client: AsyncOpenAI | None = openai_client
         else:
             self._client = None
@@ -64,17 +76,33 @@ class OpenAIProvider(ModelProvider):
         else:
             self._use_responses = _openai_shared.get_use_responses_by_default()
 
+        self._client_pool = client_pool
+        self._cache_models = cache_models
+        self._models: dict[tuple[str, bool], Model] = {}
+
     # We lazy load the client in case you never actually use OpenAIProvider(). Otherwise
     # AsyncOpenAI() raises an error if you don't have an API key set.
     def _get_client(self) -> AsyncOpenAI:
         if self._client is None:
-            self._client = _openai_shared.get_default_openai_client() or AsyncOpenAI(
-                api_key=self._stored_api_key or _openai_shared.get_default_openai_key(),
-                base_url=self._stored_base_url,
-                organization=self._stored_organization,
-                project=self._stored_project,
-                http_client=shared_http_client(),
-            )
+            self._client = _openai_shared.get_default_openai_client()
+        if self._client is None:
+            api_key = self._stored_api_key or _openai_shared.get_default_openai_key()
+            if self._client_pool is not None:
+                self._client = self._client_pool.get_client(
+                    base_url=self._stored_base_url,
+                    # Resolve the env var here so that the pool key reflects the real credentials.
+                    api_key=api_key or os.environ.get("OPENAI_API_KEY"),
+                    organization=self._stored_organization,
+                    project=self._stored_project,
+                )
+            else:
+                self._client = AsyncOpenAI(
+                    api_key=api_key,
+                    base_url=self._stored_base_url,
+                    organization=self._stored_organization,
+                    project=self._stored_project,
+                    http_client=shared_http_client(),
+                )
 
         return self._client
 
@@ -82,10 +110,19 @@ class OpenAIProvider(ModelProvider):
         if model_name is None:
             model_name = DEFAULT_MODEL
 
+        # Models are stateless wrappers around the client, so we can reuse them across turns
+        # instead of creating a new one each time the runner asks for a model.
+        cache_key = (model_name, self._use_responses)
+        if self._cache_models and (cached := self._models.get(cache_key)) is not None:
+            return cached
+
         client = self._get_client()
 
-        return (
+        model: Model = (
             OpenAIResponsesModel(model=model_name, openai_client=client)
             if self._use_responses
             else OpenAIChatCompletionsModel(model=model_name, openai_client=client)
         )
+        if self._cache_models:
+            self._models[cache_key] = model
+        return model
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import json
 from collections.abc import AsyncIterator
 from dataclasses import dataclass
@@ -140,6 +141,7 @@ class OpenAIResponsesModel(Model):
         Yields a partial message as it is generated, as well as the usage information.
         """
         with response_span(disabled=tracing.is_disabled()) as span_response:
+            stream: AsyncStream[ResponseStreamEvent] | None = None
             try:
                 stream = await self._fetch_response(
                     system_instructions,
@@ -163,6 +165,9 @@ class OpenAIResponsesModel(Model):
                     span_response.span_data.response = final_response
                     span_response.span_data.input = input
 
+            except (asyncio.CancelledError, GeneratorExit):
+                span_response.set_error(SpanError(message="Response stream cancelled", data={}))
+                raise
             except Exception as e:
                 span_response.set_error(
                     SpanError(
@@ -174,6 +179,13 @@ class OpenAIResponsesModel(Model):
                 )
                 logger.error(f"Error streaming response: {e}")
                 raise
+            finally:
+                # Close the HTTP response as soon as we stop reading, e.g. because the run was
+                # cancelled. This stops the generation server-side and releases the connection.
+                if stream is not None:
+                    close = getattr(stream, "close", None)
+                    if close is not None:
+                        await close()
 
     @overload
     async def _fetch_response(
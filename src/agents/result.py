@@ -2,13 +2,14 @@ from __future__ import annotations
 
 import abc
 import asyncio
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Iterable
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any, cast
 
 from typing_extensions import TypeVar
 
 from ._run_impl import QueueCompleteSentinel
+from ._stream_queue import StreamEventQueue
 from .agent import Agent
 from .agent_output import AgentOutputSchemaBase
 from .exceptions import InputGuardrailTripwireTriggered, MaxTurnsExceeded
@@ -16,7 +17,7 @@ from .guardrail import InputGuardrailResult, OutputGuardrailResult
 from .items import ItemHelpers, ModelResponse, RunItem, TResponseInputItem
 from .logger import logger
 from .run_context import RunContextWrapper
-from .stream_events import StreamEvent
+from .stream_events import StreamEvent, StreamEventType
 from .tracing import Trace
 from .util._pretty_print import pretty_print_result, pretty_print_run_result_streaming
 
@@ -136,9 +137,7 @@ class RunResultStreaming(RunResultBase):
     """Whether the agent has finished running."""
 
     # Queues that the background run_loop writes to
-    _event_queue: asyncio.Queue[StreamEvent | QueueCompleteSentinel] = field(
-        default_factory=asyncio.Queue, repr=False
-    )
+    _event_queue: StreamEventQueue = field(default_factory=StreamEventQueue, repr=False)
     _input_guardrail_queue: asyncio.Queue[InputGuardrailResult] = field(
         default_factory=asyncio.Queue, repr=False
     )
@@ -149,6 +148,11 @@ class RunResultStreaming(RunResultBase):
     _output_guardrails_task: asyncio.Task[Any] | None = field(default=None, repr=False)
     _stored_exception: Exception | None = field(default=None, repr=False)
 
+    # Set once the input guardrails have finished (or will never run). If
+    # `_gate_on_input_guardrails` is set, events aren't streamed until then.
+    _input_guardrails_done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+    _gate_on_input_guardrails: bool = field(default=False, repr=False)
+
     @property
     def last_agent(self) -> Agent[Any]:
         """The last agent that was run. Updates as the agent run progresses, so the true last agent
@@ -158,25 +162,64 @@ class RunResultStreaming(RunResultBase):
 
     def cancel(self) -> None:
         """Cancels the streaming run, stopping all background tasks and marking the run as
-        complete."""
+        complete. The model's response stream is closed as soon as the run task handles the
+        cancellation; use `aclose()` to wait for that.
+        """
         self._cleanup_tasks()  # Cancel all running tasks
         self.is_complete = True  # Mark the run as complete to stop event streaming
 
         # Optionally, clear the event queue to prevent processing stale events
-        while not self._event_queue.empty():
-            self._event_queue.get_nowait()
+        self._event_queue.clear()
         while not self._input_guardrail_queue.empty():
             self._input_guardrail_queue.get_nowait()
 
-    async def stream_events(self) -> AsyncIterator[StreamEvent]:
+    async def aclose(self) -> None:
+        """Cancels the streaming run like `cancel()`, and waits until the background tasks have
+        stopped. Once this returns, the model's response stream has been closed (which stops the
+        generation and releases the HTTP connection), and the spans of the run have been finished.
+        """
+        self.cancel()
+        tasks = [
+            task
+            for task in (
+                self._run_impl_task,
+                self._input_guardrails_task,
+                self._output_guardrails_task,
+            )
+            if task is not None
+        ]
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    @property
+    def dropped_events(self) -> int:
+        """The number of raw response events that were dropped because the consumer fell behind.
+        Only non-zero with `RunConfig.stream_backpressure` set to one of the drop policies.
+        """
+        return self._event_queue.dropped
+
+    async def stream_events(
+        self,
+        types: Iterable[StreamEventType] | None = None,
+        coalesce_text_ms: float | None = None,
+    ) -> AsyncIterator[StreamEvent]:
         """Stream deltas for new items as they are generated. We're using the types from the
         OpenAI Responses API, so these are semantic events: each event has a `type` field that
         describes the type of the event, along with the data for that event.
 
+        Args:
+            types: The event types to stream, e.g. `["run_item_stream_event"]`. Events of other
+                types are discarded by the run as they are produced, rather than queued. By default,
+                all events are streamed.
+            coalesce_text_ms: If set, consecutive text deltas for the same content part that are
+                produced within this many milliseconds are merged into a single
+                `response.output_text.delta` event. This trades a little latency for far fewer
+                events.
+
         This will raise:
         - A MaxTurnsExceeded exception if the agent exceeds the max_turns limit.
         - A GuardrailTripwireTriggered exception if a guardrail is tripped.
         """
+        self._event_queue.subscribe(types, coalesce_text_ms)
         while True:
             self._check_errors()
             if self._stored_exception:
@@ -184,6 +227,11 @@ class RunResultStreaming(RunResultBase):
                 self.is_complete = True
                 break
 
+            if self._gate_on_input_guardrails and not self._input_guardrails_done.is_set():
+                # Hold back all events until the input guardrails have passed.
+                await self._input_guardrails_done.wait()
+                continue
+
             if self.is_complete and self._event_queue.empty():
                 break
 
@@ -193,13 +241,12 @@ class RunResultStreaming(RunResultBase):
                 break
 
             if isinstance(item, QueueCompleteSentinel):
-                self._event_queue.task_done()
                 # Check for errors, in case the queue was completed due to an exception
                 self._check_errors()
                 break
 
-            yield item
-            self._event_queue.task_done()
+            if self._event_queue.accepts(item.type):
+                yield item
 
         self._cleanup_tasks()
 
@@ -216,18 +263,30 @@ class RunResultStreaming(RunResultBase):
             if guardrail_result.output.tripwire_triggered:
                 self._stored_exception = InputGuardrailTripwireTriggered(guardrail_result)
 
-        # Check the tasks for any exceptions
-        if self._run_impl_task and self._run_impl_task.done():
+        # Check the tasks for any exceptions. The run task is cancelled if an input guardrail trips.
+        if (
+            self._run_impl_task
+            and self._run_impl_task.done()
+            and not self._run_impl_task.cancelled()
+        ):
             exc = self._run_impl_task.exception()
             if exc and isinstance(exc, Exception):
                 self._stored_exception = exc
 
-        if self._input_guardrails_task and self._input_guardrails_task.done():
+        if (
+            self._input_guardrails_task
+            and self._input_guardrails_task.done()
+            and not self._input_guardrails_task.cancelled()
+        ):
             exc = self._input_guardrails_task.exception()
             if exc and isinstance(exc, Exception):
                 self._stored_exception = exc
 
-        if self._output_guardrails_task and self._output_guardrails_task.done():
+        if (
+            self._output_guardrails_task
+            and self._output_guardrails_task.done()
+            and not self._output_guardrails_task.cancelled()
+        ):
             exc = self._output_guardrails_task.exception()
             if exc and isinstance(exc, Exception):
                 self._stored_exception = exc
@@ -242,5 +301,16 @@ class RunResultStreaming(RunResultBase):
         if self._output_guardrails_task and not self._output_guardrails_task.done():
             self._output_guardrails_task.cancel()
 
+        self._input_guardrails_done.set()
+
+    def _stop_run(self) -> None:
+        """Cancel the background run (including any in-flight model request) and end the event
+        stream. Used when an input guardrail trips.
+        """
+        self.is_complete = True
+        if self._run_impl_task and not self._run_impl_task.done():
+            self._run_impl_task.cancel()
+        self._event_queue.put_nowait(QueueCompleteSentinel())
+
     def __str__(self) -> str:
         return pretty_print_run_result_streaming(self)
@@ -1,9 +1,8 @@
 from __future__ import annotations
 
 import asyncio
-import copy
 from dataclasses import dataclass, field
-from typing import Any, cast
+from typing import Any, Callable, Literal, cast
 
 from openai.types.responses import ResponseCompletedEvent
 
@@ -13,19 +12,23 @@ from ._run_impl import (
     NextStepHandoff,
     NextStepRunAgain,
     QueueCompleteSentinel,
+    ResponseChainTracker,
     RunImpl,
     SingleStepResult,
     TraceCtxManager,
     get_model_tracing_impl,
 )
+from ._stream_queue import StreamEventQueue
 from .agent import Agent
 from .agent_output import AgentOutputSchema, AgentOutputSchemaBase
+from .checkpoint import CheckpointStore, RunState, gen_run_id
 from .exceptions import (
     AgentsException,
     InputGuardrailTripwireTriggered,
     MaxTurnsExceeded,
     ModelBehaviorError,
     OutputGuardrailTripwireTriggered,
+    UserError,
 )
 from .guardrail import InputGuardrail, InputGuardrailResult, OutputGuardrail, OutputGuardrailResult
 from .handoffs import Handoff, HandoffInputFilter, handoff
@@ -37,7 +40,7 @@ from .models.interface import Model, ModelProvider
 from .models.multi_provider import MultiProvider
 from .result import RunResult, RunResultStreaming
 from .run_context import RunContextWrapper, TContext
-from .stream_events import AgentUpdatedStreamEvent, RawResponsesStreamEvent
+from .stream_events import AgentUpdatedStreamEvent, StreamBackpressurePolicy
 from .tool import Tool
 from .tracing import Span, SpanError, agent_span, get_current_trace, trace
 from .tracing.span_data import AgentSpanData
@@ -105,6 +108,80 @@ class RunConfig:
     An optional dictionary of additional metadata to include with the trace.
     """
 
+    auto_previous_response_id: bool = False
+    """If True, each turn is chained to the previous turn's response via `previous_response_id`,
+    and only the items generated since then (e.g. tool outputs) are sent to the model, instead of
+    the full conversation. Only has an effect with models that store responses server-side, like
+    the OpenAI Responses API. If the chain can't be continued (for example, the model changes on a
+    handoff, or a handoff input filter rewrites the history), we fall back to sending the full
+    input.
+    """
+
+    checkpoint_store: CheckpointStore | None = None
+    """If set, the state of the run is saved to this store after every turn, so that the run can
+    be continued with `Runner.resume()` if the process dies, without redoing completed model calls
+    and tool executions. The checkpoint is deleted once the run completes. Only supported by
+    `Runner.run()` and `Runner.run_sync()`.
+    """
+
+    run_id: str | None = None
+    """The ID under which the run is checkpointed, and which is passed to `Runner.resume()`. If not
+    provided, a random ID is generated and logged. Only used if `checkpoint_store` is set.
+    """
+
+    gate_stream_on_input_guardrails: bool = False
+    """Only used by `Runner.run_streamed()`. By default, events from the first turn are streamed
+    while the input guardrails are still running, so a tripped guardrail can come after some
+    output has already been shown. If True, events are held back until all input guardrails pass.
+    The model call still runs concurrently with the guardrails, so this adds no latency when they
+    pass.
+    """
+
+    max_concurrent_tool_calls: int | None = None
+    """The maximum number of function tool calls from a single model response that run at the same
+    time. Calls over the limit wait for a slot. None means no limit. Tools can also set their own
+    limit with `FunctionTool.max_concurrency`.
+    """
+
+    tool_timeout: float | None = None
+    """The default timeout (in seconds) for function tool calls, used for tools that don't set
+    `FunctionTool.timeout`. None means no timeout.
+    """
+
+    max_raw_responses: int | None = None
+    """If set, only the last `max_raw_responses` model responses are kept in the result's
+    `raw_responses`, so long runs don't hold on to every response. `last_response_id` keeps
+    working. None keeps all of them.
+    """
+
+    retain_items: Literal["all", "final_turn"] = "all"
+    """Which generated items the result keeps in `new_items` once the run is complete. `all` keeps
+    everything. `final_turn` only keeps the items from the last turn (typically the final
+    message), which saves memory if you keep many results around; note that `to_input_list()`
+    then only includes those items.
+    """
+
+    stream_queue_max_size: int | None = None
+    """Only used by `Runner.run_streamed()`. The maximum number of raw response events that are
+    queued for `stream_events()`. When the consumer falls behind, `stream_backpressure` decides
+    what happens. None means no limit.
+    """
+
+    stream_backpressure: StreamBackpressurePolicy = "block"
+    """What to do with raw response events when the queue set by `stream_queue_max_size` is full:
+    `block` pauses the run (and the reading of the model's response) until the consumer catches
+    up, `drop_oldest` and `drop_newest` drop raw events. Run item and agent updated events are
+    never dropped.
+    """
+
+
+def _append_model_response(
+    responses: list[ModelResponse], response: ModelResponse, max_size: int | None
+) -> None:
+    responses.append(response)
+    if max_size is not None and len(responses) > max_size:
+        del responses[: len(responses) - max_size]
+
 
 class Runner:
     @classmethod
@@ -149,12 +226,90 @@ class Runner:
             A run result containing all the inputs, guardrail results and the output of the last
             agent. Agents may perform handoffs, so we don't know the specific type of the output.
         """
+        return await cls._run(
+            starting_agent,
+            input,
+            context=context,
+            max_turns=max_turns,
+            hooks=hooks,
+            run_config=run_config,
+            previous_response_id=previous_response_id,
+        )
+
+    @classmethod
+    async def resume(
+        cls,
+        starting_agent: Agent[TContext],
+        run_id: str,
+        *,
+        context: TContext | None = None,
+        max_turns: int = DEFAULT_MAX_TURNS,
+        hooks: RunHooks[TContext] | None = None,
+        run_config: RunConfig | None = None,
+    ) -> RunResult:
+        """Continue a checkpointed run from its last completed turn. Turns that were already
+        completed are not run again, i.e. the model isn't called and tools aren't executed again
+        for them. The run is otherwise continued just like `run()`, except that input guardrails
+        are not run again.
+
+        Args:
+            starting_agent: The agent the run was originally started with. Agents in the checkpoint
+                are looked up by name among this agent and the agents reachable via its handoffs.
+            run_id: The ID of the run to resume. See `RunConfig.run_id`.
+            context: The context to run the agent with. Contexts are not checkpointed, so pass the
+                same context as the original run.
+            max_turns: The maximum number of turns for the whole run, including the turns that
+                were completed before resuming.
+            hooks: An object that receives callbacks on various lifecycle events.
+            run_config: Global settings for the entire agent run. Must have the `checkpoint_store`
+                that the run was checkpointed to.
+
+        Returns:
+            A run result, like `run()`. It includes the items and raw responses from before the
+            run was resumed.
+        """
+        if run_config is None or run_config.checkpoint_store is None:
+            raise UserError("Resuming a run requires a checkpoint_store in the run config")
+
+        data = await run_config.checkpoint_store.load(run_id)
+        if data is None:
+            raise UserError(f"No checkpoint found for run {run_id!r}")
+        resume_state = RunState.from_json(data, starting_agent)
+
+        return await cls._run(
+            starting_agent,
+            resume_state.original_input,
+            context=context,
+            max_turns=max_turns,
+            hooks=hooks,
+            run_config=run_config,
+            previous_response_id=resume_state.previous_response_id,
+            resume_state=resume_state,
+        )
+
+    @classmethod
+    async def _run(
+        cls,
+        starting_agent: Agent[TContext],
+        input: str | list[TResponseInputItem],
+        *,
+        context: TContext | None,
+        max_turns: int,
+        hooks: RunHooks[TContext] | None,
+        run_config: RunConfig | None,
+        previous_response_id: str | None,
+        resume_state: RunState | None = None,
+    ) -> RunResult:
         if hooks is None:
             hooks = RunHooks[Any]()
         if run_config is None:
             run_config = RunConfig()
 
         tool_use_tracker = AgentToolUseTracker()
+        response_chain = ResponseChainTracker(
+            enabled=run_config.auto_previous_response_id,
+            previous_response_id=previous_response_id,
+        )
 
         with TraceCtxManager(
             workflow_name=run_config.workflow_name,
@@ -164,7 +319,9 @@ class Runner:
             disabled=run_config.tracing_disabled,
         ):
             current_turn = 0
-            original_input: str | list[TResponseInputItem] = copy.deepcopy(input)
+            # The input is frozen rather than copied, so it can be shared with the guardrails and
+            # the model without copies, and the caller can't change it while the run is going.
+            original_input = ItemHelpers.freeze_input(input)
             generated_items: list[RunItem] = []
             model_responses: list[ModelResponse] = []
 
@@ -178,6 +335,20 @@ class Runner:
             current_agent = starting_agent
             should_run_agent_start_hooks = True
 
+            checkpoint_store = run_config.checkpoint_store
+            run_id = run_config.run_id
+            if resume_state is not None:
+                run_id = resume_state.run_id
+                current_agent = cast(Agent[TContext], resume_state.current_agent)
+                current_turn = resume_state.current_turn
+                generated_items = resume_state.generated_items
+                model_responses = resume_state.model_responses
+                context_wrapper.usage = resume_state.usage
+                tool_use_tracker = resume_state.tool_use_tracker
+            elif checkpoint_store is not None and run_id is None:
+                run_id = gen_run_id()
+                logger.info(f"Checkpointing agent run with run_id={run_id}")
+
             try:
                 while True:
                     # Start an agent span if we don't have one. This span is ended if the current
@@ -215,12 +386,14 @@ class Runner:
                     )
 
                     if current_turn == 1:
-                        input_guardrail_results, turn_result = await asyncio.gather(
+                        # If a guardrail trips, the model call is cancelled right away instead of
+                        # generating a response that won't be used.
+                        input_guardrail_results, turn_result = await _coro.gather_cancel_on_error(
                             cls._run_input_guardrails(
                                 starting_agent,
                                 starting_agent.input_guardrails
                                 + (run_config.input_guardrails or []),
-                                copy.deepcopy(input),
+                                original_input,
                                 context_wrapper,
                             ),
                             cls._run_single_turn(
@@ -233,7 +406,7 @@ class Runner:
                                 run_config=run_config,
                                 should_run_agent_start_hooks=should_run_agent_start_hooks,
                                 tool_use_tracker=tool_use_tracker,
-                                previous_response_id=previous_response_id,
+                                response_chain=response_chain,
                             ),
                         )
                     else:
@@ -247,13 +420,15 @@ class Runner:
                             run_config=run_config,
                             should_run_agent_start_hooks=should_run_agent_start_hooks,
                             tool_use_tracker=tool_use_tracker,
-                            previous_response_id=previous_response_id,
+                            response_chain=response_chain,
                         )
                     should_run_agent_start_hooks = False
 
-                    model_responses.append(turn_result.model_response)
+                    _append_model_response(
+                        model_responses, turn_result.model_response, run_config.max_raw_responses
+                    )
                     original_input = turn_result.original_input
-                    generated_items = turn_result.generated_items
+                    generated_items = turn_result.append_to(generated_items)
 
                     if isinstance(turn_result.next_step, NextStepFinalOutput):
                         output_guardrail_results = await cls._run_output_guardrails(
@@ -262,9 +437,13 @@ class Runner:
                             turn_result.next_step.output,
                             context_wrapper,
                         )
-                        return RunResult(
+                        result = RunResult(
                             input=original_input,
-                            new_items=generated_items,
+                            new_items=(
+                                turn_result.new_step_items
+                                if run_config.retain_items == "final_turn"
+                                else generated_items
+                            ),
                             raw_responses=model_responses,
                             final_output=turn_result.next_step.output,
                             _last_agent=current_agent,
@@ -272,6 +451,9 @@ class Runner:
                             output_guardrail_results=output_guardrail_results,
                             context_wrapper=context_wrapper,
                         )
+                        if checkpoint_store is not None and run_id is not None:
+                            await checkpoint_store.delete(run_id)
+                        return result
                     elif isinstance(turn_result.next_step, NextStepHandoff):
                         current_agent = cast(Agent[TContext], turn_result.next_step.new_agent)
                         current_span.finish(reset_current=True)
@@ -283,6 +465,20 @@ class Runner:
                         raise AgentsException(
                             f"Unknown next step type: {type(turn_result.next_step)}"
                         )
+
+                    if checkpoint_store is not None and run_id is not None:
+                        state = RunState(
+                            run_id=run_id,
+                            current_agent=current_agent,
+                            current_turn=current_turn,
+                            original_input=original_input,
+                            generated_items=generated_items,
+                            model_responses=model_responses,
+                            usage=context_wrapper.usage,
+                            tool_use_tracker=tool_use_tracker,
+                            previous_response_id=previous_response_id,
+                        )
+                        await checkpoint_store.save(run_id, state.to_json())
             finally:
                 if current_span:
                     current_span.finish(reset_current=True)
@@ -412,7 +608,7 @@ class Runner:
         )
 
         streamed_result = RunResultStreaming(
-            input=copy.deepcopy(input),
+            input=ItemHelpers.freeze_input(input),
             new_items=[],
             current_agent=starting_agent,
             raw_responses=[],
@@ -427,10 +623,15 @@ class Runner:
             context_wrapper=context_wrapper,
         )
 
+        streamed_result._gate_on_input_guardrails = run_config.gate_stream_on_input_guardrails
+        streamed_result._event_queue = StreamEventQueue(
+            maxsize=run_config.stream_queue_max_size,
+            backpressure=run_config.stream_backpressure,
+        )
+
         # Kick off the actual agent loop in the background and return the streamed result object.
         streamed_result._run_impl_task = asyncio.create_task(
             cls._run_streamed_impl(
-                starting_input=input,
                 streamed_result=streamed_result,
                 starting_agent=starting_agent,
                 max_turns=max_turns,
@@ -465,6 +666,8 @@ class Runner:
         try:
             for done in asyncio.as_completed(guardrail_tasks):
                 result = await done
+                queue.put_nowait(result)
+                guardrail_results.append(result)
                 if result.output.tripwire_triggered:
                     _error_tracing.attach_error_to_span(
                         parent_span,
@@ -476,19 +679,23 @@ class Runner:
                             },
                         ),
                     )
-                queue.put_nowait(result)
-                guardrail_results.append(result)
-        except Exception:
+                    for t in guardrail_tasks:
+                        t.cancel()
+                    # Stop the run, which cancels the in-flight model request, and end the event
+                    # stream so `stream_events()` raises the tripwire.
+                    streamed_result._stop_run()
+                    break
+        except BaseException:
             for t in guardrail_tasks:
                 t.cancel()
             raise
-
-        streamed_result.input_guardrail_results = guardrail_results
+        finally:
+            streamed_result.input_guardrail_results = guardrail_results
+            streamed_result._input_guardrails_done.set()
 
     @classmethod
     async def _run_streamed_impl(
         cls,
-        starting_input: str | list[TResponseInputItem],
         streamed_result: RunResultStreaming,
         starting_agent: Agent[TContext],
         max_turns: int,
@@ -505,6 +712,10 @@ class Runner:
         current_turn = 0
         should_run_agent_start_hooks = True
         tool_use_tracker = AgentToolUseTracker()
+        response_chain = ResponseChainTracker(
+            enabled=run_config.auto_previous_response_id,
+            previous_response_id=previous_response_id,
+        )
 
         streamed_result._event_queue.put_nowait(AgentUpdatedStreamEvent(new_agent=current_agent))
 
@@ -552,7 +763,9 @@ class Runner:
                         cls._run_input_guardrails_with_queue(
                             starting_agent,
                             starting_agent.input_guardrails + (run_config.input_guardrails or []),
-                            copy.deepcopy(ItemHelpers.input_to_new_input_list(starting_input)),
+                            # Streamed guardrails get a list, even for str input. The frozen
+                            # items are shared, not copied.
+                            ItemHelpers.input_to_new_input_list(streamed_result.input),
                             context_wrapper,
                             streamed_result,
                             current_span,
@@ -568,15 +781,17 @@ class Runner:
                         should_run_agent_start_hooks,
                         tool_use_tracker,
                         all_tools,
-                        previous_response_id,
+                        response_chain,
                     )
                     should_run_agent_start_hooks = False
 
-                    streamed_result.raw_responses = streamed_result.raw_responses + [
-                        turn_result.model_response
-                    ]
+                    _append_model_response(
+                        streamed_result.raw_responses,
+                        turn_result.model_response,
+                        run_config.max_raw_responses,
+                    )
                     streamed_result.input = turn_result.original_input
-                    streamed_result.new_items = turn_result.generated_items
+                    streamed_result.new_items = turn_result.append_to(streamed_result.new_items)
 
                     if isinstance(turn_result.next_step, NextStepHandoff):
                         current_agent = turn_result.next_step.new_agent
@@ -605,6 +820,8 @@ class Runner:
 
                         streamed_result.output_guardrail_results = output_guardrail_results
                         streamed_result.final_output = turn_result.next_step.output
+                        if run_config.retain_items == "final_turn":
+                            streamed_result.new_items = turn_result.new_step_items
                         streamed_result.is_complete = True
                         streamed_result._event_queue.put_nowait(QueueCompleteSentinel())
                     elif isinstance(turn_result.next_step, NextStepRunAgain):
@@ -623,7 +840,17 @@ class Runner:
                     raise
 
             streamed_result.is_complete = True
+        except Exception:
+            # Errors outside of a turn (e.g. listing MCP tools) must also end the event stream,
+            # otherwise `stream_events()` waits forever.
+            if not streamed_result.is_complete:
+                streamed_result.is_complete = True
+                streamed_result._event_queue.put_nowait(QueueCompleteSentinel())
+            raise
         finally:
+            if streamed_result._input_guardrails_task is None:
+                # The guardrails never started, so there's nothing to wait for.
+                streamed_result._input_guardrails_done.set()
             if current_span:
                 current_span.finish(reset_current=True)
             if streamed_result.trace:
@@ -640,7 +867,7 @@ class Runner:
         should_run_agent_start_hooks: bool,
         tool_use_tracker: AgentToolUseTracker,
         all_tools: list[Tool],
-        previous_response_id: str | None,
+        response_chain: ResponseChainTracker,
     ) -> SingleStepResult:
         if should_run_agent_start_hooks:
             await asyncio.gather(
@@ -666,11 +893,12 @@ class Runner:
 
         final_response: ModelResponse | None = None
 
-        input = ItemHelpers.input_to_new_input_list(streamed_result.input)
-        input.extend([item.to_input_item() for item in streamed_result.new_items])
+        input, previous_response_id = response_chain.prepare_input(
+            model, streamed_result.input, streamed_result.new_items
+        )
 
         # 1. Stream the output events
-        async for event in model.stream_response(
+        events = model.stream_response(
             system_prompt,
             input,
             model_settings,
@@ -681,32 +909,55 @@ class Runner:
                 run_config.tracing_disabled, run_config.trace_include_sensitive_data
             ),
             previous_response_id=previous_response_id,
-        ):
-            if isinstance(event, ResponseCompletedEvent):
-                usage = (
-                    Usage(
-                        requests=1,
-                        input_tokens=event.response.usage.input_tokens,
-                        output_tokens=event.response.usage.output_tokens,
-                        total_tokens=event.response.usage.total_tokens,
+        )
+        try:
+            async for event in events:
+                if isinstance(event, ResponseCompletedEvent):
+                    usage = (
+                        Usage(
+                            requests=1,
+                            input_tokens=event.response.usage.input_tokens,
+                            output_tokens=event.response.usage.output_tokens,
+                            total_tokens=event.response.usage.total_tokens,
+                        )
+                        if event.response.usage
+                        else Usage()
                     )
-                    if event.response.usage
-                    else Usage()
-                )
-                final_response = ModelResponse(
-                    output=event.response.output,
-                    usage=usage,
-                    response_id=event.response.id,
-                )
-                context_wrapper.usage.add(usage)
-
-            streamed_result._event_queue.put_nowait(RawResponsesStreamEvent(data=event))
+                    final_response = ModelResponse(
+                        output=event.response.output,
+                        usage=usage,
+                        response_id=event.response.id,
+                    )
+                    context_wrapper.usage.add(usage)
+
+                await streamed_result._event_queue.put_raw(event)
+        except asyncio.CancelledError:
+            if final_response is None:
+                # The request was made, but the token counts only arrive with the completed
+                # response, so only the request itself can be recorded.
+                context_wrapper.usage.add(Usage(requests=1))
+            raise
+        finally:
+            # Close the model stream right away rather than when it's garbage collected, so the
+            # underlying HTTP response is closed as soon as the run stops reading from it.
+            aclose = getattr(events, "aclose", None)
+            if aclose is not None:
+                await aclose()
 
         # 2. At this point, the streaming is complete for this turn of the agent loop.
         if not final_response:
             raise ModelBehaviorError("Model did not produce a final response!")
 
-        # 3. Now, we can process the turn as we do in the non-streaming case
+        response_chain.record_response(model, final_response)
+
+        # 3. Now, we can process the turn as we do in the non-streaming case. Items that are ready
+        # early (tool calls, and each tool's output as soon as it finishes) are streamed right away.
+        streamed_item_ids: set[int] = set()
+
+        def stream_item(item: RunItem) -> None:
+            streamed_item_ids.add(id(item))
+            RunImpl.stream_items_to_queue([item], streamed_result._event_queue)
+
         single_step_result = await cls._get_single_step_result_from_response(
             agent=agent,
             original_input=streamed_result.input,
@@ -719,9 +970,17 @@ class Runner:
             context_wrapper=context_wrapper,
             run_config=run_config,
             tool_use_tracker=tool_use_tracker,
+            stream_item=stream_item,
         )
 
-        RunImpl.stream_step_result_to_queue(single_step_result, streamed_result._event_queue)
+        RunImpl.stream_items_to_queue(
+            [
+                item
+                for item in single_step_result.new_step_items
+                if id(item) not in streamed_item_ids
+            ],
+            streamed_result._event_queue,
+        )
         return single_step_result
 
     @classmethod
@@ -737,7 +996,7 @@ class Runner:
         run_config: RunConfig,
         should_run_agent_start_hooks: bool,
         tool_use_tracker: AgentToolUseTracker,
-        previous_response_id: str | None,
+        response_chain: ResponseChainTracker,
     ) -> SingleStepResult:
         # Ensure we run the hooks before anything else
         if should_run_agent_start_hooks:
@@ -754,11 +1013,14 @@ class Runner:
 
         output_schema = cls._get_output_schema(agent)
         handoffs = cls._get_handoffs(agent)
-        input = ItemHelpers.input_to_new_input_list(original_input)
-        input.extend([generated_item.to_input_item() for generated_item in generated_items])
+        model = cls._get_model(agent, run_config)
+        input, previous_response_id = response_chain.prepare_input(
+            model, original_input, generated_items
+        )
 
         new_response = await cls._get_new_response(
             agent,
+            model,
             system_prompt,
             input,
             output_schema,
@@ -769,6 +1031,7 @@ class Runner:
             tool_use_tracker,
             previous_response_id,
         )
+        response_chain.record_response(model, new_response)
 
         return await cls._get_single_step_result_from_response(
             agent=agent,
@@ -799,6 +1062,7 @@ class Runner:
         context_wrapper: RunContextWrapper[TContext],
         run_config: RunConfig,
         tool_use_tracker: AgentToolUseTracker,
+        stream_item: Callable[[RunItem], None] | None = None,
     ) -> SingleStepResult:
         processed_response = RunImpl.process_model_response(
             agent=agent,
@@ -820,6 +1084,7 @@ class Runner:
             hooks=hooks,
             context_wrapper=context_wrapper,
             run_config=run_config,
+            stream_item=stream_item,
         )
 
     @classmethod
@@ -842,21 +1107,25 @@ class Runner:
 
         guardrail_results = []
 
-        for done in asyncio.as_completed(guardrail_tasks):
-            result = await done
-            if result.output.tripwire_triggered:
-                # Cancel all guardrail tasks if a tripwire is triggered.
-                for t in guardrail_tasks:
-                    t.cancel()
-                _error_tracing.attach_error_to_current_span(
-                    SpanError(
-                        message="Guardrail tripwire triggered",
-                        data={"guardrail": result.guardrail.get_name()},
+        try:
+            for done in asyncio.as_completed(guardrail_tasks):
+                result = await done
+                if result.output.tripwire_triggered:
+                    _error_tracing.attach_error_to_current_span(
+                        SpanError(
+                            message="Guardrail tripwire triggered",
+                            data={"guardrail": result.guardrail.get_name()},
+                        )
                     )
-                )
-                raise InputGuardrailTripwireTriggered(result)
-            else:
-                guardrail_results.append(result)
+                    raise InputGuardrailTripwireTriggered(result)
+                else:
+                    guardrail_results.append(result)
+        except BaseException:
+            # Cancel all guardrail tasks if a tripwire is triggered, or if we're cancelled (e.g.
+            # because the model call failed).
+            for t in guardrail_tasks:
+                t.cancel()
+            raise
 
         return guardrail_results
 
@@ -902,6 +1171,7 @@ class Runner:
     async def _get_new_response(
         cls,
         agent: Agent[TContext],
+        model: Model,
         system_prompt: str | None,
         input: list[TResponseInputItem],
         output_schema: AgentOutputSchemaBase | None,
@@ -912,7 +1182,6 @@ class Runner:
         tool_use_tracker: AgentToolUseTracker,
         previous_response_id: str | None,
     ) -> ModelResponse:
-        model = cls._get_model(agent, run_config)
         model_settings = agent.model_settings.resolve(run_config.model_settings)
         model_settings = RunImpl.maybe_reset_tool_choice(agent, tool_use_tracker, model_settings)
 
@@ -56,3 +56,18 @@ class AgentUpdatedStreamEvent:
 
 StreamEvent: TypeAlias = Union[RawResponsesStreamEvent, RunItemStreamEvent, AgentUpdatedStreamEvent]
 """A streaming event from an agent."""
+
+StreamEventType: TypeAlias = Literal[
+    "raw_response_event", "run_item_stream_event", "agent_updated_stream_event"
+]
+"""The `type` of a streaming event. Used to filter the events of `RunResultStreaming`."""
+
+StreamBackpressurePolicy: TypeAlias = Literal["block", "drop_oldest", "drop_newest"]
+"""What happens to a raw response event when the stream's event queue is full:
+- `block`: the run waits until the consumer catches up, which in turn stops reading the model's
+  response stream.
+- `drop_oldest`: the oldest queued raw response event is dropped to make room.
+- `drop_newest`: the new raw response event is dropped.
+
+Other events (run items, agent updates) are never dropped, and are always queued.
+"""
@@ -18,6 +18,12 @@ from .function_schema import DocstringStyle, function_schema
 from .items import RunItem
 from .logger import logger
 from .run_context import RunContextWrapper
+from .tool_cache import (
+    ToolCacheVersionFunction,
+    ToolResultCache,
+    default_tool_result_cache,
+    invoke_with_cache,
+)
 from .tracing import SpanError
 from .util import _error_tracing
 from .util._types import MaybeAwaitable
@@ -72,6 +78,16 @@ class FunctionTool:
     """Whether the JSON schema is in strict mode. We **strongly** recommend setting this to True,
     as it increases the likelihood of correct JSON input."""
 
+    timeout: float | None = None
+    """How long (in seconds) a call to the tool may take. Calls that take longer are cancelled, and
+    the model is told that the tool timed out. If None, `RunConfig.tool_timeout` is used.
+    Synchronous functions run on the event loop, so they can't be interrupted; make the tool async
+    (or run the work in a thread) if it needs a timeout."""
+
+    max_concurrency: int | None = None
+    """The maximum number of calls to this tool from a single model response that run at the same
+    time. None means no limit, other than `RunConfig.max_concurrent_tool_calls`."""
+
 
 @dataclass
 class FileSearchTool:
@@ -152,6 +168,10 @@ def function_tool(
     use_docstring_info: bool = True,
     failure_error_function: ToolErrorFunction | None = None,
     strict_mode: bool = True,
+    cache: bool | ToolResultCache = False,
+    cache_version: ToolCacheVersionFunction | None = None,
+    timeout: float | None = None,
+    max_concurrency: int | None = None,
 ) -> FunctionTool:
     """Overload for usage as @function_tool (no parentheses)."""
     ...
@@ -166,6 +186,10 @@ def function_tool(
     use_docstring_info: bool = True,
     failure_error_function: ToolErrorFunction | None = None,
     strict_mode: bool = True,
+    cache: bool | ToolResultCache = False,
+    cache_version: ToolCacheVersionFunction | None = None,
+    timeout: float | None = None,
+    max_concurrency: int | None = None,
 ) -> Callable[[ToolFunction[...]], FunctionTool]:
     """Overload for usage as @function_tool(...)."""
     ...
@@ -180,6 +204,10 @@ def function_tool(
     use_docstring_info: bool = True,
     failure_error_function: ToolErrorFunction | None = default_tool_error_function,
     strict_mode: bool = True,
+    cache: bool | ToolResultCache = False,
+    cache_version: ToolCacheVersionFunction | None = None,
+    timeout: float | None = None,
+    max_concurrency: int | None = None,
 ) -> FunctionTool | Callable[[ToolFunction[...]], FunctionTool]:
     """
     Decorator to create a FunctionTool from a function. By default, we will:
@@ -208,6 +236,18 @@ def function_tool(
             If False, it allows non-strict JSON schemas. For example, if a parameter has a default
             value, it will be optional, additional properties are allowed, etc. See here for more:
             https://platform.openai.com/docs/guides/structured-outputs?api-mode=responses#supported-schemas
+        cache: Whether to cache the tool's results. Only enable this for tools that return the
+            same output for the same arguments and have no side effects. If True, results are
+            stored in a process-wide `ToolResultCache`; you can also pass your own cache to
+            control its size and TTL. Results are kept per function, and are reused across runs,
+            so anything in the context that changes the result should be part of
+            `cache_version`.
+        cache_version: If provided, derives a version from the run context (e.g. the version of
+            the data the tool reads). Cached results are only reused for the same version.
+        timeout: If provided, calls that take longer than this many seconds are cancelled, and the
+            model is told that the tool timed out. Only async functions can be interrupted.
+        max_concurrency: If provided, the maximum number of calls to this tool from a single model
+            response that run at the same time.
     """
 
     def _create_function_tool(the_func: ToolFunction[...]) -> FunctionTool:
@@ -269,8 +309,25 @@ def function_tool(
 
             return result
 
+        result_cache: ToolResultCache | None = None
+        if isinstance(cache, ToolResultCache):
+            result_cache = cache
+        elif cache:
+            result_cache = default_tool_result_cache()
+
         async def _on_invoke_tool(ctx: RunContextWrapper[Any], input: str) -> Any:
             try:
+                if result_cache is not None:
+                    return await invoke_with_cache(
+                        result_cache,
+                        schema.name,
+                        ctx,
+                        input,
+                        # Keyed by the function too, so tools with the same name don't share
+                        # results
+                        lambda ctx: (the_func, cache_version(ctx) if cache_version else None),
+                        lambda: _on_invoke_tool_impl(ctx, input),
+                    )
                 return await _on_invoke_tool_impl(ctx, input)
             except Exception as e:
                 if failure_error_function is None:
@@ -297,6 +354,8 @@ def function_tool(
             params_json_schema=schema.params_json_schema,
             on_invoke_tool=_on_invoke_tool,
             strict_json_schema=strict_mode,
+            timeout=timeout,
+            max_concurrency=max_concurrency,
         )
 
     # If func is actually a callable, we were used as @function_tool with no parentheses
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Hashable
+from typing import Any, Callable
+
+from .logger import logger
+from .run_context import RunContextWrapper
+from .tracing import FunctionSpanData, get_current_span
+
+ToolCacheVersionFunction = Callable[[RunContextWrapper[Any]], Hashable]
+"""Derives a version from the run context, e.g. the version of the dataset the tool reads. Cached
+results are only reused for calls with the same version."""
+
+
+class ToolResultCache:
+    """An in-memory cache of tool results, for tools that always return the same output for the
+    same arguments (e.g. schema lookups). Results are keyed by the tool name, the canonicalized
+    JSON arguments and an optional version derived from the run context.
+
+    Entries expire after `ttl` seconds, and the least recently used entries are evicted once there
+    are more than `max_size`. Concurrent calls with the same key share a single invocation, which
+    runs with the context of the first call, and is cancelled if all of its callers are. Errors are
+    never cached.
+
+    A cache can be shared by several tools, and across runs.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float | None = 300.0):
+        """
+        Args:
+            max_size: The maximum number of results to keep.
+            ttl: How long (in seconds) a result is reused. None means results don't expire.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._in_flight: dict[Hashable, asyncio.Task[Any]] = {}
+        # The number of callers waiting for each in-flight invocation
+        self._waiters: dict[asyncio.Task[Any], int] = {}
+
+    @property
+    def size(self) -> int:
+        """The number of cached results, including ones that have expired but weren't evicted."""
+        return len(self._entries)
+
+    @staticmethod
+    def make_key(tool_name: str, input_json: str, version: Hashable = None) -> Hashable | None:
+        """Build a cache key. Returns None if the arguments aren't valid JSON, in which case the
+        call shouldn't be cached.
+        """
+        try:
+            arguments = json.loads(input_json) if input_json else {}
+        except ValueError:
+            return None
+        canonical = json.dumps(arguments, sort_keys=True, separators=(",", ":"))
+        return (tool_name, canonical, version)
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        """Return `(True, result)` if there's a fresh result for the key, else `(False, None)`."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, result = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, result
+
+    def set(self, key: Hashable, result: Any) -> None:
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+        self._entries[key] = (expires_at, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def get_or_invoke(
+        self, key: Hashable, invoke: Callable[[], Awaitable[Any]]
+    ) -> tuple[Any, bool]:
+        """Return the cached result for the key, or invoke the tool and cache its result. If the
+        same key is already being invoked, wait for that invocation instead.
+
+        Returns:
+            The result, and whether it came from the cache (or a concurrent invocation).
+        """
+        found, result = self.get(key)
+        if found:
+            self.hits += 1
+            return result, True
+
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.hits += 1
+            return await self._wait(key, task), True
+
+        self.misses += 1
+
+        async def _invoke() -> Any:
+            return await invoke()
+
+        task = asyncio.ensure_future(_invoke())
+        self._in_flight[key] = task
+        self._waiters[task] = 0
+        task.add_done_callback(lambda t: self._on_invoke_done(key, t))
+        return await self._wait(key, task), False
+
+    async def _wait(self, key: Hashable, task: asyncio.Task[Any]) -> Any:
+        # Shielded, so that cancelling one caller (e.g. when its tool call times out) doesn't
+        # cancel the invocation for the others. Once no caller is left, it's cancelled, so a
+        # result that nobody waited for isn't cached.
+        self._waiters[task] += 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            if not task.done():
+                self._waiters[task] -= 1
+                if self._waiters[task] == 0:
+                    task.cancel()
+                    if self._in_flight.get(key) is task:
+                        del self._in_flight[key]
+
+    def _on_invoke_done(self, key: Hashable, task: asyncio.Task[Any]) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        self._waiters.pop(task, None)
+        if not task.cancelled() and task.exception() is None:
+            self.set(key, task.result())
+
+
+_default_cache: ToolResultCache | None = None
+
+
+def default_tool_result_cache() -> ToolResultCache:
+    """The process-wide cache used by tools that enable caching without passing their own cache."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ToolResultCache()
+    return _default_cache
+
+
+async def invoke_with_cache(
+    cache: ToolResultCache,
+    tool_name: str,
+    ctx: RunContextWrapper[Any],
+    input_json: str,
+    version_function: ToolCacheVersionFunction | None,
+    invoke: Callable[[], Awaitable[Any]],
+) -> Any:
+    """Invoke a tool through the cache, and mark cache hits on the current function span."""
+    version = version_function(ctx) if version_function is not None else None
+    key = cache.make_key(tool_name, input_json, version)
+    if key is None:
+        return await invoke()
+
+    result, hit = await cache.get_or_invoke(key, invoke)
+    if hit:
+        logger.debug(f"Tool {tool_name} result served from cache")
+        current_span = get_current_span()
+        if current_span and isinstance(current_span.span_data, FunctionSpanData):
+            current_span.span_data.cache_hit = True
+    return result
@@ -0,0 +1,395 @@
+from __future__ import annotations
+
+import dataclasses
+import heapq
+import json
+import math
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+
+@dataclass
+class CriticalPathEntry:
+    """A span on the critical path of a trace."""
+
+    span_id: str
+    """The ID of the span."""
+
+    label: str
+    """The label of the span, e.g. `agent:Triage` or `function:get_weather`."""
+
+    time: float
+    """The time, in seconds, that the span itself contributes to the critical path. Time spent in
+    its children is attributed to the children."""
+
+
+@dataclass
+class TraceSummary:
+    """The latency breakdown of a single trace."""
+
+    trace_id: str
+    """The ID of the trace."""
+
+    workflow_name: str | None
+    """The workflow name of the trace, if the trace itself was exported."""
+
+    duration: float
+    """The time, in seconds, from the start of the first span to the end of the last one."""
+
+    span_count: int
+    """The number of spans in the trace."""
+
+    parallelism: float
+    """The total self time of the spans, divided by the duration. 1.0 means that everything ran
+    sequentially, and higher values mean that spans ran concurrently."""
+
+    critical_path: list[CriticalPathEntry]
+    """The spans that determine the duration of the trace, in the order they started. Making any
+    other span faster doesn't make the trace faster."""
+
+
+@dataclass
+class SpanStats:
+    """Aggregate latency statistics for the spans with the same label, across traces."""
+
+    count: int
+    """The number of spans."""
+
+    errors: int
+    """The number of spans that finished with an error."""
+
+    total_time: float
+    """The total duration of the spans, in seconds."""
+
+    self_time: float
+    """The total self time of the spans, i.e. the time not covered by their children, in
+    seconds."""
+
+    critical_path_time: float
+    """The total time the spans contributed to the critical paths of their traces, in seconds."""
+
+    p50: float
+    """The median duration, in seconds."""
+
+    p90: float
+    """The 90th percentile of the duration, in seconds."""
+
+    p99: float
+    """The 99th percentile of the duration, in seconds."""
+
+    max: float
+    """The longest duration, in seconds."""
+
+
+@dataclass
+class TraceAnalysisReport:
+    """The result of analyzing many traces. `to_json()` returns a stable representation, which
+    can be diffed between releases."""
+
+    trace_count: int
+    """The number of traces."""
+
+    span_count: int
+    """The number of spans."""
+
+    duration_p50: float
+    """The median trace duration, in seconds."""
+
+    duration_p90: float
+    """The 90th percentile of the trace duration, in seconds."""
+
+    duration_p99: float
+    """The 99th percentile of the trace duration, in seconds."""
+
+    spans: dict[str, SpanStats] = field(default_factory=dict)
+    """The statistics per span label, e.g. per agent and per tool."""
+
+    slowest_traces: list[TraceSummary] = field(default_factory=list)
+    """The slowest traces, slowest first."""
+
+    def to_dict(self) -> dict[str, Any]:
+        """Returns the report as a dictionary, with times rounded to the millisecond."""
+        rounded: dict[str, Any] = _round_floats(dataclasses.asdict(self))
+        return rounded
+
+    def to_json(self) -> str:
+        """Returns the report as JSON, with sorted keys and one value per line."""
+        return json.dumps(self.to_dict(), indent=2, sort_keys=True)
+
+
+class TraceAnalyzer:
+    """Computes latency statistics from exported traces and spans, e.g. as read by a
+    `TraceFileReader`.
+
+    Traces are added one at a time, and only aggregates are kept, so any number of traces can be
+    analyzed. Percentiles are computed from histograms with exponentially growing buckets, so
+    they're accurate to within 2%.
+    """
+
+    def __init__(self, slowest_traces: int = 10):
+        """
+        Args:
+            slowest_traces: The number of slowest traces to keep the summaries of.
+        """
+        self.slowest_traces = slowest_traces
+        self._trace_count = 0
+        self._span_count = 0
+        self._durations = _Histogram()
+        self._spans: dict[str, _SpanAggregate] = {}
+        # A min-heap of (duration, sequence, summary), the fastest of the slowest traces first
+        self._slowest: list[tuple[float, int, TraceSummary]] = []
+
+    def add_trace(self, items: Iterable[dict[str, Any]]) -> TraceSummary:
+        """Adds a trace to the analysis.
+
+        Args:
+            items: The exported trace and spans of a single trace, in any order.
+
+        Returns:
+            The latency breakdown of the trace.
+        """
+        summary, spans = _analyze(items)
+        self._trace_count += 1
+        self._span_count += summary.span_count
+        self._durations.add(summary.duration)
+
+        on_critical_path: dict[str, float] = {}
+        for path_entry in summary.critical_path:
+            span_id = path_entry.span_id
+            on_critical_path[span_id] = on_critical_path.get(span_id, 0.0) + path_entry.time
+        for span in spans:
+            aggregate = self._spans.get(span.label)
+            if aggregate is None:
+                aggregate = self._spans[span.label] = _SpanAggregate()
+            aggregate.add(span, on_critical_path.get(span.span_id, 0.0))
+
+        if self.slowest_traces > 0:
+            entry = (summary.duration, self._trace_count, summary)
+            if len(self._slowest) < self.slowest_traces:
+                heapq.heappush(self._slowest, entry)
+            elif entry[0] > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, entry)
+        return summary
+
+    def report(self) -> TraceAnalysisReport:
+        """Returns the statistics of the traces added so far."""
+        return TraceAnalysisReport(
+            trace_count=self._trace_count,
+            span_count=self._span_count,
+            duration_p50=self._durations.percentile(0.5),
+            duration_p90=self._durations.percentile(0.9),
+            duration_p99=self._durations.percentile(0.99),
+            spans={label: self._spans[label].stats() for label in sorted(self._spans)},
+            slowest_traces=[
+                summary
+                for _, _, summary in sorted(self._slowest, key=lambda entry: (-entry[0], entry[1]))
+            ],
+        )
+
+
+def analyze_trace(items: Iterable[dict[str, Any]]) -> TraceSummary:
+    """Returns the latency breakdown of a single trace.
+
+    Args:
+        items: The exported trace and spans of the trace, in any order.
+    """
+    return _analyze(items)[0]
+
+
+@dataclass(eq=False)
+class _SpanNode:
+    span_id: str
+    label: str
+    start: float
+    end: float
+    error: bool
+    children: list[_SpanNode] = field(default_factory=list)
+    self_time: float = 0.0
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+def _span_label(span_data: dict[str, Any]) -> str:
+    span_type = span_data.get("type", "unknown")
+    name: str | None
+    if span_type == "handoff":
+        name = f"{span_data.get('from_agent')} -> {span_data.get('to_agent')}"
+    elif span_type == "mcp_tools":
+        name = span_data.get("server")
+    elif span_type in ("generation", "transcription", "speech"):
+        name = span_data.get("model")
+    else:
+        name = span_data.get("name")
+    return f"{span_type}:{name}" if name else span_type
+
+
+def _timestamp(value: str | None) -> float | None:
+    return datetime.fromisoformat(value).timestamp() if value else None
+
+
+def _analyze(items: Iterable[dict[str, Any]]) -> tuple[TraceSummary, list[_SpanNode]]:
+    trace_id = ""
+    workflow_name = None
+    nodes: dict[str, _SpanNode] = {}
+    parents: dict[str, str | None] = {}
+    for item in items:
+        if item.get("object") == "trace":
+            trace_id = item["id"]
+            workflow_name = item.get("workflow_name")
+            continue
+        trace_id = trace_id or item["trace_id"]
+        start, end = _timestamp(item.get("started_at")), _timestamp(item.get("ended_at"))
+        if start is None or end is None:
+            # Spans that never started or finished don't have a duration to attribute
+            continue
+        nodes[item["id"]] = _SpanNode(
+            span_id=item["id"],
+            label=_span_label(item.get("span_data") or {}),
+            start=start,
+            end=max(start, end),
+            error=item.get("error") is not None,
+        )
+        parents[item["id"]] = item.get("parent_id")
+
+    roots: list[_SpanNode] = []
+    for span_id, node in nodes.items():
+        parent = nodes.get(parents[span_id] or "")
+        (parent.children if parent is not None else roots).append(node)
+
+    if not roots:
+        summary = TraceSummary(trace_id, workflow_name, 0.0, 0, 0.0, [])
+        return summary, []
+
+    spans = list(nodes.values())
+    for node in spans:
+        node.self_time = node.duration - _covered_time(node)
+
+    start = min(root.start for root in roots)
+    end = max(root.end for root in roots)
+    duration = end - start
+    busy_time = sum(node.self_time for node in spans)
+
+    # The trace is as long as the root that ends last, and the roots before it, like the children
+    # of a single span
+    trace_root = _SpanNode("", "", start, end, False, children=roots)
+    critical_path = [
+        CriticalPathEntry(node.span_id, node.label, time)
+        for node, time in _critical_path(trace_root, end)
+        if node is not trace_root
+    ]
+    summary = TraceSummary(
+        trace_id=trace_id,
+        workflow_name=workflow_name,
+        duration=duration,
+        span_count=len(spans),
+        parallelism=busy_time / duration if duration > 0 else 1.0,
+        critical_path=critical_path,
+    )
+    return summary, spans
+
+
+def _covered_time(node: _SpanNode) -> float:
+    """The time within the span that's covered by at least one of its children."""
+    covered = 0.0
+    cursor = node.start
+    for child in sorted(node.children, key=lambda child: child.start):
+        child_start, child_end = max(child.start, cursor), min(child.end, node.end)
+        if child_end > child_start:
+            covered += child_end - child_start
+            cursor = child_end
+    return covered
+
+
+def _critical_path(node: _SpanNode, end: float) -> list[tuple[_SpanNode, float]]:
+    """Walks back from the end of the span. The child that ends last before the cursor is on the
+    critical path, and the cursor moves to its start. The time between children is the span's own
+    contribution.
+    """
+    path: list[tuple[_SpanNode, float]] = []
+    own_time = 0.0
+    cursor = min(node.end, end)
+    for child in sorted(node.children, key=lambda child: child.end, reverse=True):
+        if child.start >= cursor or child.end <= node.start:
+            continue
+        child_end = min(child.end, cursor)
+        own_time += cursor - child_end
+        path = _critical_path(child, child_end) + path
+        cursor = max(child.start, node.start)
+    own_time += cursor - node.start
+    return [(node, own_time)] + path
+
+
+class _Histogram:
+    """A histogram with exponentially growing buckets, so percentiles have a bounded relative
+    error, and the memory doesn't grow with the number of values."""
+
+    _MIN_VALUE = 1e-4
+    _LOG_GROWTH = math.log(1.02)
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.max = 0.0
+        self._buckets: dict[int, int] = {}
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.max = max(self.max, value)
+        bucket = 0
+        if value > self._MIN_VALUE:
+            bucket = math.ceil(math.log(value / self._MIN_VALUE) / self._LOG_GROWTH)
+        self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+
+    def percentile(self, percentile: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(percentile * self.count))
+        seen = 0
+        for bucket in sorted(self._buckets):
+            seen += self._buckets[bucket]
+            if seen >= rank:
+                # The upper bound of the bucket
+                return min(self.max, self._MIN_VALUE * math.exp(bucket * self._LOG_GROWTH))
+        return self.max
+
+
+class _SpanAggregate:
+    def __init__(self) -> None:
+        self.errors = 0
+        self.total_time = 0.0
+        self.self_time = 0.0
+        self.critical_path_time = 0.0
+        self.durations = _Histogram()
+
+    def add(self, span: _SpanNode, critical_path_time: float) -> None:
+        self.errors += span.error
+        self.total_time += span.duration
+        self.self_time += span.self_time
+        self.critical_path_time += critical_path_time
+        self.durations.add(span.duration)
+
+    def stats(self) -> SpanStats:
+        return SpanStats(
+            count=self.durations.count,
+            errors=self.errors,
+            total_time=self.total_time,
+            self_time=self.self_time,
+            critical_path_time=self.critical_path_time,
+            p50=self.durations.percentile(0.5),
+            p90=self.durations.percentile(0.9),
+            p99=self.durations.percentile(0.99),
+            max=self.durations.max,
+        )
+
+
+def _round_floats(value: Any) -> Any:
+    if isinstance(value, float):
+        return round(value, 3)
+    if isinstance(value, dict):
+        return {key: _round_floats(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_round_floats(item) for item in value]
+    return value
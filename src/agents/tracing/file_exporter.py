@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import IO, Any, Literal
+
+from ..logger import logger
+from .processor_interface import TracingExporter
+from .spans import Span
+from .traces import Trace
+
+Compression = Literal["gzip", "zstd"]
+
+INDEX_SUFFIX = ".idx"
+"""The suffix of the sidecar index file, which is added to the name of its data file."""
+
+_EXTENSIONS: dict[Compression | None, str] = {
+    None: ".jsonl",
+    "gzip": ".jsonl.gz",
+    "zstd": ".jsonl.zst",
+}
+
+
+def _zstandard() -> Any:
+    try:
+        import zstandard  # type: ignore
+    except ImportError as _e:
+        raise ImportError(
+            "`zstandard` is required to read or write zstd compressed trace files. You can install "
+            "it via `pip install zstandard`."
+        ) from _e
+    return zstandard
+
+
+def compression_for_path(path: str | os.PathLike[str]) -> Compression | None:
+    """Returns the compression of a trace file, based on its name."""
+    name = os.fspath(path)
+    if name.endswith(_EXTENSIONS["gzip"]):
+        return "gzip"
+    if name.endswith(_EXTENSIONS["zstd"]):
+        return "zstd"
+    return None
+
+
+def decompress_block(block: bytes, compression: Compression | None) -> bytes:
+    """Decompresses a single block of a trace file."""
+    if compression == "gzip":
+        return gzip.decompress(block)
+    if compression == "zstd":
+        return bytes(_zstandard().ZstdDecompressor().decompress(block))
+    return block
+
+
+class FileSpanExporter(TracingExporter):
+    """Appends traces and spans to local JSONL files, for environments without a tracing backend.
+
+    Every exported item is written as one line with the output of its `export()`. Each batch is
+    grouped by trace, and the items of a trace are written as one contiguous block. For every
+    block, a line with the trace ID, the offset and the length of the block is appended to a
+    sidecar index (`<file>.idx`), so a reader can load a trace without scanning the files. With
+    compression, every block is a complete gzip member or zstd frame, so the files can still be
+    decompressed as a whole by the usual tools.
+
+    The exporter starts a new file when the current one reaches `max_bytes`, or when it has been
+    open for `max_age` seconds. Errors writing the files are logged, and don't raise.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        prefix: str = "traces",
+        compression: Compression | None = None,
+        max_bytes: int = 100 * 1024 * 1024,
+        max_age: float | None = 3600.0,
+    ):
+        """
+        Args:
+            directory: The directory to write the trace files to. It's created if it doesn't
+                exist.
+            prefix: The prefix of the file names.
+            compression: How to compress the files, `"gzip"` or `"zstd"`. zstd compression needs
+                the `zstandard` package. Defaults to no compression.
+            max_bytes: The size, in bytes, after which a new file is started.
+            max_age: The time, in seconds, after which a new file is started. If None, files are
+                only rotated by size.
+        """
+        if compression not in _EXTENSIONS:
+            raise ValueError(f"Unsupported trace file compression: {compression}")
+        if compression == "zstd":
+            self._zstd_compressor = _zstandard().ZstdCompressor()
+
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self.compression = compression
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+
+        self._lock = threading.Lock()
+        self._data_file: IO[bytes] | None = None
+        self._index_file: IO[bytes] | None = None
+        self._opened_at = 0.0
+        self._sequence = 0
+
+    @property
+    def current_path(self) -> Path | None:
+        """The path of the file that's being written to, if any."""
+        return Path(self._data_file.name) if self._data_file is not None else None
+
+    def export(self, items: list[Trace | Span[Any]]) -> None:
+        if not items:
+            return
+
+        blocks: dict[str, list[bytes]] = {}
+        for item in items:
+            exported = item.export()
+            if not exported:
+                continue
+            line = json.dumps(exported, separators=(",", ":"), default=str)
+            blocks.setdefault(item.trace_id, []).append(line.encode("utf-8") + b"\n")
+
+        with self._lock:
+            try:
+                self._write_blocks(blocks)
+            except OSError as e:
+                logger.error(f"[non-fatal] Tracing: failed to write trace file: {e}")
+
+    def close(self) -> None:
+        """Closes the current file. The next export starts a new one."""
+        with self._lock:
+            self._close_files()
+
+    def _write_blocks(self, blocks: dict[str, list[bytes]]) -> None:
+        data_file, index_file = self._files()
+        index_lines = []
+        for trace_id, lines in blocks.items():
+            block = self._compress(b"".join(lines))
+            offset = data_file.tell()
+            data_file.write(block)
+            index_lines.append(f"{trace_id}\t{offset}\t{len(block)}\n".encode())
+
+        # The data is flushed first, so the index never points past the end of the data file
+        data_file.flush()
+        index_file.write(b"".join(index_lines))
+        index_file.flush()
+        logger.debug(f"Wrote {len(blocks)} trace blocks to {data_file.name}")
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.compression == "gzip":
+            return gzip.compress(data, compresslevel=6)
+        if self.compression == "zstd":
+            return bytes(self._zstd_compressor.compress(data))
+        return data
+
+    def _files(self) -> tuple[IO[bytes], IO[bytes]]:
+        if self._data_file is not None and self._index_file is not None:
+            expired = (
+                self.max_age is not None and time.monotonic() - self._opened_at >= self.max_age
+            )
+            if self._data_file.tell() < self.max_bytes and not expired:
+                return self._data_file, self._index_file
+            self._close_files()
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._sequence += 1
+        timestamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime())
+        name = f"{self.prefix}-{timestamp}-{os.getpid()}-{self._sequence:06d}"
+        path = self.directory / f"{name}{_EXTENSIONS[self.compression]}"
+        self._data_file = open(path, "ab")
+        self._index_file = open(f"{path}{INDEX_SUFFIX}", "ab")
+        self._opened_at = time.monotonic()
+        return self._data_file, self._index_file
+
+    def _close_files(self) -> None:
+        for file in (self._data_file, self._index_file):
+            if file is not None:
+                file.close()
+        self._data_file = None
+        self._index_file = None
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import argparse
+import json
+import mmap
+import os
+import re
+import sys
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from .analysis import TraceAnalyzer
+from .file_exporter import INDEX_SUFFIX, compression_for_path, decompress_block
+
+
+class TraceBlock(NamedTuple):
+    """The location of a block of items of a trace in a trace file."""
+
+    path: Path
+    offset: int
+    length: int
+
+
+class TraceFileReader:
+    """Reads the trace files written by a `FileSpanExporter`.
+
+    The sidecar indexes are read once, and then only the lines appended since are read by
+    `refresh()`. Loading a trace memory-maps the trace files, and decodes only the blocks of that
+    trace. The reader can be used while the exporter is still writing to the files.
+    """
+
+    def __init__(self, directory: str | os.PathLike[str], prefix: str = "traces"):
+        """
+        Args:
+            directory: The directory the trace files are in.
+            prefix: The prefix of the file names, as passed to the exporter.
+        """
+        self.directory = Path(directory)
+        self.prefix = prefix
+        # The names the exporter gives its files, so files of other prefixes (e.g. "traces-eu" for
+        # "traces") in the same directory don't match
+        self._file_name = re.compile(
+            rf"{re.escape(prefix)}-\d{{8}}T\d{{6}}-\d+-\d+\.jsonl(\.gz|\.zst)?"
+        )
+        self._blocks: dict[str, list[TraceBlock]] = {}
+        self._index_positions: dict[Path, int] = {}
+        self._maps: dict[Path, mmap.mmap] = {}
+        self.refresh()
+
+    def __enter__(self) -> TraceFileReader:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def files(self) -> list[Path]:
+        """The trace files in the directory, oldest first."""
+        paths = self.directory.glob(f"{self.prefix}-*.jsonl*")
+        return sorted(
+            (path for path in paths if self._file_name.fullmatch(path.name)),
+            key=lambda path: (path.stat().st_mtime, path.name),
+        )
+
+    def refresh(self) -> None:
+        """Reads the index entries that were written since the last refresh."""
+        for path in self.files():
+            index_path = Path(f"{path}{INDEX_SUFFIX}")
+            position = self._index_positions.get(path, 0)
+            try:
+                with open(index_path, "rb") as index_file:
+                    index_file.seek(position)
+                    data = index_file.read()
+            except FileNotFoundError:
+                continue
+
+            # A line that isn't complete yet is read by the next refresh
+            complete = data[: data.rfind(b"\n") + 1]
+            self._index_positions[path] = position + len(complete)
+            for line in complete.splitlines():
+                trace_id, offset, length = line.decode("utf-8").split("\t")
+                block = TraceBlock(path, int(offset), int(length))
+                self._blocks.setdefault(trace_id, []).append(block)
+
+    def trace_ids(self) -> list[str]:
+        """The IDs of the traces in the files, in the order they were first written."""
+        return list(self._blocks)
+
+    def load_trace(self, trace_id: str) -> list[dict[str, Any]]:
+        """Returns the exported trace and spans of a trace, in the order they were written. Empty
+        if the trace isn't in the files.
+        """
+        items = []
+        for block in self._blocks.get(trace_id, []):
+            for line in self._read_block(block).splitlines():
+                items.append(json.loads(line))
+        return items
+
+    def iter_traces(self) -> Iterator[tuple[str, list[dict[str, Any]]]]:
+        """Yields the ID and the items of every trace in the files."""
+        for trace_id in self.trace_ids():
+            yield trace_id, self.load_trace(trace_id)
+
+    def close(self) -> None:
+        """Unmaps the files."""
+        for mapped in self._maps.values():
+            mapped.close()
+        self._maps.clear()
+
+    def _read_block(self, block: TraceBlock) -> bytes:
+        end = block.offset + block.length
+        mapped = self._maps.get(block.path)
+        if mapped is None or len(mapped) < end:
+            # The file grew since it was mapped
+            if mapped is not None:
+                mapped.close()
+            with open(block.path, "rb") as file:
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[block.path] = mapped
+        return decompress_block(mapped[block.offset : end], compression_for_path(block.path))
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Lists, prints or analyzes the traces written by a `FileSpanExporter`."""
+    parser = argparse.ArgumentParser(
+        prog="python -m agents.tracing.file_reader", description=main.__doc__
+    )
+    parser.add_argument("directory", help="The directory the trace files are in.")
+    parser.add_argument("--prefix", default="traces", help="The prefix of the file names.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="Print the IDs of the traces, one per line.")
+    show = commands.add_parser("show", help="Print the trace and spans of a trace as JSONL.")
+    show.add_argument("trace_id")
+    analyze = commands.add_parser(
+        "analyze", help="Print a latency report of all the traces as JSON, see `TraceAnalyzer`."
+    )
+    analyze.add_argument(
+        "--slowest", type=int, default=10, help="The number of slowest traces to include."
+    )
+    args = parser.parse_args(argv)
+
+    with TraceFileReader(args.directory, prefix=args.prefix) as reader:
+        if args.command == "list":
+            for trace_id in reader.trace_ids():
+                print(trace_id)
+            return
+
+        if args.command == "analyze":
+            analyzer = TraceAnalyzer(slowest_traces=args.slowest)
+            for _, trace_items in reader.iter_traces():
+                analyzer.add_trace(trace_items)
+            print(analyzer.report().to_json())
+            return
+
+        items = reader.load_trace(args.trace_id)
+        if not items:
+            sys.exit(f"Trace {args.trace_id} not found")
+        for item in items:
+            print(json.dumps(item))
+
+
+if __name__ == "__main__":
+    main()
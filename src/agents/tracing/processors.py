@@ -59,8 +59,11 @@ class BackendSpanExporter(TracingExporter):
         self.base_delay = base_delay
         self.max_delay = max_delay
 
-        # Keep a client open for connection pooling across multiple export calls
-        self._client = httpx.Client(timeout=httpx.Timeout(timeout=60, connect=5.0))
+        # Keep a client open for connection pooling across multiple export calls. It's created on
+        # first export, since building the client (and its SSL context) is slow enough to matter
+        # at import time.
+        self._client: httpx.Client | None = None
+        self._client_lock = threading.Lock()
 
     def set_api_key(self, api_key: str):
         """Set the OpenAI API key for the exporter.
@@ -73,6 +76,12 @@ class BackendSpanExporter(TracingExporter):
         self._api_key = api_key
         self.api_key = api_key
 
+    def _get_client(self) -> httpx.Client:
+        with self._client_lock:
+            if self._client is None:
+                self._client = httpx.Client(timeout=httpx.Timeout(timeout=60, connect=5.0))
+            return self._client
+
     @cached_property
     def api_key(self):
         return self._api_key or os.environ.get("OPENAI_API_KEY")
@@ -108,13 +117,15 @@ class BackendSpanExporter(TracingExporter):
         if self.project:
             headers["OpenAI-Project"] = self.project
 
+        client = self._get_client()
+
         # Exponential backoff loop
         attempt = 0
         delay = self.base_delay
         while True:
             attempt += 1
             try:
-                response = self._client.post(url=self.endpoint, headers=headers, json=payload)
+                response = client.post(url=self.endpoint, headers=headers, json=payload)
 
                 # If the response is successful, break out of the loop
                 if response.status_code < 300:
@@ -148,7 +159,10 @@ class BackendSpanExporter(TracingExporter):
 
     def close(self):
         """Close the underlying HTTP client."""
-        self._client.close()
+        with self._client_lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
 
 
 class BatchTraceProcessor(TracingProcessor):
@@ -188,10 +202,22 @@ class BatchTraceProcessor(TracingProcessor):
         # Track when we next *must* perform a scheduled export
         self._next_export_time = time.time() + self._schedule_delay
 
-        self._worker_thread = threading.Thread(target=self._run, daemon=True)
-        self._worker_thread.start()
+        # The worker thread is started when the first item is queued, so that simply importing
+        # the SDK (e.g. with tracing disabled) doesn't spawn a thread.
+        self._worker_thread: threading.Thread | None = None
+        self._thread_start_lock = threading.Lock()
+
+    def _ensure_thread_started(self) -> None:
+        if self._worker_thread is not None:
+            return
+
+        with self._thread_start_lock:
+            if self._worker_thread is None and not self._shutdown_event.is_set():
+                self._worker_thread = threading.Thread(target=self._run, daemon=True)
+                self._worker_thread.start()
 
     def on_trace_start(self, trace: Trace) -> None:
+        self._ensure_thread_started()
         try:
             self._queue.put_nowait(trace)
         except queue.Full:
@@ -206,6 +232,7 @@ class BatchTraceProcessor(TracingProcessor):
         pass
 
     def on_span_end(self, span: Span[Any]) -> None:
+        self._ensure_thread_started()
         try:
             self._queue.put_nowait(span)
         except queue.Full:
@@ -215,8 +242,14 @@ class BatchTraceProcessor(TracingProcessor):
         """
         Called when the application stops. We signal our thread to stop, then join it.
         """
-        self._shutdown_event.set()
-        self._worker_thread.join(timeout=timeout)
+        with self._thread_start_lock:
+            self._shutdown_event.set()
+        if self._worker_thread is not None:
+            self._worker_thread.join(timeout=timeout)
+        else:
+            # The thread never started, so there's nothing to join. Drain anything that might have
+            # been queued anyway.
+            self._export_batches(force=True)
 
     def force_flush(self):
         """
@@ -267,16 +300,26 @@ class BatchTraceProcessor(TracingProcessor):
             self._exporter.export(items_to_export)
 
 
-# Create a shared global instance:
-_global_exporter = BackendSpanExporter()
-_global_processor = BatchTraceProcessor(_global_exporter)
+# Shared global instances, created on first use:
+_global_exporter: BackendSpanExporter | None = None
+_global_processor: BatchTraceProcessor | None = None
+_global_lock = threading.Lock()
 
 
 def default_exporter() -> BackendSpanExporter:
     """The default exporter, which exports traces and spans to the backend in batches."""
-    return _global_exporter
+    global _global_exporter
+    with _global_lock:
+        if _global_exporter is None:
+            _global_exporter = BackendSpanExporter()
+        return _global_exporter
 
 
 def default_processor() -> BatchTraceProcessor:
     """The default processor, which exports traces and spans to the backend in batches."""
-    return _global_processor
+    global _global_processor
+    exporter = default_exporter()
+    with _global_lock:
+        if _global_processor is None:
+            _global_processor = BatchTraceProcessor(exporter)
+        return _global_processor
@@ -1,2 +1,30 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable
+from typing import Any
+
+
 async def noop_coroutine() -> None:
     pass
+
+
+async def gather_cancel_on_error(*aws: Awaitable[Any]) -> list[Any]:
+    """Like `asyncio.gather()`, but as soon as one of the awaitables raises, the others are
+    cancelled (and awaited) before the exception is re-raised, instead of being left running.
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    if not tasks:
+        return []
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        # If several failed at once, raise in argument order, so the result is deterministic.
+        for task in tasks:
+            if task in done and (exc := task.exception()) is not None:
+                raise exc
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    return [task.result() for task in tasks]
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import dataclasses
+import itertools
+from typing import TypeVar
+
+T = TypeVar("T", bound=type)
+
+
+def add_slots(cls: T) -> T:
+    """Recreates a dataclass with `__slots__` for its fields, like `@dataclass(slots=True)` does on
+    Python 3.10+. Apply it above `@dataclass`. Every base class needs slots too (or be `object`,
+    `Generic` or `ABC`) for the instances to not have a `__dict__`.
+    """
+    field_names = tuple(f.name for f in dataclasses.fields(cls))
+    inherited_slots = set(
+        itertools.chain.from_iterable(getattr(base, "__slots__", ()) for base in cls.__mro__[1:])
+    )
+
+    cls_dict = dict(cls.__dict__)
+    cls_dict["__slots__"] = tuple(name for name in field_names if name not in inherited_slots)
+    # The defaults are already baked into __init__, and would clash with the slot descriptors.
+    for name in field_names:
+        cls_dict.pop(name, None)
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+
+    new_cls = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+    new_cls.__qualname__ = cls.__qualname__
+    return new_cls
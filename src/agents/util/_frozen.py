@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import copy
+from typing import Any, NoReturn, TypeVar
+
+T = TypeVar("T")
+
+
+def _read_only(self: Any, *args: Any, **kwargs: Any) -> NoReturn:
+    raise TypeError(
+        f"{type(self).__name__} is read-only, because it's shared by the agent run. Make a copy "
+        "(e.g. with copy.deepcopy()) to modify it."
+    )
+
+
+class FrozenDict(dict):  # type: ignore[type-arg]
+    """A dict that can't be modified. Being a dict, it can be used (and serialized) anywhere an
+    input item is expected.
+    """
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self) -> dict[Any, Any]:
+        return dict(self)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> dict[Any, Any]:
+        return {key: copy.deepcopy(value, memo) for key, value in self.items()}
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (FrozenDict, (dict(self),))
+
+
+class FrozenList(list):  # type: ignore[type-arg]
+    """A list that can't be modified. Being a list, it can be used (and serialized) anywhere an
+    input list is expected.
+    """
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def __copy__(self) -> list[Any]:
+        return list(self)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> list[Any]:
+        return [copy.deepcopy(value, memo) for value in self]
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (FrozenList, (list(self),))
+
+
+def is_frozen(value: Any) -> bool:
+    """Whether the value can be shared without copying it."""
+    return isinstance(value, (FrozenDict, FrozenList, str, int, float, bool, type(None)))
+
+
+def freeze(value: T) -> T:
+    """Returns a read-only version of a JSON-like value (dicts, lists and scalars). Dicts and lists
+    are copied once into their frozen versions; values that are already frozen are returned as
+    they are, so freezing is free for values that came out of an earlier run. Other objects (e.g.
+    pydantic models) are kept as they are.
+    """
+    if is_frozen(value):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict({key: freeze(item) for key, item in value.items()})  # type: ignore[return-value]
+    if isinstance(value, list):
+        return FrozenList(freeze(item) for item in value)  # type: ignore[return-value]
+    if isinstance(value, tuple):
+        return tuple(freeze(item) for item in value)  # type: ignore[return-value]
+    return value
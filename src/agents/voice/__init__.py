@@ -1,6 +1,6 @@
 from .events import VoiceStreamEvent, VoiceStreamEventAudio, VoiceStreamEventLifecycle
-from .exceptions import STTWebsocketConnectionError
-from .input import AudioInput, StreamedAudioInput
+from .exceptions import STTWebsocketConnectionError, VoiceServerOverloadedError
+from .input import AudioInput, StreamedAudioInput, VADSettings, VoiceActivityDetector
 from .model import (
     StreamedTranscriptionSession,
     STTModel,
@@ -16,7 +16,14 @@ from .models.openai_tts import OpenAITTSModel
 from .pipeline import VoicePipeline
 from .pipeline_config import VoicePipelineConfig
 from .result import StreamedAudioResult
-from .utils import get_sentence_based_splitter
+from .scheduler import (
+    TTSPhraseCache,
+    TTSScheduler,
+    get_default_tts_scheduler,
+    set_default_tts_scheduler,
+)
+from .server import VoiceServer, VoiceServerMetrics
+from .utils import SentenceSegmenter, get_sentence_based_splitter, segment_text_stream
 from .workflow import (
     SingleAgentVoiceWorkflow,
     SingleAgentWorkflowCallbacks,
@@ -27,6 +34,8 @@ from .workflow import (
 __all__ = [
     "AudioInput",
     "StreamedAudioInput",
+    "VADSettings",
+    "VoiceActivityDetector",
     "STTModel",
     "STTModelSettings",
     "TTSModel",
@@ -34,6 +43,10 @@ __all__ = [
     "TTSVoice",
     "VoiceModelProvider",
     "StreamedAudioResult",
+    "TTSScheduler",
+    "TTSPhraseCache",
+    "get_default_tts_scheduler",
+    "set_default_tts_scheduler",
     "SingleAgentVoiceWorkflow",
     "OpenAIVoiceModelProvider",
     "OpenAISTTModel",
@@ -44,10 +57,15 @@ __all__ = [
     "VoicePipeline",
     "VoicePipelineConfig",
     "get_sentence_based_splitter",
+    "SentenceSegmenter",
+    "segment_text_stream",
     "VoiceWorkflowHelper",
     "VoiceWorkflowBase",
     "SingleAgentWorkflowCallbacks",
     "StreamedTranscriptionSession",
     "OpenAISTTTranscriptionSession",
     "STTWebsocketConnectionError",
+    "VoiceServer",
+    "VoiceServerMetrics",
+    "VoiceServerOverloadedError",
 ]
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import binascii
+from collections.abc import Iterable
+
+from ..exceptions import UserError
+from .imports import np, npt
+from .input import _to_int16
+
+_INT16_SCALE = np.float32(32767.0)
+
+
+class PCMAccumulator:
+    """Collects chunks of 16-bit PCM audio, and converts them into a single NumPy array.
+
+    The chunks aren't joined into an intermediate `bytes` object. `take()` allocates the output
+    array once, and copies (or converts, for `float32`) every chunk straight into its slice. A
+    single chunk that's already the right shape is returned as a view over its bytes, without any
+    copy. The arrays are handed to the caller, so they are never reused.
+    """
+
+    def __init__(self, dtype: npt.DTypeLike = np.int16):
+        self._dtype = np.dtype(dtype)
+        if self._dtype not in (np.int16, np.float32):
+            raise UserError("Invalid output dtype")
+        self._chunks: list[memoryview] = []
+        self._num_bytes = 0
+        # A sample can be split across two chunks. Its first byte is kept here until the next one.
+        self._partial_sample = b""
+
+    def __len__(self) -> int:
+        """The number of chunks added since the last `take()`."""
+        return len(self._chunks)
+
+    def add(self, chunk: bytes) -> None:
+        """Adds a chunk of PCM audio. The chunk is referenced, not copied."""
+        if self._partial_sample:
+            chunk = self._partial_sample + chunk
+            self._partial_sample = b""
+        view = memoryview(chunk)
+        if len(view) % 2:
+            self._partial_sample = bytes(view[-1:])
+            view = view[:-1]
+        if view:
+            self._chunks.append(view)
+            self._num_bytes += len(view)
+
+    def take(self) -> npt.NDArray[np.int16 | np.float32] | None:
+        """Returns the audio added since the last call, or None if there is none. `int16` audio is
+        returned as a flat array, and `float32` audio as a `(samples, 1)` array in `[-1, 1]`.
+        """
+        if not self._chunks:
+            return None
+
+        chunks, self._chunks = self._chunks, []
+        num_samples = self._num_bytes // 2
+        self._num_bytes = 0
+
+        if self._dtype == np.int16:
+            if len(chunks) == 1:
+                return np.frombuffer(chunks[0], dtype=np.int16)
+            int16_out = np.empty(num_samples, dtype=np.int16)
+            self._fill(int16_out, chunks, convert=False)
+            return int16_out
+
+        float32_out = np.empty((num_samples, 1), dtype=np.float32)
+        self._fill(float32_out.reshape(-1), chunks, convert=True)
+        return float32_out
+
+    @staticmethod
+    def _fill(
+        out: npt.NDArray[np.int16 | np.float32], chunks: list[memoryview], convert: bool
+    ) -> None:
+        position = 0
+        for chunk in chunks:
+            samples = np.frombuffer(chunk, dtype=np.int16)
+            target = out[position : position + len(samples)]
+            if convert:
+                np.divide(samples, _INT16_SCALE, out=target, dtype=np.float32)
+            else:
+                target[...] = samples
+            position += len(samples)
+
+
+class PCMRingBuffer:
+    """Keeps the most recent `max_samples` samples of 16-bit PCM audio. Older audio is dropped as
+    new audio comes in, so the memory used never exceeds `max_samples` samples. The buffer grows
+    as audio is added, up to that size.
+    """
+
+    def __init__(self, max_samples: int):
+        self.max_samples = max(1, max_samples)
+        self._buffer: npt.NDArray[np.int16] = np.empty(0, dtype=np.int16)
+        self._start = 0
+        self._length = 0
+
+    def __len__(self) -> int:
+        """The number of samples in the buffer."""
+        return self._length
+
+    def write(self, audio: npt.NDArray[np.int16 | np.float32]) -> None:
+        """Adds audio to the buffer. `float32` audio is converted to `int16`."""
+        samples: npt.NDArray[np.int16] = _to_int16(audio).reshape(-1)
+        if len(samples) == 0:
+            return
+        if len(samples) >= self.max_samples:
+            samples = samples[-self.max_samples :]
+            self._ensure_capacity(self.max_samples)
+            self._buffer[:] = samples
+            self._start = 0
+            self._length = self.max_samples
+            return
+
+        self._ensure_capacity(self._length + len(samples))
+        size = len(self._buffer)
+        end = (self._start + self._length) % size
+        first = min(len(samples), size - end)
+        self._buffer[end : end + first] = samples[:first]
+        self._buffer[: len(samples) - first] = samples[first:]
+
+        overflow = self._length + len(samples) - size
+        if overflow > 0:
+            self._start = (self._start + overflow) % size
+        self._length = min(self._length + len(samples), size)
+
+    def clear(self) -> None:
+        """Removes all audio from the buffer, and releases its memory."""
+        self._buffer = np.empty(0, dtype=np.int16)
+        self._start = 0
+        self._length = 0
+
+    def to_base64(self) -> str:
+        """Returns the audio in the buffer as a base64 encoded string. The audio is encoded in
+        blocks, straight from the buffer, without copying it into a single `bytes` object first.
+        """
+        end = self._start + self._length
+        size = len(self._buffer)
+        parts = [self._buffer[self._start : min(end, size)], self._buffer[: max(0, end - size)]]
+        return _b64encode_parts(part.data.cast("B") for part in parts)
+
+    def _ensure_capacity(self, samples: int) -> None:
+        size = len(self._buffer)
+        if samples <= size or size == self.max_samples:
+            return
+        new_size = min(self.max_samples, max(samples, 2 * size))
+        # Until the buffer is full for the first time, it's never wrapped around
+        grown = np.empty(new_size, dtype=np.int16)
+        grown[: self._length] = self._buffer[: self._length]
+        self._buffer = grown
+
+
+_BASE64_BLOCK_SIZE = 3 * 64 * 1024
+
+
+def _b64encode_parts(parts: Iterable[memoryview]) -> str:
+    """Base64 encodes the concatenation of the parts, one block at a time."""
+    encoded: list[bytes] = []
+    leftover = b""
+    for part in parts:
+        if leftover:
+            needed = 3 - len(leftover)
+            leftover += bytes(part[:needed])
+            part = part[needed:]
+            if len(leftover) < 3:
+                continue
+            encoded.append(binascii.b2a_base64(leftover, newline=False))
+            leftover = b""
+        whole = len(part) - len(part) % 3
+        for start in range(0, whole, _BASE64_BLOCK_SIZE):
+            block = part[start : min(start + _BASE64_BLOCK_SIZE, whole)]
+            encoded.append(binascii.b2a_base64(block, newline=False))
+        leftover = bytes(part[whole:])
+    if leftover:
+        encoded.append(binascii.b2a_base64(leftover, newline=False))
+    return b"".join(encoded).decode("ascii")
@@ -6,3 +6,10 @@ class STTWebsocketConnectionError(AgentsException):
 
     def __init__(self, message: str):
         self.message = message
+
+
+class VoiceServerOverloadedError(AgentsException):
+    """Exception raised when a `VoiceServer` can't admit a new session, because it's at capacity."""
+
+    def __init__(self, message: str):
+        self.message = message
@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import asyncio
 import base64
+import dataclasses
 import io
 import wave
+from collections import deque
 from dataclasses import dataclass
 
 from ..exceptions import UserError
@@ -12,18 +14,23 @@ from .imports import np, npt
 DEFAULT_SAMPLE_RATE = 24000
 
 
+def _to_int16(buffer: npt.NDArray[np.int16 | np.float32]) -> npt.NDArray[np.int16]:
+    if buffer.dtype == np.float32:
+        # convert to int16
+        buffer = np.clip(buffer, -1.0, 1.0)
+        return (buffer * 32767).astype(np.int16)
+    elif buffer.dtype != np.int16:
+        raise UserError("Buffer must be a numpy array of int16 or float32")
+    return buffer  # type: ignore[return-value]
+
+
 def _buffer_to_audio_file(
     buffer: npt.NDArray[np.int16 | np.float32],
     frame_rate: int = DEFAULT_SAMPLE_RATE,
     sample_width: int = 2,
     channels: int = 1,
 ) -> tuple[str, io.BytesIO, str]:
-    if buffer.dtype == np.float32:
-        # convert to int16
-        buffer = np.clip(buffer, -1.0, 1.0)
-        buffer = (buffer * 32767).astype(np.int16)
-    elif buffer.dtype != np.int16:
-        raise UserError("Buffer must be a numpy array of int16 or float32")
+    buffer = _to_int16(buffer)
 
     audio_file = io.BytesIO()
     with wave.open(audio_file, "w") as wav_file:
@@ -37,6 +44,158 @@ def _buffer_to_audio_file(
     return ("audio.wav", audio_file, "audio/wav")
 
 
+@dataclass
+class VADSettings:
+    """Settings for the local voice activity detection, which drops silence from the audio before
+    it's sent to the STT model.
+    """
+
+    frame_ms: float = 20
+    """The length of the frames the audio is split into. Each frame is classified as speech or
+    silence on its own."""
+
+    energy_threshold: float = 0.01
+    """The RMS level of a frame (with samples between -1 and 1) from which it counts as speech. The
+    default is about -40 dBFS."""
+
+    zero_crossing_threshold: float = 0.25
+    """Frames that are quieter than `energy_threshold`, but not below half of it, still count as
+    speech if at least this fraction of their samples cross zero. This keeps unvoiced sounds like
+    "s" or "f" that are quiet but noisy."""
+
+    hangover_ms: float = 600
+    """How long audio is kept after the last speech frame. With streamed input, this should be
+    longer than the silence the STT model's turn detection waits for to end a turn."""
+
+    padding_ms: float = 100
+    """How much audio is kept before a speech frame, so the start of words isn't clipped."""
+
+    chunk_ms: float = 100
+    """With streamed input, the audio that's kept is sent to the STT model in chunks of this
+    length."""
+
+
+class VoiceActivityDetector:
+    """Drops the silence from audio, based on the energy and zero-crossing rate of each frame.
+
+    Audio is split into fixed-size frames, which are classified all at once with NumPy. Frames
+    within `hangover_ms` after, or `padding_ms` before, a speech frame are kept. All other frames
+    are dropped, which trims leading and trailing silence as well as long pauses. The detector
+    keeps its state across calls to `process()`, so it can be used on streamed audio.
+    """
+
+    def __init__(
+        self,
+        settings: VADSettings | None = None,
+        frame_rate: int = DEFAULT_SAMPLE_RATE,
+        channels: int = 1,
+    ):
+        """Create a new `VoiceActivityDetector` instance.
+
+        Args:
+            settings: The settings to use. Defaults to `VADSettings()`.
+            frame_rate: The sample rate of the audio.
+            channels: The number of (interleaved) channels in the audio.
+        """
+        self.settings = settings or VADSettings()
+        self.channels = channels
+        self.frame_size = max(1, round(frame_rate * self.settings.frame_ms / 1000)) * channels
+        """The number of samples in a frame, across all channels."""
+
+        self._hangover_frames = round(self.settings.hangover_ms / self.settings.frame_ms)
+        self._padding_frames = round(self.settings.padding_ms / self.settings.frame_ms)
+        self._remainder: npt.NDArray[np.int16] = np.empty(0, dtype=np.int16)
+        # The number of frames since the last speech frame, capped at the hangover. Starting at the
+        # cap means leading silence is dropped.
+        self._frames_since_speech = self._hangover_frames
+        # The last dropped frames, to be kept as padding if speech comes next
+        self._dropped: deque[npt.NDArray[np.int16]] = deque(maxlen=self._padding_frames)
+
+    @property
+    def in_speech(self) -> bool:
+        """Whether the next frame will be kept even if it's silent, because speech was detected
+        less than `hangover_ms` ago."""
+        return self._frames_since_speech < self._hangover_frames
+
+    def process(self, audio: npt.NDArray[np.int16 | np.float32]) -> npt.NDArray[np.int16]:
+        """Classifies the audio, and returns the frames that are kept as an `int16` array of shape
+        `(frames, frame_size)`. Samples that don't fill a whole frame are kept for the next call.
+        """
+        samples: npt.NDArray[np.int16] = _to_int16(audio).reshape(-1)
+        if self._remainder.size:
+            samples = np.concatenate((self._remainder, samples))
+        num_frames = len(samples) // self.frame_size
+        frames = samples[: num_frames * self.frame_size].reshape(num_frames, self.frame_size)
+        self._remainder = samples[num_frames * self.frame_size :].copy()
+        if not num_frames:
+            return frames
+
+        speech = self._classify(frames)
+        index = np.arange(num_frames)
+
+        # Keep the frames that are at most `hangover` frames after the last speech frame, which
+        # may have been in an earlier call
+        last_speech = np.maximum.accumulate(np.where(speech, index, -self._frames_since_speech - 1))
+        keep = index - last_speech <= self._hangover_frames
+        # ... and the frames that are at most `padding` frames before the next speech frame
+        next_speech = np.minimum.accumulate(
+            np.where(speech, index, num_frames + self._padding_frames)[::-1]
+        )[::-1]
+        keep |= next_speech - index <= self._padding_frames
+
+        # The padding for speech at the start of these frames comes from the last call
+        padding: list[npt.NDArray[np.int16]] = []
+        missing_padding = self._padding_frames - int(next_speech[0])
+        if missing_padding > 0 and self._dropped:
+            padding = list(self._dropped)[-missing_padding:]
+
+        speech_index = np.flatnonzero(speech)
+        if speech_index.size:
+            self._frames_since_speech = num_frames - 1 - int(speech_index[-1])
+        else:
+            self._frames_since_speech += num_frames
+        self._frames_since_speech = min(self._frames_since_speech, self._hangover_frames)
+
+        kept_index = np.flatnonzero(keep)
+        if kept_index.size:
+            self._dropped.clear()
+        first_dropped = int(kept_index[-1]) + 1 if kept_index.size else 0
+        first_dropped = max(first_dropped, num_frames - self._padding_frames)
+        self._dropped.extend(frame.copy() for frame in frames[first_dropped:])
+
+        kept: npt.NDArray[np.int16] = frames[keep]
+        if padding:
+            kept = np.concatenate((np.stack(padding), kept))
+        return kept
+
+    def flush(self) -> npt.NDArray[np.int16]:
+        """Returns the samples left over from the last call to `process()` if they're kept, as a
+        flat array, and resets the detector for new audio.
+        """
+        remainder = self._remainder if self.in_speech else self._remainder[:0]
+        self._remainder = np.empty(0, dtype=np.int16)
+        self._frames_since_speech = self._hangover_frames
+        self._dropped.clear()
+        return remainder
+
+    def _classify(self, frames: npt.NDArray[np.int16]) -> npt.NDArray[np.bool_]:
+        samples = frames.astype(np.float32)
+        samples /= 32768.0
+        if self.channels > 1:
+            samples = samples.reshape(len(frames), -1, self.channels).mean(axis=2)
+
+        energy = np.sqrt(np.mean(np.square(samples), axis=1))
+        signs = np.signbit(samples)
+        zero_crossing_rate = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+
+        threshold = self.settings.energy_threshold
+        unvoiced = (energy >= threshold / 2) & (
+            zero_crossing_rate >= self.settings.zero_crossing_threshold
+        )
+        speech: npt.NDArray[np.bool_] = (energy >= threshold) | unvoiced
+        return speech
+
+
 @dataclass
 class AudioInput:
     """Static audio to be used as input for the VoicePipeline."""
@@ -59,6 +218,19 @@ class AudioInput:
         """Returns a tuple of (filename, bytes, content_type)"""
         return _buffer_to_audio_file(self.buffer, self.frame_rate, self.sample_width, self.channels)
 
+    def trim_silence(self, settings: VADSettings | None = None) -> AudioInput:
+        """Returns a copy of the audio input without its leading and trailing silence, and with
+        long pauses removed, using a `VoiceActivityDetector`. The buffer of the copy is `int16`.
+
+        Args:
+            settings: The voice activity detection settings. Defaults to `VADSettings()`.
+        """
+        detector = VoiceActivityDetector(settings, self.frame_rate, self.channels)
+        buffer = np.concatenate((detector.process(self.buffer).reshape(-1), detector.flush()))
+        if self.buffer.ndim == 2:
+            buffer = buffer.reshape(-1, self.channels)
+        return dataclasses.replace(self, buffer=buffer)
+
     def to_base64(self) -> str:
         """Returns the audio data as a base64 encoded string."""
         if self.buffer.dtype == np.float32:
@@ -6,8 +6,7 @@ from dataclasses import dataclass
 from typing import Any, Callable, Literal
 
 from .imports import np, npt
-from .input import AudioInput, StreamedAudioInput
-from .utils import get_sentence_based_splitter
+from .input import AudioInput, StreamedAudioInput, VADSettings
 
 DEFAULT_TTS_INSTRUCTIONS = (
     "You will receive partial sentences. Do not complete the sentence, just read out the text."
@@ -48,11 +47,23 @@ class TTSModelSettings:
     audio output.
     """
 
-    text_splitter: Callable[[str], tuple[str, str]] = get_sentence_based_splitter()
+    text_splitter: Callable[[str], tuple[str, str]] | None = None
     """
     A function to split the text into chunks. This is useful if you want to split the text into
     chunks before sending it to the TTS model rather than waiting for the whole text to be
-    processed.
+    processed. It's called with all the buffered text whenever new text arrives. If not provided,
+    the text is split incrementally by a `SentenceSegmenter`, configured with
+    `min_segment_length` and `max_segment_latency_ms`.
+    """
+
+    min_segment_length: int = 20
+    """The minimum length of the text sent to the TTS model at sentence boundaries."""
+
+    max_segment_latency_ms: float | None = None
+    """
+    If set, text that has waited this long for the end of its sentence is sent to the TTS model at
+    the last clause or word boundary instead, which reduces the time to the first audio for long
+    sentences.
     """
 
     speed: float | None = None
@@ -114,6 +125,19 @@ class STTModelSettings:
     turn_detection: dict[str, Any] | None = None
     """The turn detection settings for the model when using streamed audio input."""
 
+    vad: VADSettings | None = None
+    """
+    If set, silence is detected locally and dropped from the audio before it's sent to the model,
+    which reduces the amount of audio that's uploaded and transcribed.
+    """
+
+    trace_audio_max_seconds: float = 60.0
+    """
+    When audio is included in traces, the maximum length of the audio that's kept for each turn of
+    a streamed transcription. Only the most recent audio is kept, so long turns don't grow the
+    memory of the session without limit.
+    """
+
 
 class STTModel(abc.ABC):
     """A speech-to-text model that can convert audio input into text."""
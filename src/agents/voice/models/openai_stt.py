@@ -14,9 +14,10 @@ from ... import _debug
 from ...exceptions import AgentsException
 from ...logger import logger
 from ...tracing import Span, SpanError, TranscriptionSpanData, transcription_span
+from .._pcm import PCMRingBuffer
 from ..exceptions import STTWebsocketConnectionError
 from ..imports import np, npt, websockets
-from ..input import AudioInput, StreamedAudioInput
+from ..input import DEFAULT_SAMPLE_RATE, AudioInput, StreamedAudioInput, VoiceActivityDetector
 from ..model import StreamedTranscriptionSession, STTModel, STTModelSettings
 
 EVENT_INACTIVITY_TIMEOUT = 1000  # Timeout for inactivity in event processing
@@ -39,16 +40,6 @@ class WebsocketDoneSentinel:
     pass
 
 
-def _audio_to_base64(audio_data: list[npt.NDArray[np.int16 | np.float32]]) -> str:
-    concatenated_audio = np.concatenate(audio_data)
-    if concatenated_audio.dtype == np.float32:
-        # convert to int16
-        concatenated_audio = np.clip(concatenated_audio, -1.0, 1.0)
-        concatenated_audio = (concatenated_audio * 32767).astype(np.int16)
-    audio_bytes = concatenated_audio.tobytes()
-    return base64.b64encode(audio_bytes).decode("utf-8")
-
-
 async def _wait_for_event(
     event_queue: asyncio.Queue[dict[str, Any]], expected_types: list[str], timeout: float
 ):
@@ -95,7 +86,20 @@ class OpenAISTTTranscriptionSession(StreamedTranscriptionSession):
         self._websocket: websockets.ClientConnection | None = None
         self._event_queue: asyncio.Queue[dict[str, Any] | WebsocketDoneSentinel] = asyncio.Queue()
         self._state_queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
-        self._turn_audio_buffer: list[npt.NDArray[np.int16 | np.float32]] = []
+        # The most recent audio of the turn, only kept if it's going to be traced
+        self._turn_audio_buffer: PCMRingBuffer | None = None
+        if trace_include_sensitive_audio_data:
+            self._turn_audio_buffer = PCMRingBuffer(
+                int(settings.trace_audio_max_seconds * DEFAULT_SAMPLE_RATE)
+            )
+        self._vad: VoiceActivityDetector | None = None
+        self._vad_chunk_size = 0
+        # Audio that's kept by the VAD, but doesn't fill a whole chunk yet
+        self._vad_pending: list[npt.NDArray[np.int16]] = []
+        if settings.vad is not None:
+            self._vad = VoiceActivityDetector(settings.vad)
+            chunk_frames = max(1, round(settings.vad.chunk_ms / settings.vad.frame_ms))
+            self._vad_chunk_size = chunk_frames * self._vad.frame_size
         self._tracing_span: Span[TranscriptionSpanData] | None = None
 
         # tasks
@@ -122,8 +126,8 @@ class OpenAISTTTranscriptionSession(StreamedTranscriptionSession):
             return
 
         if self._tracing_span:
-            if self._trace_include_sensitive_audio_data:
-                self._tracing_span.span_data.input = _audio_to_base64(self._turn_audio_buffer)
+            if self._turn_audio_buffer is not None:
+                self._tracing_span.span_data.input = self._turn_audio_buffer.to_base64()
 
             self._tracing_span.span_data.input_format = "pcm"
 
@@ -131,9 +135,11 @@ class OpenAISTTTranscriptionSession(StreamedTranscriptionSession):
                 self._tracing_span.span_data.output = _transcript
 
             self._tracing_span.finish()
-            self._turn_audio_buffer = []
             self._tracing_span = None
 
+        if self._turn_audio_buffer is not None:
+            self._turn_audio_buffer.clear()
+
     async def _event_listener(self) -> None:
         assert self._websocket is not None, "Websocket not initialized"
 
@@ -241,6 +247,49 @@ class OpenAISTTTranscriptionSession(StreamedTranscriptionSession):
                 raise e
         await self._output_queue.put(SessionCompleteSentinel())
 
+    def _detect_speech(
+        self, buffer: npt.NDArray[np.int16 | np.float32] | None
+    ) -> list[npt.NDArray[np.int16]]:
+        """Drops the silence from the audio, and regroups the rest into chunks of `chunk_ms`. A
+        chunk that isn't full is only sent once the speech is over, or the input ends.
+        """
+        assert self._vad is not None
+        if buffer is not None:
+            self._vad_pending.append(self._vad.process(buffer).reshape(-1))
+        else:
+            self._vad_pending.append(self._vad.flush())
+        samples = np.concatenate(self._vad_pending)
+
+        size = self._vad_chunk_size
+        end = len(samples) // size * size
+        if buffer is None or not self._vad.in_speech:
+            end = len(samples)
+        chunks: list[npt.NDArray[np.int16]] = [
+            samples[start : start + size] for start in range(0, end, size)
+        ]
+        self._vad_pending = [samples[end:]] if end < len(samples) else []
+        return chunks
+
+    async def _send_audio(self, buffer: npt.NDArray[np.int16 | np.float32]) -> bool:
+        assert self._websocket is not None, "Websocket not initialized"
+        if self._turn_audio_buffer is not None:
+            self._turn_audio_buffer.write(buffer)
+        try:
+            await self._websocket.send(
+                json.dumps(
+                    {
+                        "type": "input_audio_buffer.append",
+                        "audio": base64.b64encode(buffer.tobytes()).decode("utf-8"),
+                    }
+                )
+            )
+        except websockets.ConnectionClosed:
+            return False
+        except Exception as e:
+            await self._output_queue.put(ErrorSentinel(e))
+            raise e
+        return True
+
     async def _stream_audio(
         self, audio_queue: asyncio.Queue[npt.NDArray[np.int16 | np.float32]]
     ) -> None:
@@ -248,24 +297,17 @@ class OpenAISTTTranscriptionSession(StreamedTranscriptionSession):
         self._start_turn()
         while True:
             buffer = await audio_queue.get()
-            if buffer is None:
-                break
+            chunks: list[npt.NDArray[np.int16 | np.float32]]
+            if self._vad is not None:
+                chunks = list(self._detect_speech(buffer))
+            else:
+                chunks = [] if buffer is None else [buffer]
 
-            self._turn_audio_buffer.append(buffer)
-            try:
-                await self._websocket.send(
-                    json.dumps(
-                        {
-                            "type": "input_audio_buffer.append",
-                            "audio": base64.b64encode(buffer.tobytes()).decode("utf-8"),
-                        }
-                    )
-                )
-            except websockets.ConnectionClosed:
+            for chunk in chunks:
+                if not await self._send_audio(chunk):
+                    return
+            if buffer is None:
                 break
-            except Exception as e:
-                await self._output_queue.put(ErrorSentinel(e))
-                raise e
 
             await asyncio.sleep(0)  # yield control
 
@@ -402,6 +444,9 @@ class OpenAISTTModel(STTModel):
         Returns:
             The transcribed text.
         """
+        if settings.vad is not None:
+            input = input.trim_silence(settings.vad)
+
         with transcription_span(
             model=self.model,
             input=input.to_base64() if trace_include_sensitive_audio_data else "",
@@ -412,6 +457,10 @@ class OpenAISTTModel(STTModel):
                 "prompt": self._non_null_or_not_given(settings.prompt),
             },
         ) as span:
+            if len(input.buffer) == 0:
+                # Only silence, so there's nothing to transcribe
+                span.span_data.output = ""
+                return ""
             try:
                 response = await self._client.audio.transcriptions.create(
                     model=self.model,
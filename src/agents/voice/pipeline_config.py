@@ -6,6 +6,7 @@ from typing import Any
 from ..tracing.util import gen_group_id
 from .model import STTModelSettings, TTSModelSettings, VoiceModelProvider
 from .models.openai_model_provider import OpenAIVoiceModelProvider
+from .scheduler import TTSPhraseCache, TTSScheduler
 
 
 @dataclass
@@ -44,3 +45,18 @@ class VoicePipelineConfig:
 
     tts_settings: TTSModelSettings = field(default_factory=TTSModelSettings)
     """The settings to use for the TTS model."""
+
+    tts_prefetch_depth: int = 2
+    """
+    How many text segments after the one that's currently playing can be synthesized ahead of
+    time, at least 0. Later segments wait until playback gets closer.
+    """
+
+    tts_scheduler: TTSScheduler | None = None
+    """
+    The scheduler that limits the number of concurrent TTS requests, and runs the playing segments
+    first. If not provided, the process-wide scheduler from `get_default_tts_scheduler()` is used.
+    """
+
+    tts_cache: TTSPhraseCache | None = None
+    """An optional cache of synthesized audio for phrases that are repeated, like greetings."""
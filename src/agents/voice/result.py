@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import asyncio
 import base64
+import time
+from collections import deque
 from collections.abc import AsyncIterator
 from typing import Any
 
@@ -9,15 +11,17 @@ from ..exceptions import UserError
 from ..logger import logger
 from ..tracing import Span, SpeechGroupSpanData, speech_group_span, speech_span
 from ..tracing.util import time_iso
+from ._pcm import PCMAccumulator
 from .events import (
     VoiceStreamEvent,
     VoiceStreamEventAudio,
     VoiceStreamEventError,
     VoiceStreamEventLifecycle,
 )
-from .imports import np, npt
 from .model import TTSModel, TTSModelSettings
 from .pipeline_config import VoicePipelineConfig
+from .scheduler import get_default_tts_scheduler
+from .utils import SentenceSegmenter
 
 
 def _audio_to_base64(audio_data: list[bytes]) -> str:
@@ -41,6 +45,8 @@ class StreamedAudioResult:
             tts_settings: The TTS settings to use.
             voice_pipeline_config: The voice pipeline config to use.
         """
+        if voice_pipeline_config.tts_prefetch_depth < 0:
+            raise UserError("tts_prefetch_depth must be at least 0")
         self.tts_model = tts_model
         self.tts_settings = tts_settings
         self.total_output_text = ""
@@ -49,15 +55,28 @@ class StreamedAudioResult:
 
         self._voice_pipeline_config = voice_pipeline_config
         self._text_buffer = ""
+        self._segmenter: SentenceSegmenter | None = None
+        if tts_settings.text_splitter is None:
+            self._segmenter = SentenceSegmenter(
+                min_sentence_length=tts_settings.min_segment_length,
+                max_latency_ms=tts_settings.max_segment_latency_ms,
+            )
         self._turn_text_buffer = ""
         self._queue: asyncio.Queue[VoiceStreamEvent] = asyncio.Queue()
         self._tasks: list[asyncio.Task[Any]] = []
-        self._ordered_tasks: list[
-            asyncio.Queue[VoiceStreamEvent | None]
-        ] = []  # New: list to hold local queues for each text segment
+        # Local queues for each text segment, in the order the audio should be played
+        self._ordered_tasks: deque[asyncio.Queue[VoiceStreamEvent | None]] = deque()
+        # Set when a segment is added or the session completes, to wake up the dispatcher
+        self._dispatch_wakeup = asyncio.Event()
         self._dispatcher_task: asyncio.Task[Any] | None = (
             None  # Task to dispatch audio chunks in order
         )
+        self._tts_scheduler = voice_pipeline_config.tts_scheduler or get_default_tts_scheduler()
+        self._tts_cache = voice_pipeline_config.tts_cache
+        self._segment_count = 0
+        # The index of the segment that's being dispatched, and notified when it moves on
+        self._playing_index = 0
+        self._playback_moved = asyncio.Condition()
 
         self._done_processing = False
         self._buffer_size = tts_settings.buffer_size
@@ -67,6 +86,7 @@ class StreamedAudioResult:
         self._completed_session = False
         self._stored_exception: BaseException | None = None
         self._tracing_span: Span[SpeechGroupSpanData] | None = None
+        self._first_audio_at: float | None = None  # time.monotonic() of the first audio event
 
     async def _start_turn(self):
         if self._started_processing_turn:
@@ -85,22 +105,46 @@ class StreamedAudioResult:
     async def _add_error(self, error: Exception):
         await self._queue.put(VoiceStreamEventError(error))
 
-    def _transform_audio_buffer(
-        self, buffer: list[bytes], output_dtype: npt.DTypeLike
-    ) -> npt.NDArray[np.int16 | np.float32]:
-        np_array = np.frombuffer(b"".join(buffer), dtype=np.int16)
+    async def _put_audio(
+        self, buffer: PCMAccumulator, local_queue: asyncio.Queue[VoiceStreamEvent | None]
+    ) -> None:
+        audio_np = buffer.take()
+        if audio_np is None:
+            return
+        if self.tts_settings.transform_data:
+            audio_np = self.tts_settings.transform_data(audio_np)
+        await local_queue.put(VoiceStreamEventAudio(data=audio_np))  # Use local queue
+
+    async def _synthesize(self, text: str, index: int) -> AsyncIterator[bytes]:
+        model_name = self.tts_model.model_name
+        if self._tts_cache is not None:
+            cached = self._tts_cache.get(model_name, text, self.tts_settings)
+            if cached is not None:
+                for chunk in cached:
+                    yield chunk
+                return
+
+        # Only synthesize a limited number of segments ahead of the one that's playing
+        prefetch_depth = self._voice_pipeline_config.tts_prefetch_depth
+        async with self._playback_moved:
+            await self._playback_moved.wait_for(
+                lambda: index <= self._playing_index + prefetch_depth
+            )
 
-        if output_dtype == np.int16:
-            return np_array
-        elif output_dtype == np.float32:
-            return (np_array.astype(np.float32) / 32767.0).reshape(-1, 1)
-        else:
-            raise UserError("Invalid output dtype")
+        chunks: list[bytes] = []
+        async with self._tts_scheduler.slot(lambda: index - self._playing_index):
+            async for chunk in self.tts_model.run(text, self.tts_settings):
+                if self._tts_cache is not None:
+                    chunks.append(chunk)
+                yield chunk
+        if self._tts_cache is not None:
+            self._tts_cache.put(model_name, text, self.tts_settings, chunks)
 
     async def _stream_audio(
         self,
         text: str,
         local_queue: asyncio.Queue[VoiceStreamEvent | None],
+        index: int,
         finish_turn: bool = False,
     ):
         with speech_span(
@@ -116,32 +160,26 @@ class StreamedAudioResult:
         ) as tts_span:
             try:
                 first_byte_received = False
-                buffer: list[bytes] = []
-                full_audio_data: list[bytes] = []
+                buffer = PCMAccumulator(self.tts_settings.dtype)
+                # Only keep a copy of the whole audio if it's going to be traced
+                full_audio_data: list[bytes] | None = (
+                    [] if self._voice_pipeline_config.trace_include_sensitive_audio_data else None
+                )
 
-                async for chunk in self.tts_model.run(text, self.tts_settings):
+                async for chunk in self._synthesize(text, index):
                     if not first_byte_received:
                         first_byte_received = True
                         tts_span.span_data.first_content_at = time_iso()
 
                     if chunk:
-                        buffer.append(chunk)
-                        full_audio_data.append(chunk)
+                        buffer.add(chunk)
+                        if full_audio_data is not None:
+                            full_audio_data.append(chunk)
                         if len(buffer) >= self._buffer_size:
-                            audio_np = self._transform_audio_buffer(buffer, self.tts_settings.dtype)
-                            if self.tts_settings.transform_data:
-                                audio_np = self.tts_settings.transform_data(audio_np)
-                            await local_queue.put(
-                                VoiceStreamEventAudio(data=audio_np)
-                            )  # Use local queue
-                            buffer = []
-                if buffer:
-                    audio_np = self._transform_audio_buffer(buffer, self.tts_settings.dtype)
-                    if self.tts_settings.transform_data:
-                        audio_np = self.tts_settings.transform_data(audio_np)
-                    await local_queue.put(VoiceStreamEventAudio(data=audio_np))  # Use local queue
-
-                if self._voice_pipeline_config.trace_include_sensitive_audio_data:
+                            await self._put_audio(buffer, local_queue)
+                await self._put_audio(buffer, local_queue)
+
+                if full_audio_data is not None:
                     tts_span.span_data.output = _audio_to_base64(full_audio_data)
                 else:
                     tts_span.span_data.output = ""
@@ -170,28 +208,36 @@ class StreamedAudioResult:
     async def _add_text(self, text: str):
         await self._start_turn()
 
-        self._text_buffer += text
         self.total_output_text += text
         self._turn_text_buffer += text
 
-        combined_sentences, self._text_buffer = self.tts_settings.text_splitter(self._text_buffer)
+        if self._segmenter is not None:
+            segments = self._segmenter.push(text)
+        else:
+            assert self.tts_settings.text_splitter is not None
+            self._text_buffer += text
+            combined_sentences, self._text_buffer = self.tts_settings.text_splitter(
+                self._text_buffer
+            )
+            segments = [combined_sentences] if combined_sentences else []
 
-        if len(combined_sentences) >= 20:
+        for segment in segments:
             local_queue: asyncio.Queue[VoiceStreamEvent | None] = asyncio.Queue()
-            self._ordered_tasks.append(local_queue)
-            self._tasks.append(
-                asyncio.create_task(self._stream_audio(combined_sentences, local_queue))
-            )
+            index = self._add_segment(local_queue)
+            self._tasks.append(asyncio.create_task(self._stream_audio(segment, local_queue, index)))
             if self._dispatcher_task is None:
                 self._dispatcher_task = asyncio.create_task(self._dispatch_audio())
 
     async def _turn_done(self):
+        if self._segmenter is not None:
+            self._text_buffer = self._segmenter.flush()
         if self._text_buffer:
             local_queue: asyncio.Queue[VoiceStreamEvent | None] = asyncio.Queue()
-            self._ordered_tasks.append(local_queue)  # Append the local queue for the final segment
+            # Append the local queue for the final segment
+            index = self._add_segment(local_queue)
             self._tasks.append(
                 asyncio.create_task(
-                    self._stream_audio(self._text_buffer, local_queue, finish_turn=True)
+                    self._stream_audio(self._text_buffer, local_queue, index, finish_turn=True)
                 )
             )
             self._text_buffer = ""
@@ -212,29 +258,46 @@ class StreamedAudioResult:
         self._turn_text_buffer = ""
         self._started_processing_turn = False
 
+    def _add_segment(self, local_queue: asyncio.Queue[VoiceStreamEvent | None]) -> int:
+        self._ordered_tasks.append(local_queue)
+        self._dispatch_wakeup.set()
+        self._segment_count += 1
+        return self._segment_count - 1
+
+    async def _segment_played(self) -> None:
+        async with self._playback_moved:
+            self._playing_index += 1
+            self._playback_moved.notify_all()
+
     async def _done(self):
         self._completed_session = True
+        self._dispatch_wakeup.set()
         await self._wait_for_completion()
 
     async def _dispatch_audio(self):
         # Dispatch audio chunks from each segment in the order they were added
         while True:
-            if len(self._ordered_tasks) == 0:
+            if not self._ordered_tasks:
                 if self._completed_session:
                     break
-                await asyncio.sleep(0)
+                # Sleep until the next segment is added, or the session completes
+                self._dispatch_wakeup.clear()
+                await self._dispatch_wakeup.wait()
                 continue
-            local_queue = self._ordered_tasks.pop(0)
+            local_queue = self._ordered_tasks.popleft()
             while True:
                 chunk = await local_queue.get()
                 if chunk is None:
                     break
+                if self._first_audio_at is None and isinstance(chunk, VoiceStreamEventAudio):
+                    self._first_audio_at = time.monotonic()
                 await self._queue.put(chunk)
                 if isinstance(chunk, VoiceStreamEventLifecycle):
                     local_queue.task_done()
                     if chunk.event == "turn_ended":
                         self._finish_turn()
                         break
+            await self._segment_played()
         await self._queue.put(VoiceStreamEventLifecycle(event="session_ended"))
 
     async def _wait_for_completion(self):
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import itertools
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from ..exceptions import UserError
+from .model import TTSModelSettings
+
+DEFAULT_MAX_TTS_CONCURRENCY = 32
+
+
+@dataclass
+class _Waiter:
+    priority: Callable[[], float]
+    sequence: int
+    future: asyncio.Future[None]
+
+
+class TTSScheduler:
+    """Limits how many TTS requests run at the same time, and decides which of the waiting requests
+    goes next.
+
+    The priority of a waiting request is evaluated whenever a slot frees up, so it can change while
+    the request waits. `StreamedAudioResult` uses the distance between a segment and the segment
+    that's currently playing, so the playing segments of all sessions go first, and segments that
+    are synthesized ahead go after them. Requests with the same priority go in the order they
+    arrived.
+
+    A single scheduler can be shared by all pipelines in the process. See
+    `set_default_tts_scheduler()`.
+    """
+
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_TTS_CONCURRENCY):
+        """Create a new `TTSScheduler` instance.
+
+        Args:
+            max_concurrency: The maximum number of TTS requests that can run at the same time.
+        """
+        if max_concurrency < 1:
+            raise UserError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self._active = 0
+        self._waiters: list[_Waiter] = []
+        self._sequence = itertools.count()
+
+    @property
+    def active(self) -> int:
+        """The number of TTS requests that are running."""
+        return self._active
+
+    @property
+    def waiting(self) -> int:
+        """The number of TTS requests that are waiting for a slot."""
+        return len(self._waiters)
+
+    @contextlib.asynccontextmanager
+    async def slot(self, priority: Callable[[], float] = lambda: 0) -> AsyncIterator[None]:
+        """Waits for a free slot, and holds it for the duration of the context.
+
+        Args:
+            priority: Returns the current priority of the request. Lower values go first.
+        """
+        await self._acquire(priority)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self, priority: Callable[[], float]) -> None:
+        if self._active < self.max_concurrency and not self._waiters:
+            self._active += 1
+            return
+
+        waiter = _Waiter(priority, next(self._sequence), asyncio.get_running_loop().create_future())
+        self._waiters.append(waiter)
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            elif waiter.future.done() and not waiter.future.cancelled():
+                # The slot was handed over just before the cancellation, so pass it on
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        self._active -= 1
+        while self._waiters and self._active < self.max_concurrency:
+            waiter = min(self._waiters, key=lambda w: (w.priority(), w.sequence))
+            self._waiters.remove(waiter)
+            if waiter.future.done():
+                continue
+            self._active += 1
+            waiter.future.set_result(None)
+
+
+_default_tts_scheduler: TTSScheduler | None = None
+
+
+def get_default_tts_scheduler() -> TTSScheduler:
+    """Returns the process-wide TTS scheduler, which is used by pipelines that don't set
+    `VoicePipelineConfig.tts_scheduler`. Unless it's replaced with `set_default_tts_scheduler()`,
+    it allows `DEFAULT_MAX_TTS_CONCURRENCY` requests at the same time.
+    """
+    global _default_tts_scheduler
+    if _default_tts_scheduler is None:
+        _default_tts_scheduler = TTSScheduler()
+    return _default_tts_scheduler
+
+
+def set_default_tts_scheduler(scheduler: TTSScheduler) -> None:
+    """Sets the process-wide TTS scheduler, which is used by pipelines that don't set
+    `VoicePipelineConfig.tts_scheduler`.
+    """
+    global _default_tts_scheduler
+    _default_tts_scheduler = scheduler
+
+
+_CacheKey = tuple[str, str, Optional[str], str, Optional[float]]
+
+
+class TTSPhraseCache:
+    """A least-recently-used cache of synthesized audio, so phrases that are said over and over
+    (like greetings) are only synthesized once. Share an instance between pipelines to share the
+    cached audio.
+    """
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024, max_text_length: int = 200):
+        """Create a new `TTSPhraseCache` instance.
+
+        Args:
+            max_bytes: The maximum size of the cached audio. The least recently used phrases are
+                evicted beyond it.
+            max_text_length: Only text up to this length is cached. Longer text is unlikely to be
+                repeated.
+        """
+        self.max_bytes = max_bytes
+        self.max_text_length = max_text_length
+        self.hits = 0
+        """The number of lookups that found cached audio."""
+        self.misses = 0
+        """The number of lookups that didn't find cached audio."""
+        self._entries: OrderedDict[_CacheKey, list[bytes]] = OrderedDict()
+        self._size = 0
+
+    @property
+    def size(self) -> int:
+        """The size of the cached audio, in bytes."""
+        return self._size
+
+    def get(self, model_name: str, text: str, settings: TTSModelSettings) -> list[bytes] | None:
+        """Returns the cached audio chunks for the text, or None if it isn't cached."""
+        if len(text) > self.max_text_length:
+            return None
+        key = self._key(model_name, text, settings)
+        chunks = self._entries.get(key)
+        if chunks is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return chunks
+
+    def put(
+        self, model_name: str, text: str, settings: TTSModelSettings, chunks: list[bytes]
+    ) -> None:
+        """Caches the audio chunks for the text."""
+        size = sum(len(chunk) for chunk in chunks)
+        if len(text) > self.max_text_length or size > self.max_bytes:
+            return
+        key = self._key(model_name, text, settings)
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size -= sum(len(chunk) for chunk in previous)
+        self._entries[key] = chunks
+        self._size += size
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= sum(len(chunk) for chunk in evicted)
+
+    def clear(self) -> None:
+        """Removes all cached audio."""
+        self._entries.clear()
+        self._size = 0
+
+    @staticmethod
+    def _key(model_name: str, text: str, settings: TTSModelSettings) -> _CacheKey:
+        return (model_name, text, settings.voice, settings.instructions, settings.speed)
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+
+from ..logger import logger
+from ..tracing.util import gen_group_id
+from .exceptions import VoiceServerOverloadedError
+from .input import AudioInput, StreamedAudioInput
+from .model import STTModel, TTSModel
+from .pipeline import VoicePipeline
+from .pipeline_config import VoicePipelineConfig
+from .result import StreamedAudioResult
+from .scheduler import TTSScheduler, get_default_tts_scheduler
+from .workflow import VoiceWorkflowBase
+
+
+@dataclass
+class VoiceServerMetrics:
+    """A snapshot of the state of a `VoiceServer`."""
+
+    active_sessions: int
+    """The number of sessions that are running."""
+
+    queued_sessions: int
+    """The number of sessions that are waiting to be admitted."""
+
+    completed_sessions: int
+    """The number of sessions that finished, including the ones that were cancelled."""
+
+    failed_sessions: int
+    """The number of sessions that finished with an error."""
+
+    rejected_sessions: int
+    """The number of sessions that weren't admitted, because the server was at capacity."""
+
+    tts_requests_active: int
+    """The number of TTS requests that are running, across the sessions that share the TTS
+    scheduler."""
+
+    tts_requests_queued: int
+    """The number of TTS requests that are waiting for the TTS scheduler."""
+
+    time_to_first_audio_p50: float | None
+    """The median time, in seconds, from admitting a session to its first audio, over the recent
+    sessions. None if no session produced audio yet."""
+
+    time_to_first_audio_p95: float | None
+    """The 95th percentile of the time to first audio, in seconds."""
+
+
+class VoiceServer:
+    """Hosts many concurrent voice sessions in a single process.
+
+    The STT and TTS models are resolved once, and shared by all sessions, together with their
+    client and HTTP connection pool and the TTS scheduler. Each session still runs in its own
+    `VoicePipeline`, with its own workflow, result and trace group, so sessions don't share any
+    conversation state, and an error in one session doesn't affect the others.
+
+    At most `max_sessions` sessions run at the same time. Further sessions wait to be admitted, up
+    to `max_queued_sessions` of them and for at most `admission_timeout` seconds. Beyond that,
+    `run()` raises a `VoiceServerOverloadedError`, so the caller can turn the session away early.
+    """
+
+    def __init__(
+        self,
+        *,
+        stt_model: STTModel | str | None = None,
+        tts_model: TTSModel | str | None = None,
+        config: VoicePipelineConfig | None = None,
+        max_sessions: int = 100,
+        max_queued_sessions: int = 0,
+        admission_timeout: float | None = None,
+        metrics_window: int = 1000,
+    ):
+        """Create a new voice server.
+
+        Args:
+            stt_model: The speech-to-text model to share between sessions. If not provided, or if
+                it's a model name, it's resolved with the model provider from the config.
+            tts_model: The text-to-speech model to share between sessions, resolved like
+                `stt_model`.
+            config: The pipeline configuration to use for every session. Each session gets its
+                own trace group ID.
+            max_sessions: The maximum number of sessions that can run at the same time.
+            max_queued_sessions: The maximum number of sessions that can wait to be admitted when
+                the server is at capacity.
+            admission_timeout: How long a session can wait to be admitted, in seconds. If not
+                provided, sessions wait until they're admitted.
+            metrics_window: The number of recent sessions the time to first audio is computed for.
+        """
+        self.config = config or VoicePipelineConfig()
+        self.stt_model = (
+            stt_model
+            if isinstance(stt_model, STTModel)
+            else self.config.model_provider.get_stt_model(stt_model)
+        )
+        self.tts_model = (
+            tts_model
+            if isinstance(tts_model, TTSModel)
+            else self.config.model_provider.get_tts_model(tts_model)
+        )
+        self.max_sessions = max_sessions
+        self.max_queued_sessions = max_queued_sessions
+        self.admission_timeout = admission_timeout
+
+        # Created lazily, so it belongs to the event loop the server is used in
+        self._admission: asyncio.Semaphore | None = None
+        self._active_sessions = 0
+        self._queued_sessions = 0
+        self._completed_sessions = 0
+        self._failed_sessions = 0
+        self._rejected_sessions = 0
+        self._time_to_first_audio: deque[float] = deque(maxlen=metrics_window)
+
+    @property
+    def tts_scheduler(self) -> TTSScheduler:
+        """The TTS scheduler that's shared by the sessions."""
+        return self.config.tts_scheduler or get_default_tts_scheduler()
+
+    async def run(
+        self, workflow: VoiceWorkflowBase, audio_input: AudioInput | StreamedAudioInput
+    ) -> StreamedAudioResult:
+        """Admits and runs a new session.
+
+        Args:
+            workflow: The workflow for this session. Workflows keep the conversation history, so
+                don't share them between sessions.
+            audio_input: The audio input of this session.
+
+        Returns:
+            A `StreamedAudioResult` to stream the session's events and audio from. The session
+            counts as active until it's done, or until its stream is closed.
+
+        Raises:
+            VoiceServerOverloadedError: If the server is at capacity, and the session can't wait
+                to be admitted.
+        """
+        await self._admit()
+        start = time.monotonic()
+        # Anything that stops the session from starting, including the caller being cancelled
+        # (e.g. while the input is transcribed), gives its slot back
+        try:
+            pipeline = VoicePipeline(
+                workflow=workflow,
+                stt_model=self.stt_model,
+                tts_model=self.tts_model,
+                config=dataclasses.replace(self.config, group_id=gen_group_id()),
+            )
+            result = await pipeline.run(audio_input)
+        except BaseException as e:
+            self._session_finished(None, start, failed=not isinstance(e, asyncio.CancelledError))
+            raise
+
+        task = result.text_generation_task
+        if task is None:
+            self._session_finished(result, start, failed=False)
+        else:
+            task.add_done_callback(lambda task: self._on_session_done(task, result, start))
+        return result
+
+    def metrics(self) -> VoiceServerMetrics:
+        """Returns a snapshot of the server's metrics."""
+        samples = sorted(self._time_to_first_audio)
+        scheduler = self.tts_scheduler
+        return VoiceServerMetrics(
+            active_sessions=self._active_sessions,
+            queued_sessions=self._queued_sessions,
+            completed_sessions=self._completed_sessions,
+            failed_sessions=self._failed_sessions,
+            rejected_sessions=self._rejected_sessions,
+            tts_requests_active=scheduler.active,
+            tts_requests_queued=scheduler.waiting,
+            time_to_first_audio_p50=_percentile(samples, 0.5),
+            time_to_first_audio_p95=_percentile(samples, 0.95),
+        )
+
+    async def _admit(self) -> None:
+        if self._admission is None:
+            self._admission = asyncio.Semaphore(self.max_sessions)
+
+        if self._admission.locked() and self._queued_sessions >= self.max_queued_sessions:
+            self._reject()
+
+        self._queued_sessions += 1
+        try:
+            await asyncio.wait_for(self._admission.acquire(), self.admission_timeout)
+        except asyncio.TimeoutError:
+            self._reject()
+        finally:
+            self._queued_sessions -= 1
+        self._active_sessions += 1
+
+    def _reject(self) -> None:
+        self._rejected_sessions += 1
+        raise VoiceServerOverloadedError(
+            f"Voice server is at capacity ({self._active_sessions} active sessions, "
+            f"{self._queued_sessions} queued)"
+        )
+
+    def _on_session_done(
+        self, task: asyncio.Task[Any], result: StreamedAudioResult, start: float
+    ) -> None:
+        failed = not task.cancelled() and task.exception() is not None
+        self._session_finished(result, start, failed=failed)
+
+    def _session_finished(
+        self, result: StreamedAudioResult | None, start: float, failed: bool
+    ) -> None:
+        self._active_sessions -= 1
+        if failed:
+            self._failed_sessions += 1
+        else:
+            self._completed_sessions += 1
+        if result is not None and result._first_audio_at is not None:
+            self._time_to_first_audio.append(result._first_audio_at - start)
+        if self._admission is not None:
+            self._admission.release()
+        logger.debug(f"Voice session finished, {self._active_sessions} active sessions")
+
+
+def _percentile(sorted_samples: list[float], percentile: float) -> float | None:
+    if not sorted_samples:
+        return None
+    index = min(len(sorted_samples) - 1, int(percentile * len(sorted_samples)))
+    return sorted_samples[index]
@@ -1,4 +1,8 @@
+from __future__ import annotations
+
 import re
+import time
+from collections.abc import AsyncIterator, Iterable
 from typing import Callable
 
 
@@ -35,3 +39,159 @@ def get_sentence_based_splitter(
         return "", text_buffer
 
     return sentence_based_text_splitter
+
+
+DEFAULT_ABBREVIATIONS = frozenset(
+    ["mr.", "mrs.", "ms.", "dr.", "prof.", "sr.", "jr.", "st.", "vs.", "e.g.", "i.e.", "approx."]
+)
+"""Words ending in a period that don't end a sentence."""
+
+# A sentence ends with terminal punctuation (and optionally closing quotes or brackets), followed
+# by whitespace and more text. A clause ends with a comma, semicolon or colon followed by
+# whitespace.
+_BOUNDARY_RE = re.compile(r"(?P<sentence>[.!?…]+[\"'”’)\]]*)(?=\s+\S)|(?P<clause>[,;:])(?=\s)")
+
+
+class SentenceSegmenter:
+    """Splits streamed text into segments to send to the TTS model, as the text arrives.
+
+    Only newly pushed text is scanned for sentence boundaries, so segmenting a long response is
+    linear in its length. Complete sentences are emitted together once they're at least
+    `min_sentence_length` characters long. A period after a known abbreviation (e.g. "Dr.") or an
+    initial (e.g. "J.") doesn't end a sentence.
+
+    If `max_latency_ms` is set and text has been waiting for longer than that when more text is
+    pushed, the text is emitted up to the last clause boundary (e.g. a comma), or the last word,
+    even if the sentence isn't complete yet. This reduces the time to the first audio for long
+    sentences.
+
+    ```python
+    segmenter = SentenceSegmenter()
+    for delta in deltas:
+        for segment in segmenter.push(delta):
+            speak(segment)
+    speak(segmenter.flush())
+    ```
+    """
+
+    def __init__(
+        self,
+        min_sentence_length: int = 20,
+        max_latency_ms: float | None = None,
+        abbreviations: Iterable[str] = DEFAULT_ABBREVIATIONS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            min_sentence_length: The minimum length of the text emitted at sentence boundaries.
+            max_latency_ms: If set, the maximum time text waits for a sentence boundary before it's
+                emitted at a clause or word boundary.
+            abbreviations: Lowercase words ending in a period that don't end a sentence.
+            clock: Returns the current time in seconds. Used for `max_latency_ms`.
+        """
+        self.min_sentence_length = min_sentence_length
+        self.max_latency_ms = max_latency_ms
+        self.abbreviations = frozenset(abbreviations)
+        self._clock = clock
+
+        self._buffer = ""
+        # Where to resume scanning for boundaries
+        self._scan_from = 0
+        # The ends of the last sentence and the last clause found in the buffer
+        self._sentence_end = 0
+        self._clause_end = 0
+        # When the oldest text in the buffer arrived
+        self._waiting_since: float | None = None
+
+    def push(self, text: str) -> list[str]:
+        """Add streamed text, and return the segments that are ready to be spoken."""
+        if not text:
+            return []
+        if self._waiting_since is None:
+            self._waiting_since = self._clock()
+        self._buffer += text
+
+        if self._scan() and (
+            len(self._buffer[: self._sentence_end].strip()) >= self.min_sentence_length
+        ):
+            segment = self._emit(self._sentence_end)
+        elif self._latency_exceeded():
+            segment = self._emit(max(self._sentence_end, self._clause_end) or self._last_word_end())
+        else:
+            return []
+        return [segment] if segment else []
+
+    def flush(self) -> str:
+        """Return all the remaining text, e.g. at the end of a turn, and reset the segmenter."""
+        remaining = self._buffer.strip()
+        self._buffer = ""
+        self._scan_from = self._sentence_end = self._clause_end = 0
+        self._waiting_since = None
+        return remaining
+
+    def _scan(self) -> bool:
+        """Scan the new text for boundaries. Returns whether a new sentence boundary was found."""
+        found_sentence = False
+        for match in _BOUNDARY_RE.finditer(self._buffer, self._scan_from):
+            if match.group("clause") is not None:
+                self._clause_end = match.end()
+            elif match.end() > self._sentence_end and not self._is_abbreviation(match.start()):
+                self._sentence_end = match.end()
+                found_sentence = True
+
+        # A boundary can only be confirmed by the text after it, so the last word is scanned again
+        # when more text arrives.
+        last_word_start = len(self._buffer.rstrip())
+        while last_word_start > self._scan_from and not self._buffer[last_word_start - 1].isspace():
+            last_word_start -= 1
+        self._scan_from = last_word_start
+        return found_sentence
+
+    def _is_abbreviation(self, punctuation_start: int) -> bool:
+        if self._buffer[punctuation_start] != ".":
+            return False
+        word_start = punctuation_start
+        while word_start > 0 and not self._buffer[word_start - 1].isspace():
+            word_start -= 1
+        word = self._buffer[word_start : punctuation_start + 1].lstrip("(\"'“‘")
+        if len(word) == 2 and word[0].isupper():
+            # An initial, like "J. R. R. Tolkien"
+            return True
+        return word.lower() in self.abbreviations
+
+    def _latency_exceeded(self) -> bool:
+        if self.max_latency_ms is None or self._waiting_since is None:
+            return False
+        return (self._clock() - self._waiting_since) * 1000 >= self.max_latency_ms
+
+    def _last_word_end(self) -> int:
+        # Don't cut the word that's still being streamed
+        stripped = self._buffer.rstrip()
+        end = len(stripped)
+        while end > 0 and not stripped[end - 1].isspace():
+            end -= 1
+        return end
+
+    def _emit(self, end: int) -> str:
+        segment = self._buffer[:end].strip()
+        self._buffer = self._buffer[end:]
+        # The rest of the buffer is the start of the next segment, so it's scanned again.
+        self._scan_from = self._sentence_end = self._clause_end = 0
+        self._scan()
+        self._waiting_since = self._clock() if self._buffer.strip() else None
+        return segment
+
+
+async def segment_text_stream(
+    text_stream: AsyncIterator[str], segmenter: SentenceSegmenter | None = None
+) -> AsyncIterator[str]:
+    """Segment a stream of text deltas (e.g. from `VoiceWorkflowHelper.stream_text_from()`) into
+    segments ready to be spoken, as the text arrives. The remaining text is yielded at the end.
+    """
+    segmenter = segmenter or SentenceSegmenter()
+    async for text in text_stream:
+        for segment in segmenter.push(text):
+            yield segment
+    remaining = segmenter.flush()
+    if remaining:
+        yield remaining
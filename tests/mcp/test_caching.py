@@ -1,7 +1,16 @@
 from unittest.mock import AsyncMock, patch
 
 import pytest
-from mcp.types import ListToolsResult, Tool as MCPTool
+from mcp.types import (
+    Implementation,
+    InitializeResult,
+    ListToolsResult,
+    ServerCapabilities,
+    ServerNotification,
+    Tool as MCPTool,
+    ToolListChangedNotification,
+    ToolsCapability,
+)
 
 from agents.mcp import MCPServerStdio
 
@@ -55,3 +64,45 @@ async def test_server_caching_works(
         # Without invalidating the cache, calling list_tools() again should return the cached value
         tools = await server.list_tools()
         assert tools == tools
+
+
+@pytest.mark.asyncio
+@patch("mcp.client.stdio.stdio_client", return_value=DummyStreamsContextManager())
+@patch("mcp.client.session.ClientSession.initialize", new_callable=AsyncMock)
+@patch("mcp.client.session.ClientSession.list_tools")
+async def test_server_caches_tools_when_it_sends_list_changed_notifications(
+    mock_list_tools: AsyncMock, mock_initialize: AsyncMock, mock_stdio_client
+):
+    """Test that servers that notify us of tools list changes are cached even without
+    `cache_tools_list`, and that a `tools/list_changed` notification invalidates the cache.
+    """
+    mock_initialize.return_value = InitializeResult(
+        protocolVersion="2025-03-26",
+        capabilities=ServerCapabilities(tools=ToolsCapability(listChanged=True)),
+        serverInfo=Implementation(name="server", version="1.0"),
+    )
+    mock_list_tools.return_value = ListToolsResult(tools=[MCPTool(name="tool1", inputSchema={})])
+    server = MCPServerStdio(params={"command": tee})
+
+    async with server:
+        await server.list_tools()
+        await server.list_tools()
+        assert mock_list_tools.call_count == 1
+        assert server.tools_list_version == 1
+
+        await server._handle_message(
+            ServerNotification(
+                ToolListChangedNotification(method="notifications/tools/list_changed")
+            )
+        )
+        await server.list_tools()
+        assert mock_list_tools.call_count == 2
+        # The tools didn't actually change, so the version stays the same
+        assert server.tools_list_version == 1
+
+        mock_list_tools.return_value = ListToolsResult(
+            tools=[MCPTool(name="tool2", inputSchema={})]
+        )
+        server.invalidate_tools_cache()
+        await server.list_tools()
+        assert server.tools_list_version == 2
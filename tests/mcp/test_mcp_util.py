@@ -1,14 +1,16 @@
+import asyncio
 import logging
 from typing import Any
 
 import pytest
 from inline_snapshot import snapshot
-from mcp.types import Tool as MCPTool
+from mcp.types import Tool as MCPTool, ToolAnnotations
 from pydantic import BaseModel, TypeAdapter
 
 from agents import Agent, FunctionTool, RunContextWrapper
-from agents.exceptions import AgentsException, ModelBehaviorError
+from agents.exceptions import AgentsException, ModelBehaviorError, UserError
 from agents.mcp import MCPServer, MCPUtil
+from agents.tool_cache import default_tool_result_cache
 
 from .helpers import FakeMCPServer
 
@@ -289,3 +291,162 @@ async def test_util_adds_properties():
     assert tool.params_json_schema == snapshot(
         {"type": "object", "description": "Test tool", "properties": {}}
     )
+
+
+class SlowVersionedMCPServer(FakeMCPServer):
+    """A fake server that takes a while to list tools and tracks a tools list version."""
+
+    def __init__(self, server_name: str, tool_name: str, in_flight: list[int]):
+        super().__init__()
+        self.add_tool(tool_name, {})
+        self.server_name = server_name
+        self.version = 1
+        self.in_flight = in_flight
+        self.max_in_flight = 0
+
+    async def list_tools(self):
+        self.in_flight[0] += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight[0])
+        await asyncio.sleep(0.01)
+        self.in_flight[0] -= 1
+        return self.tools
+
+    @property
+    def tools_list_version(self) -> int:
+        return self.version
+
+    @property
+    def name(self) -> str:
+        return self.server_name
+
+
+@pytest.mark.asyncio
+async def test_get_all_function_tools_lists_servers_concurrently():
+    in_flight = [0]
+    servers = [SlowVersionedMCPServer(f"server_{i}", f"tool_{i}", in_flight) for i in range(3)]
+    all_servers: list[MCPServer] = list(servers)
+
+    tools = await MCPUtil.get_all_function_tools(all_servers, convert_schemas_to_strict=False)
+
+    assert [tool.name for tool in tools] == ["tool_0", "tool_1", "tool_2"]
+    assert max(server.max_in_flight for server in servers) == 3
+
+
+@pytest.mark.asyncio
+async def test_get_all_function_tools_detects_duplicates_concurrently():
+    in_flight = [0]
+    servers: list[MCPServer] = [
+        SlowVersionedMCPServer(f"server_{i}", "same_tool", in_flight) for i in range(2)
+    ]
+
+    with pytest.raises(UserError):
+        await MCPUtil.get_all_function_tools(servers, convert_schemas_to_strict=False)
+
+
+@pytest.mark.asyncio
+async def test_function_tools_are_reused_until_tools_list_version_changes():
+    server = SlowVersionedMCPServer("server", "tool", [0])
+
+    (tool,) = await MCPUtil.get_function_tools(server, convert_schemas_to_strict=True)
+    (same_tool,) = await MCPUtil.get_function_tools(server, convert_schemas_to_strict=True)
+    assert same_tool is tool
+
+    (non_strict_tool,) = await MCPUtil.get_function_tools(server, convert_schemas_to_strict=False)
+    assert non_strict_tool is not tool
+    assert isinstance(non_strict_tool, FunctionTool)
+    assert not non_strict_tool.strict_json_schema
+
+    server.version = 2
+    (new_tool,) = await MCPUtil.get_function_tools(server, convert_schemas_to_strict=False)
+    assert new_tool is not non_strict_tool
+
+
+@pytest.mark.asyncio
+async def test_function_tools_are_not_cached_without_a_version():
+    server = FakeMCPServer()
+    server.add_tool("tool", {})
+
+    (tool,) = await MCPUtil.get_function_tools(server, convert_schemas_to_strict=False)
+    (other_tool,) = await MCPUtil.get_function_tools(server, convert_schemas_to_strict=False)
+    assert other_tool is not tool
+
+
+class CachingMCPServer(SlowVersionedMCPServer):
+    """A fake server that enables tool result caching."""
+
+    cache_tool_results = True
+
+
+def _closed_world_tool(name: str) -> MCPTool:
+    return MCPTool(
+        name=name,
+        inputSchema={},
+        annotations=ToolAnnotations(readOnlyHint=True, openWorldHint=False),
+    )
+
+
+@pytest.mark.asyncio
+async def test_read_only_closed_world_tools_are_cached():
+    default_tool_result_cache().clear()
+    server = CachingMCPServer("server", "unused", [0])
+    server.tools = [
+        MCPTool(
+            name="cached",
+            inputSchema={},
+            annotations=ToolAnnotations(readOnlyHint=True, openWorldHint=False),
+        ),
+        MCPTool(
+            name="read_only_open_world",
+            inputSchema={},
+            annotations=ToolAnnotations(readOnlyHint=True),
+        ),
+        MCPTool(name="plain", inputSchema={}),
+    ]
+
+    tools = await MCPUtil.get_function_tools(server, convert_schemas_to_strict=False)
+    ctx = RunContextWrapper(None)
+    for tool in tools:
+        assert isinstance(tool, FunctionTool)
+        for arguments in ('{"a": 1, "b": 2}', '{"b": 2, "a": 1}'):
+            await tool.on_invoke_tool(ctx, arguments)
+
+    assert server.tool_calls == [
+        "cached",
+        "read_only_open_world",
+        "read_only_open_world",
+        "plain",
+        "plain",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_tool_results_are_not_cached_unless_the_server_opts_in():
+    default_tool_result_cache().clear()
+    server = FakeMCPServer(tools=[_closed_world_tool("tool")])
+
+    (tool,) = await MCPUtil.get_function_tools(server, convert_schemas_to_strict=False)
+    assert isinstance(tool, FunctionTool)
+    for _ in range(2):
+        await tool.on_invoke_tool(RunContextWrapper(None), "{}")
+
+    assert server.tool_calls == ["tool", "tool"]
+
+
+@pytest.mark.asyncio
+async def test_cached_tool_results_are_keyed_by_server_instance_and_version():
+    default_tool_result_cache().clear()
+    # Two instances of the same server, e.g. pointed at different roots
+    servers = [CachingMCPServer("files", "read", [0]) for _ in range(2)]
+    for server in servers:
+        server.tools = [_closed_world_tool("read")]
+
+    ctx = RunContextWrapper(None)
+    for server in servers:
+        (tool,) = await MCPUtil.get_function_tools(server, convert_schemas_to_strict=False)
+        assert isinstance(tool, FunctionTool)
+        await tool.on_invoke_tool(ctx, "{}")
+        await tool.on_invoke_tool(ctx, "{}")
+        server.version += 1
+        await tool.on_invoke_tool(ctx, "{}")
+
+    assert [server.tool_calls for server in servers] == [["read", "read"], ["read", "read"]]
@@ -0,0 +1,159 @@
+import asyncio
+from typing import Any
+
+import pytest
+from mcp.types import CallToolResult
+
+from agents import UserError
+from agents.mcp import MCPServerPool
+
+from .helpers import FakeMCPServer
+
+
+class SlowFakeMCPServer(FakeMCPServer):
+    """A fake server that tracks its own lifecycle and can be slowed down or killed."""
+
+    def __init__(self, servers: list["SlowFakeMCPServer"], delay: float = 0.0):
+        super().__init__()
+        self.add_tool("test_tool", {})
+        self.delay = delay
+        self.connected = False
+        self.dead = False
+        servers.append(self)
+
+    async def connect(self):
+        self.connected = True
+
+    async def cleanup(self):
+        self.connected = False
+
+    async def list_tools(self):
+        if self.dead:
+            raise ConnectionError("dead")
+        return await super().list_tools()
+
+    async def call_tool(self, tool_name: str, arguments: dict[str, Any] | None) -> CallToolResult:
+        if self.dead:
+            raise ConnectionError("dead")
+        await asyncio.sleep(self.delay)
+        return await super().call_tool(tool_name, arguments)
+
+
+def _pool(servers: list[SlowFakeMCPServer], delay: float = 0.0, **kwargs: Any) -> MCPServerPool:
+    return MCPServerPool(
+        lambda: SlowFakeMCPServer(servers, delay=delay),
+        name="pool",
+        health_check_interval=None,
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_pool_grows_under_concurrent_calls_up_to_max_size():
+    servers: list[SlowFakeMCPServer] = []
+    pool = _pool(servers, delay=0.05, min_size=1, max_size=3)
+
+    async with pool:
+        assert pool.size == 1
+        await asyncio.gather(*(pool.call_tool("test_tool", {"i": i}) for i in range(6)))
+        assert pool.size == 3
+        assert pool.in_flight == 0
+        # The calls were spread over all the connections.
+        assert len(servers) == 3
+        assert all(server.tool_calls for server in servers)
+
+    assert not any(server.connected for server in servers)
+
+
+@pytest.mark.asyncio
+async def test_pool_reuses_idle_connections():
+    servers: list[SlowFakeMCPServer] = []
+    pool = _pool(servers, min_size=1, max_size=3)
+
+    async with pool:
+        for _ in range(3):
+            await pool.call_tool("test_tool", None)
+        assert pool.size == 1
+        assert len(servers[-1].tool_calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_pool_replaces_dead_connections():
+    servers: list[SlowFakeMCPServer] = []
+    pool = _pool(servers, min_size=2, max_size=2)
+
+    async with pool:
+        dead = [server for server in servers if server.connected][0]
+        dead.dead = True
+
+        # The call that hits the dead connection fails, but isn't retried.
+        results = await asyncio.gather(
+            *(pool.call_tool("test_tool", None) for _ in range(2)), return_exceptions=True
+        )
+        assert sum(isinstance(result, ConnectionError) for result in results) == 1
+        assert not dead.connected
+        assert pool.size == 1
+
+        await pool.check_health()
+        assert pool.size == 2
+        await pool.call_tool("test_tool", None)
+
+
+@pytest.mark.asyncio
+async def test_check_health_closes_idle_connections_down_to_min_size():
+    servers: list[SlowFakeMCPServer] = []
+    pool = _pool(servers, delay=0.01, min_size=1, max_size=3, idle_timeout=0)
+
+    async with pool:
+        await asyncio.gather(*(pool.call_tool("test_tool", None) for _ in range(3)))
+        assert pool.size == 3
+
+        await pool.check_health()
+        assert pool.size == 1
+        assert sum(server.connected for server in servers) == 1
+
+
+@pytest.mark.asyncio
+async def test_list_tools_version_changes_only_when_tools_change():
+    servers: list[SlowFakeMCPServer] = []
+    pool = _pool(servers)
+
+    async with pool:
+        await pool.list_tools()
+        version = pool.tools_list_version
+        await pool.list_tools()
+        assert pool.tools_list_version == version
+
+        servers[-1].add_tool("other_tool", {})
+        assert len(await pool.list_tools()) == 2
+        assert pool.tools_list_version != version
+
+
+@pytest.mark.asyncio
+async def test_cleanup_drains_in_flight_calls():
+    servers: list[SlowFakeMCPServer] = []
+    pool = _pool(servers, delay=0.05)
+    await pool.connect()
+
+    call = asyncio.create_task(pool.call_tool("test_tool", None))
+    await asyncio.sleep(0)
+    await pool.cleanup()
+
+    assert (await call).content
+    assert not any(server.connected for server in servers)
+    with pytest.raises(UserError):
+        await pool.call_tool("test_tool", None)
+
+
+@pytest.mark.asyncio
+async def test_pool_requires_connect():
+    pool = _pool([])
+    with pytest.raises(UserError):
+        await pool.call_tool("test_tool", None)
+
+
+def test_pool_rejects_invalid_sizes():
+    with pytest.raises(UserError):
+        _pool([], min_size=0)
+    with pytest.raises(UserError):
+        _pool([], min_size=3, max_size=2)
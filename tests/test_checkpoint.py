@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from agents import (
+    Agent,
+    CheckpointStore,
+    FileCheckpointStore,
+    MaxTurnsExceeded,
+    RunConfig,
+    Runner,
+    RunState,
+    SQLiteCheckpointStore,
+    UserError,
+    handoff,
+)
+from agents._run_impl import AgentToolUseTracker
+from agents.items import ToolCallOutputItem
+from agents.usage import Usage
+
+from .fake_model import FakeModel
+from .test_responses import (
+    get_function_tool,
+    get_function_tool_call,
+    get_handoff_tool_call,
+    get_text_message,
+)
+
+
+@pytest.fixture(params=["sqlite", "file"])
+def store(request, tmp_path: Path) -> CheckpointStore:
+    if request.param == "sqlite":
+        return SQLiteCheckpointStore(tmp_path / "checkpoints.db")
+    return FileCheckpointStore(tmp_path / "checkpoints")
+
+
+@pytest.mark.asyncio
+async def test_store_save_load_delete(store: CheckpointStore):
+    assert await store.load("run_1") is None
+
+    await store.save("run_1", "a")
+    await store.save("run_1", "b")
+    await store.save("run_2", "c")
+    assert await store.load("run_1") == "b"
+    assert sorted(await store.list_run_ids()) == ["run_1", "run_2"]
+
+    await store.delete("run_1")
+    await store.delete("run_1")
+    assert await store.load("run_1") is None
+    assert await store.list_run_ids() == ["run_2"]
+
+
+@pytest.mark.asyncio
+async def test_file_store_rejects_unsafe_run_ids(tmp_path: Path):
+    store = FileCheckpointStore(tmp_path)
+    with pytest.raises(UserError):
+        await store.save("../escape", "data")
+
+
+@pytest.mark.asyncio
+async def test_resume_continues_from_last_completed_turn(store: CheckpointStore):
+    model = FakeModel()
+    model.set_hardcoded_usage(Usage(requests=1))
+    agent = Agent(name="test", model=model, tools=[get_function_tool("foo", "x")])
+    model.add_multiple_turn_outputs(
+        [
+            [get_text_message("a_message"), get_function_tool_call("foo", json.dumps({"a": "b"}))],
+            [get_function_tool_call("foo", json.dumps({"a": "c"}))],
+            # The process "dies" while waiting for the third response.
+            ValueError("crash"),
+        ]
+    )
+    run_config = RunConfig(checkpoint_store=store, run_id="nightly")
+
+    with pytest.raises(ValueError):
+        await Runner.run(agent, input="user_message", run_config=run_config)
+
+    assert await store.list_run_ids() == ["nightly"]
+
+    # A fresh model: only the remaining turn is sent to it.
+    resumed_model = FakeModel()
+    resumed_model.set_hardcoded_usage(Usage(requests=1))
+    resumed_agent = Agent(name="test", model=resumed_model, tools=[get_function_tool("foo", "x")])
+    resumed_model.set_next_output([get_text_message("done")])
+
+    result = await Runner.resume(resumed_agent, "nightly", run_config=run_config)
+
+    assert result.final_output == "done"
+    assert result.last_agent is resumed_agent
+    assert len(result.raw_responses) == 3
+    # Original user message, 2 tool calls and their outputs, and the two text messages
+    assert len(result.to_input_list()) == 7
+    assert len(resumed_model.last_turn_args["input"]) == 6
+    assert result.context_wrapper.usage.requests == 3
+    # The checkpoint is removed once the run completes.
+    assert await store.list_run_ids() == []
+
+
+@pytest.mark.asyncio
+async def test_resume_respects_max_turns_across_the_whole_run(tmp_path: Path):
+    store = SQLiteCheckpointStore(tmp_path / "checkpoints.db")
+    model = FakeModel()
+    agent = Agent(name="test", model=model, tools=[get_function_tool("foo", "x")])
+    model.add_multiple_turn_outputs(
+        [[get_function_tool_call("foo", json.dumps({"a": "b"}))], ValueError("crash")]
+    )
+    run_config = RunConfig(checkpoint_store=store, run_id="run")
+
+    with pytest.raises(ValueError):
+        await Runner.run(agent, input="user_message", run_config=run_config)
+
+    model.set_next_output([get_function_tool_call("foo", json.dumps({"a": "b"}))])
+    with pytest.raises(MaxTurnsExceeded):
+        await Runner.resume(agent, "run", max_turns=2, run_config=run_config)
+
+
+@pytest.mark.asyncio
+async def test_resume_after_handoff_resolves_agents_by_name(tmp_path: Path):
+    store = FileCheckpointStore(tmp_path)
+    model = FakeModel()
+    agent_2 = Agent(name="agent_2", model=model)
+    agent_1 = Agent(name="agent_1", model=model, handoffs=[handoff(agent_2)])
+    model.add_multiple_turn_outputs([[get_handoff_tool_call(agent_2)], ValueError("crash")])
+    run_config = RunConfig(checkpoint_store=store, run_id="run")
+
+    with pytest.raises(ValueError):
+        await Runner.run(agent_1, input="user_message", run_config=run_config)
+
+    model.set_next_output([get_text_message("done")])
+    result = await Runner.resume(agent_1, "run", run_config=run_config)
+
+    assert result.final_output == "done"
+    assert result.last_agent is agent_2
+
+
+@pytest.mark.asyncio
+async def test_resume_unknown_run_raises(tmp_path: Path):
+    agent = Agent(name="test", model=FakeModel())
+
+    with pytest.raises(UserError):
+        await Runner.resume(agent, "missing")
+
+    with pytest.raises(UserError):
+        await Runner.resume(
+            agent,
+            "missing",
+            run_config=RunConfig(checkpoint_store=FileCheckpointStore(tmp_path)),
+        )
+
+
+@pytest.mark.asyncio
+async def test_run_without_run_id_generates_one(tmp_path: Path):
+    store = FileCheckpointStore(tmp_path)
+    model = FakeModel()
+    agent = Agent(name="test", model=model, tools=[get_function_tool("foo", "x")])
+    model.add_multiple_turn_outputs(
+        [[get_function_tool_call("foo", json.dumps({"a": "b"}))], ValueError("crash")]
+    )
+
+    with pytest.raises(ValueError):
+        await Runner.run(agent, input="user_message", run_config=RunConfig(checkpoint_store=store))
+
+    (run_id,) = await store.list_run_ids()
+    assert run_id.startswith("run_")
+
+
+def test_run_state_round_trip():
+    agent = Agent(name="test")
+    output_item = ToolCallOutputItem(
+        agent=agent,
+        raw_item={"call_id": "1", "output": "x", "type": "function_call_output"},
+        output=object(),
+    )
+    tracker = AgentToolUseTracker()
+    tracker.add_tool_use(agent, ["foo"])
+    state = RunState(
+        run_id="run",
+        current_agent=agent,
+        current_turn=3,
+        original_input="hi",
+        generated_items=[output_item],
+        model_responses=[],
+        usage=Usage(requests=3, input_tokens=10),
+        tool_use_tracker=tracker,
+    )
+
+    restored = RunState.from_json(state.to_json(), agent)
+
+    assert restored.current_agent is agent
+    assert restored.current_turn == 3
+    assert restored.usage == Usage(requests=3, input_tokens=10)
+    assert restored.tool_use_tracker.has_used_tools(agent)
+    (item,) = restored.generated_items
+    assert isinstance(item, ToolCallOutputItem)
+    assert item.to_input_item() == output_item.to_input_item()
+    # Non JSON-serializable tool outputs are restored as strings
+    assert isinstance(item.output, str)
+
+    with pytest.raises(UserError):
+        RunState.from_json(state.to_json(), Agent(name="other"))
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import copy
+import json
+import pickle
+from typing import Any
+
+import pytest
+
+from agents import (
+    Agent,
+    GuardrailFunctionOutput,
+    InputGuardrail,
+    ItemHelpers,
+    RunContextWrapper,
+    Runner,
+    TResponseInputItem,
+    function_tool,
+)
+
+from .fake_model import FakeModel
+from .test_responses import get_function_tool_call, get_text_message
+
+
+def _dataset_input() -> list[TResponseInputItem]:
+    return [
+        {
+            "role": "user",
+            "content": [{"type": "input_text", "text": "Here is the data: [1, 2, 3]"}],
+        },
+        {"role": "user", "content": "Summarize it"},
+    ]
+
+
+def test_frozen_input_is_read_only():
+    frozen = ItemHelpers.freeze_input(_dataset_input())
+    assert isinstance(frozen, list)
+    first: Any = frozen[0]
+
+    with pytest.raises(TypeError):
+        frozen.append({"role": "user", "content": "more"})
+    with pytest.raises(TypeError):
+        first["role"] = "system"
+    with pytest.raises(TypeError):
+        first["content"][0]["text"] = "tampered"
+    with pytest.raises(TypeError):
+        first.update(role="system")
+
+    assert frozen == _dataset_input()
+    assert json.loads(json.dumps(frozen)) == _dataset_input()
+
+
+def test_frozen_input_copies_and_pickles():
+    frozen = ItemHelpers.freeze_input(_dataset_input())
+
+    # Freezing frozen input is free.
+    assert ItemHelpers.freeze_input(frozen) is frozen
+
+    # Deep copies are regular, mutable containers.
+    mutable = copy.deepcopy(frozen)
+    assert type(mutable) is list and type(mutable[0]) is dict
+    mutable.append({"role": "user", "content": "more"})
+
+    unpickled = pickle.loads(pickle.dumps(frozen))
+    assert unpickled == frozen
+    with pytest.raises(TypeError):
+        unpickled.append({"role": "user", "content": "more"})
+
+
+@pytest.mark.asyncio
+async def test_caller_mutation_does_not_leak_into_the_run():
+    caller_input = _dataset_input()
+    model = FakeModel()
+
+    @function_tool
+    def mutate_caller_input() -> str:
+        # The caller changes its own input while the run is in progress.
+        caller_input.append({"role": "user", "content": "injected"})
+        message: Any = caller_input[1]
+        message["content"] = "tampered"
+        return "ok"
+
+    agent = Agent(name="test", model=model, tools=[mutate_caller_input])
+    model.add_multiple_turn_outputs(
+        [
+            [get_function_tool_call("mutate_caller_input", "{}")],
+            [get_text_message("done")],
+        ]
+    )
+
+    result = await Runner.run(agent, input=caller_input)
+
+    second_turn_input = model.last_turn_args["input"]
+    assert second_turn_input[:2] == _dataset_input()
+    assert all(item.get("content") != "injected" for item in second_turn_input)
+    assert result.input == _dataset_input()
+
+
+@pytest.mark.asyncio
+async def test_streamed_caller_mutation_does_not_leak_into_the_run():
+    caller_input = _dataset_input()
+    model = FakeModel()
+    model.set_next_output([get_text_message("done")])
+    agent = Agent(name="test", model=model)
+
+    result = Runner.run_streamed(agent, input=caller_input)
+    caller_input.clear()
+    async for _ in result.stream_events():
+        pass
+
+    assert model.last_turn_args["input"] == _dataset_input()
+    assert result.input == _dataset_input()
+
+
+@pytest.mark.asyncio
+async def test_guardrails_share_the_input_without_copying():
+    seen: list[Any] = []
+
+    def guardrail(
+        context: RunContextWrapper[Any], agent: Agent[Any], input: str | list[TResponseInputItem]
+    ) -> GuardrailFunctionOutput:
+        seen.append(input)
+        with pytest.raises(TypeError):
+            input.append({"role": "user", "content": "injected"})  # type: ignore[union-attr]
+        return GuardrailFunctionOutput(output_info=None, tripwire_triggered=False)
+
+    model = FakeModel()
+    model.set_next_output([get_text_message("done")])
+    agent = Agent(
+        name="test",
+        model=model,
+        input_guardrails=[InputGuardrail(guardrail_function=guardrail)],
+    )
+
+    result = await Runner.run(agent, input=_dataset_input())
+
+    assert seen == [result.input]
+    assert seen[0] is result.input
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("run_input", ["hello", _dataset_input()])
+async def test_streamed_guardrails_receive_a_list_of_the_shared_items(run_input):
+    seen: list[Any] = []
+
+    def guardrail(
+        context: RunContextWrapper[Any], agent: Agent[Any], input: str | list[TResponseInputItem]
+    ) -> GuardrailFunctionOutput:
+        seen.append(input)
+        return GuardrailFunctionOutput(output_info=None, tripwire_triggered=False)
+
+    model = FakeModel()
+    model.set_next_output([get_text_message("done")])
+    agent = Agent(
+        name="test",
+        model=model,
+        input_guardrails=[InputGuardrail(guardrail_function=guardrail)],
+    )
+
+    result = Runner.run_streamed(agent, input=run_input)
+    async for _ in result.stream_events():
+        pass
+
+    (guardrail_input,) = seen
+    assert guardrail_input == ItemHelpers.input_to_new_input_list(run_input)
+    if isinstance(result.input, list):
+        assert all(a is b for a, b in zip(guardrail_input, result.input))
+
+
+@pytest.mark.asyncio
+async def test_items_from_a_previous_run_are_reused():
+    model = FakeModel()
+    model.add_multiple_turn_outputs([[get_text_message("first")], [get_text_message("second")]])
+    agent = Agent(name="test", model=model)
+
+    first = await Runner.run(agent, input=_dataset_input())
+    next_input = first.to_input_list() + [{"role": "user", "content": "And now?"}]
+    second = await Runner.run(agent, input=next_input)
+
+    # The items of the original input were frozen by the first run, and are shared, not copied.
+    assert isinstance(first.input, list) and isinstance(second.input, list)
+    assert second.input[0] is first.input[0]
+    assert second.input[1] is first.input[1]
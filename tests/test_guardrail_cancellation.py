@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any
+
+import pytest
+from openai.types.responses import ResponseTextDeltaEvent
+
+from agents import (
+    Agent,
+    GuardrailFunctionOutput,
+    InputGuardrail,
+    InputGuardrailTripwireTriggered,
+    ModelResponse,
+    RunConfig,
+    RunContextWrapper,
+    Runner,
+    TResponseInputItem,
+)
+from agents.items import TResponseStreamEvent
+from agents.stream_events import RawResponsesStreamEvent
+
+from .fake_model import FakeModel
+from .test_responses import get_text_message
+
+
+class SlowModel(FakeModel):
+    """A model whose response takes a while, and that records whether it was cancelled."""
+
+    def __init__(self, delay: float = 1.0) -> None:
+        super().__init__()
+        self.delay = delay
+        self.cancelled = False
+        self.set_next_output([get_text_message("done")])
+
+    async def get_response(self, *args: Any, **kwargs: Any) -> ModelResponse:
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return await super().get_response(*args, **kwargs)
+
+    async def stream_response(
+        self, *args: Any, **kwargs: Any
+    ) -> AsyncIterator[TResponseStreamEvent]:
+        yield ResponseTextDeltaEvent(
+            content_index=0,
+            delta="partial",
+            item_id="1",
+            output_index=0,
+            type="response.output_text.delta",
+        )
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        async for event in super().stream_response(*args, **kwargs):
+            yield event
+
+
+def _guardrail(tripwire: bool, delay: float = 0.0) -> InputGuardrail[Any]:
+    async def guardrail_function(
+        context: RunContextWrapper[Any], agent: Agent[Any], input: str | list[TResponseInputItem]
+    ) -> GuardrailFunctionOutput:
+        await asyncio.sleep(delay)
+        return GuardrailFunctionOutput(output_info=None, tripwire_triggered=tripwire)
+
+    return InputGuardrail(guardrail_function=guardrail_function)
+
+
+@pytest.mark.asyncio
+async def test_tripwire_cancels_the_model_request():
+    model = SlowModel(delay=10)
+    agent = Agent(name="test", model=model, input_guardrails=[_guardrail(tripwire=True)])
+
+    with pytest.raises(InputGuardrailTripwireTriggered):
+        await asyncio.wait_for(Runner.run(agent, input="user_message"), timeout=2)
+
+    assert model.cancelled
+
+
+@pytest.mark.asyncio
+async def test_model_errors_cancel_the_guardrails():
+    guardrail_cancelled = False
+
+    async def guardrail_function(
+        context: RunContextWrapper[Any], agent: Agent[Any], input: str | list[TResponseInputItem]
+    ) -> GuardrailFunctionOutput:
+        nonlocal guardrail_cancelled
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            guardrail_cancelled = True
+            raise
+        return GuardrailFunctionOutput(output_info=None, tripwire_triggered=False)
+
+    model = FakeModel()
+    model.set_next_output(ValueError("model error"))
+    agent = Agent(
+        name="test",
+        model=model,
+        input_guardrails=[InputGuardrail(guardrail_function=guardrail_function)],
+    )
+
+    with pytest.raises(ValueError):
+        await Runner.run(agent, input="user_message")
+
+    assert guardrail_cancelled
+
+
+@pytest.mark.asyncio
+async def test_tripwire_cancels_the_model_stream():
+    model = SlowModel(delay=10)
+    agent = Agent(
+        name="test", model=model, input_guardrails=[_guardrail(tripwire=True, delay=0.01)]
+    )
+
+    result = Runner.run_streamed(agent, input="user_message")
+
+    async def consume() -> None:
+        async for _ in result.stream_events():
+            pass
+
+    with pytest.raises(InputGuardrailTripwireTriggered):
+        await asyncio.wait_for(consume(), timeout=2)
+
+    assert model.cancelled
+    assert result.is_complete
+
+
+@pytest.mark.asyncio
+async def test_gate_mode_holds_events_until_guardrails_pass():
+    model = SlowModel(delay=0)
+    agent = Agent(
+        name="test", model=model, input_guardrails=[_guardrail(tripwire=False, delay=0.05)]
+    )
+
+    result = Runner.run_streamed(
+        agent, input="user_message", run_config=RunConfig(gate_stream_on_input_guardrails=True)
+    )
+    async for _ in result.stream_events():
+        # Nothing is streamed before the guardrail has passed.
+        assert len(result.input_guardrail_results) == 1
+    assert result.final_output == "done"
+
+
+@pytest.mark.asyncio
+async def test_gate_mode_streams_nothing_when_a_guardrail_trips():
+    model = SlowModel(delay=0)
+    agent = Agent(
+        name="test", model=model, input_guardrails=[_guardrail(tripwire=True, delay=0.05)]
+    )
+
+    result = Runner.run_streamed(
+        agent, input="user_message", run_config=RunConfig(gate_stream_on_input_guardrails=True)
+    )
+    events = []
+    with pytest.raises(InputGuardrailTripwireTriggered):
+        async for event in result.stream_events():
+            events.append(event)
+
+    assert not [event for event in events if isinstance(event, RawResponsesStreamEvent)]
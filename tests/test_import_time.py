@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+import textwrap
+from typing import Any, cast
+
+# Importing `agents` on top of its required dependencies should stay cheap. This budget is several
+# times the current cost, so it only trips on real regressions (e.g. an eager import of a heavy
+# optional dependency, or work done at import time).
+IMPORT_TIME_BUDGET_SECONDS = 0.5
+
+HEAVY_MODULES = ["mcp", "griffe", "litellm", "numpy", "graphviz", "websockets"]
+
+
+def _import_agents_in_subprocess() -> dict[str, Any]:
+    script = textwrap.dedent(
+        f"""
+        import json
+        import sys
+        import threading
+        import time
+
+        # Import the required dependencies first, so we only measure the SDK's own overhead.
+        import openai
+        import pydantic
+
+        start = time.perf_counter()
+        import agents
+        elapsed = time.perf_counter() - start
+
+        from agents.tracing import processors
+
+        print(
+            json.dumps(
+                {{
+                    "elapsed": elapsed,
+                    "heavy_modules": [m for m in {HEAVY_MODULES!r} if m in sys.modules],
+                    "thread_count": threading.active_count(),
+                    "worker_thread_started": processors.default_processor()._worker_thread
+                    is not None,
+                    "exporter_client_created": processors.default_exporter()._client is not None,
+                }}
+            )
+        )
+        """
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], check=True, capture_output=True, text=True
+    ).stdout
+    return cast(dict[str, Any], json.loads(output.strip().splitlines()[-1]))
+
+
+def test_import_agents_is_fast_and_side_effect_free():
+    result = _import_agents_in_subprocess()
+
+    assert result["heavy_modules"] == []
+    assert result["thread_count"] == 1
+    assert not result["worker_thread_started"]
+    assert not result["exporter_client_created"]
+    assert result["elapsed"] < IMPORT_TIME_BUDGET_SECONDS, (
+        f"`import agents` took {result['elapsed']:.3f}s"
+    )
+
+
+def test_lazy_attributes_resolve():
+    import agents
+    from agents.mcp import MCPServerStdio, MCPUtil
+
+    assert agents.MCPServerStdio is MCPServerStdio
+    assert agents.MCPUtil is MCPUtil
+    assert agents.mcp.MCPUtil is MCPUtil
+    assert "MCPServerStdio" in dir(agents)
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import httpx
+import pytest
+
+from agents import (
+    HTTPClientConfig,
+    OpenAIChatCompletionsModel,
+    OpenAIClientPool,
+    OpenAIProvider,
+    OpenAIResponsesModel,
+)
+from agents.models.multi_provider import MultiProvider
+
+
+@dataclass(frozen=True)
+class MockTransportConfig(HTTPClientConfig):
+    """Routes all requests to an in-memory transport instead of the network."""
+
+    def create_http_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(lambda _: httpx.Response(200)))
+
+
+def test_provider_reuses_model_instances():
+    provider = OpenAIProvider(api_key="test_key")
+    model = provider.get_model("gpt-4o")
+    assert provider.get_model("gpt-4o") is model
+    assert provider.get_model("gpt-4.1") is not model
+
+
+def test_provider_model_cache_is_keyed_by_api():
+    responses_model = OpenAIProvider(api_key="test_key", use_responses=True).get_model("gpt-4o")
+    chat_model = OpenAIProvider(api_key="test_key", use_responses=False).get_model("gpt-4o")
+    assert isinstance(responses_model, OpenAIResponsesModel)
+    assert isinstance(chat_model, OpenAIChatCompletionsModel)
+
+
+def test_provider_model_cache_can_be_disabled():
+    provider = OpenAIProvider(api_key="test_key", cache_models=False)
+    assert provider.get_model("gpt-4o") is not provider.get_model("gpt-4o")
+
+
+def test_multi_provider_reuses_openai_models():
+    provider = MultiProvider(openai_api_key="test_key")
+    assert provider.get_model("gpt-4o") is provider.get_model("openai/gpt-4o")
+
+
+def test_pool_shares_clients_by_endpoint_and_credentials():
+    pool = OpenAIClientPool()
+    client = pool.get_client(base_url="https://a.example.com/v1", api_key="key_1")
+
+    assert pool.get_client(base_url="https://a.example.com/v1/", api_key="key_1") is client
+    assert pool.get_client(base_url="https://a.example.com/v1", api_key="key_2") is not client
+    assert pool.get_client(base_url="https://b.example.com/v1", api_key="key_1") is not client
+
+    stats = pool.stats()
+    assert stats.clients_created == 3
+    assert stats.client_hits == 1
+
+
+def test_providers_sharing_a_pool_share_clients():
+    pool = OpenAIClientPool()
+    provider_1 = OpenAIProvider(
+        api_key="test_key", base_url="https://a.example.com/v1", client_pool=pool
+    )
+    provider_2 = OpenAIProvider(
+        api_key="test_key", base_url="https://a.example.com/v1", client_pool=pool
+    )
+
+    model_1 = provider_1.get_model("gpt-4o")
+    model_2 = provider_2.get_model("gpt-4o")
+    assert model_1._client is model_2._client  # type: ignore
+
+
+def test_pool_uses_per_endpoint_config():
+    tuned = HTTPClientConfig(max_connections=5, keepalive_expiry=30.0)
+    pool = OpenAIClientPool(endpoint_configs={"https://a.example.com/v1/": tuned})
+
+    assert pool.get_config("https://a.example.com/v1") is tuned
+    assert pool.get_config("https://b.example.com/v1") == HTTPClientConfig()
+
+
+def test_provider_rejects_client_pool_with_explicit_client():
+    pool = OpenAIClientPool()
+    client = pool.get_client(api_key="test_key")
+    with pytest.raises(AssertionError):
+        OpenAIProvider(openai_client=client, client_pool=pool)
+
+
+@pytest.mark.asyncio
+async def test_pool_warmup_and_request_stats():
+    pool = OpenAIClientPool(default_config=MockTransportConfig())
+    pool.get_client(base_url="https://a.example.com/v1", api_key="key_1")
+    pool.get_client(base_url="https://b.example.com/v1", api_key="key_1")
+
+    await pool.warmup(connections=2)
+
+    stats = pool.stats()
+    assert sorted(endpoint.base_url or "" for endpoint in stats.endpoints) == [
+        "https://a.example.com/v1",
+        "https://b.example.com/v1",
+    ]
+    assert all(endpoint.requests == 2 for endpoint in stats.endpoints)
+
+    await pool.aclose()
+    assert pool.stats().endpoints == []
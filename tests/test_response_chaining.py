@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+
+import pytest
+from openai.types.responses import ResponseCompletedEvent
+
+from agents import Agent, HandoffInputData, RunConfig, Runner, handoff
+from agents.items import ModelResponse, TResponseStreamEvent
+
+from .fake_model import FakeModel
+from .test_responses import (
+    get_function_tool,
+    get_function_tool_call,
+    get_handoff_tool_call,
+    get_text_message,
+)
+
+
+class ChainingFakeModel(FakeModel):
+    """A fake model that returns a distinct response ID for every turn, like the Responses API, and
+    records the arguments of every turn."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.turn_args: list[dict[str, Any]] = []
+
+    async def get_response(self, *args: Any, **kwargs: Any) -> ModelResponse:
+        response = await super().get_response(*args, **kwargs)
+        self.turn_args.append(self.last_turn_args)
+        response.response_id = f"resp_{len(self.turn_args)}"
+        return response
+
+    async def stream_response(
+        self, *args: Any, **kwargs: Any
+    ) -> AsyncIterator[TResponseStreamEvent]:
+        async for event in super().stream_response(*args, **kwargs):
+            if isinstance(event, ResponseCompletedEvent):
+                self.turn_args.append(self.last_turn_args)
+                event.response.id = f"resp_{len(self.turn_args)}"
+            yield event
+
+
+def _add_tool_turns(model: ChainingFakeModel) -> None:
+    model.add_multiple_turn_outputs(
+        [
+            [get_text_message("a_message"), get_function_tool_call("foo", json.dumps({"a": "b"}))],
+            [get_function_tool_call("foo", json.dumps({"a": "c"}))],
+            [get_text_message("done")],
+        ]
+    )
+
+
+def _assert_chained(model: ChainingFakeModel) -> None:
+    first, second, third = model.turn_args
+
+    assert first["previous_response_id"] == "resp-caller"
+    assert first["input"] == [{"content": "test", "role": "user"}]
+
+    # Later turns only send the tool output, chained to the previous response
+    assert second["previous_response_id"] == "resp_1"
+    assert [item["type"] for item in second["input"]] == ["function_call_output"]
+    assert third["previous_response_id"] == "resp_2"
+    assert [item["type"] for item in third["input"]] == ["function_call_output"]
+
+
+@pytest.mark.asyncio
+async def test_auto_previous_response_id_chains_turns():
+    model = ChainingFakeModel()
+    agent = Agent(name="test", model=model, tools=[get_function_tool("foo", "tool_result")])
+    _add_tool_turns(model)
+
+    result = await Runner.run(
+        agent,
+        input="test",
+        previous_response_id="resp-caller",
+        run_config=RunConfig(auto_previous_response_id=True),
+    )
+
+    assert result.final_output == "done"
+    assert result.last_response_id == "resp_3"
+    # The run result still has the full history
+    assert len(result.to_input_list()) == 7
+    _assert_chained(model)
+
+
+@pytest.mark.asyncio
+async def test_auto_previous_response_id_chains_turns_streamed():
+    model = ChainingFakeModel()
+    agent = Agent(name="test", model=model, tools=[get_function_tool("foo", "tool_result")])
+    _add_tool_turns(model)
+
+    result = Runner.run_streamed(
+        agent,
+        input="test",
+        previous_response_id="resp-caller",
+        run_config=RunConfig(auto_previous_response_id=True),
+    )
+    async for _ in result.stream_events():
+        pass
+
+    assert result.final_output == "done"
+    _assert_chained(model)
+
+
+@pytest.mark.asyncio
+async def test_without_auto_previous_response_id_full_input_is_sent():
+    model = ChainingFakeModel()
+    agent = Agent(name="test", model=model, tools=[get_function_tool("foo", "tool_result")])
+    _add_tool_turns(model)
+
+    await Runner.run(agent, input="test", previous_response_id="resp-caller")
+
+    assert [args["previous_response_id"] for args in model.turn_args] == ["resp-caller"] * 3
+    assert [len(args["input"]) for args in model.turn_args] == [1, 4, 6]
+
+
+@pytest.mark.asyncio
+async def test_chain_falls_back_when_model_has_no_response_ids():
+    model = FakeModel()
+    agent = Agent(name="test", model=model, tools=[get_function_tool("foo", "tool_result")])
+    model.add_multiple_turn_outputs(
+        [
+            [get_function_tool_call("foo", json.dumps({"a": "b"}))],
+            [get_text_message("done")],
+        ]
+    )
+
+    await Runner.run(agent, input="test", run_config=RunConfig(auto_previous_response_id=True))
+
+    assert model.last_turn_args["previous_response_id"] is None
+    assert len(model.last_turn_args["input"]) == 3
+
+
+@pytest.mark.asyncio
+async def test_chain_falls_back_when_model_changes_on_handoff():
+    model_1 = ChainingFakeModel()
+    model_2 = ChainingFakeModel()
+    agent_2 = Agent(name="agent_2", model=model_2)
+    agent_1 = Agent(name="agent_1", model=model_1, handoffs=[agent_2])
+
+    model_1.set_next_output([get_handoff_tool_call(agent_2)])
+    model_2.set_next_output([get_text_message("done")])
+
+    await Runner.run(agent_1, input="test", run_config=RunConfig(auto_previous_response_id=True))
+
+    assert model_2.turn_args[0]["previous_response_id"] is None
+    assert len(model_2.turn_args[0]["input"]) == 3
+
+
+@pytest.mark.asyncio
+async def test_chain_continues_across_handoff_with_same_model():
+    model = ChainingFakeModel()
+    agent_2 = Agent(name="agent_2", model=model)
+    agent_1 = Agent(name="agent_1", model=model, handoffs=[agent_2])
+
+    model.add_multiple_turn_outputs([[get_handoff_tool_call(agent_2)], [get_text_message("done")]])
+
+    await Runner.run(agent_1, input="test", run_config=RunConfig(auto_previous_response_id=True))
+
+    second = model.turn_args[1]
+    assert second["previous_response_id"] == "resp_1"
+    assert [item["type"] for item in second["input"]] == ["function_call_output"]
+
+
+@pytest.mark.asyncio
+async def test_chain_falls_back_when_input_filter_rewrites_history():
+    model = ChainingFakeModel()
+    agent_2 = Agent(name="agent_2", model=model)
+
+    def drop_history(data: HandoffInputData) -> HandoffInputData:
+        return HandoffInputData(input_history=(), pre_handoff_items=(), new_items=())
+
+    agent_1 = Agent(
+        name="agent_1", model=model, handoffs=[handoff(agent_2, input_filter=drop_history)]
+    )
+
+    model.add_multiple_turn_outputs([[get_handoff_tool_call(agent_2)], [get_text_message("done")]])
+
+    await Runner.run(agent_1, input="test", run_config=RunConfig(auto_previous_response_id=True))
+
+    # The server's history can't be rewritten, so the filtered (empty) input is sent in full.
+    second = model.turn_args[1]
+    assert second["previous_response_id"] is None
+    assert second["input"] == []
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import copy
+
+import pytest
+from openai.types.responses import ResponseOutputMessage
+
+from agents import Agent, RunConfig, Runner
+from agents.items import MessageOutputItem, ModelResponse, ToolCallOutputItem
+from agents.usage import Usage
+
+from .fake_model import FakeModel
+from .test_responses import get_function_tool, get_function_tool_call, get_text_message
+
+
+def _tool_agent() -> tuple[Agent[None], FakeModel]:
+    model = FakeModel()
+    agent = Agent(name="test", model=model, tools=[get_function_tool("foo", "result")])
+    model.add_multiple_turn_outputs(
+        [
+            [get_text_message("a"), get_function_tool_call("foo", "{}")],
+            [get_text_message("b"), get_function_tool_call("foo", "{}")],
+            [get_text_message("done")],
+        ]
+    )
+    return agent, model
+
+
+def test_items_and_responses_are_slotted():
+    message = get_text_message("hi")
+    assert isinstance(message, ResponseOutputMessage)
+    item = MessageOutputItem(agent=Agent(name="test"), raw_item=message)
+    response = ModelResponse(output=[], usage=Usage(), response_id="resp_1")
+
+    for obj in (item, response):
+        assert not hasattr(obj, "__dict__")
+        with pytest.raises(AttributeError):
+            obj.unknown = 1  # type: ignore[union-attr]
+
+    assert item.type == "message_output_item"
+    assert copy.deepcopy(item).raw_item == item.raw_item
+    assert item.to_input_item()["type"] == "message"
+
+
+@pytest.mark.asyncio
+async def test_all_items_and_responses_are_retained_by_default():
+    agent, _ = _tool_agent()
+
+    result = await Runner.run(agent, input="hi")
+
+    assert len(result.raw_responses) == 3
+    assert len(result.new_items) == 7
+    assert sum(isinstance(item, ToolCallOutputItem) for item in result.new_items) == 2
+
+
+@pytest.mark.asyncio
+async def test_max_raw_responses_keeps_the_latest_responses():
+    agent, _ = _tool_agent()
+
+    result = await Runner.run(agent, input="hi", run_config=RunConfig(max_raw_responses=2))
+
+    assert [response.output[0] for response in result.raw_responses] == [
+        get_text_message("b"),
+        get_text_message("done"),
+    ]
+    assert len(result.new_items) == 7
+
+
+@pytest.mark.asyncio
+async def test_retain_final_turn_items():
+    agent, _ = _tool_agent()
+
+    result = await Runner.run(
+        agent, input="hi", run_config=RunConfig(retain_items="final_turn", max_raw_responses=1)
+    )
+
+    assert result.final_output == "done"
+    assert [item.type for item in result.new_items] == ["message_output_item"]
+    assert len(result.raw_responses) == 1
+    assert len(result.to_input_list()) == 2
+
+
+@pytest.mark.asyncio
+async def test_streamed_run_appends_in_place_and_retains_final_turn_items():
+    agent, _ = _tool_agent()
+
+    result = Runner.run_streamed(
+        agent, input="hi", run_config=RunConfig(retain_items="final_turn", max_raw_responses=2)
+    )
+    raw_responses = result.raw_responses
+    seen_items = []
+    async for event in result.stream_events():
+        if event.type == "run_item_stream_event":
+            # The items generated so far are extended in place, rather than copied every turn.
+            seen_items.append(event.item)
+
+    assert result.raw_responses is raw_responses
+    assert len(raw_responses) == 2
+    assert len(seen_items) == 7
+    assert [item.type for item in result.new_items] == ["message_output_item"]
+    assert result.final_output == "done"
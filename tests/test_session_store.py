@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import orchestrator
+from agents import Agent, ModelResponse, RunContextWrapper, Runner, RunResult, Usage
+from session_store import SessionStore
+
+
+def _store(tmp_path: Path) -> SessionStore:
+    return SessionStore(str(tmp_path / "sessions.db"))
+
+
+def test_session_persists_across_store_instances(tmp_path: Path):
+    store = _store(tmp_path)
+    session = store.create_session("s1")
+    version = session.add_dataset_version([{"a": "1"}], source="input.csv")
+    session.append_message("user", "Here is the data:", dataset_version=version)
+    session.append_message("user", "hello")
+    session.append_message("assistant", "hi")
+    session.append_report({"type": "analysis", "summary": "ok"})
+    session.set_chain_state("resp_1", 3)
+    store.close()
+
+    session = _store(tmp_path).open_session("s1")
+    assert session.message_count == 3
+    assert session.messages() == [
+        {"role": "user", "content": 'Here is the data: [{"a": "1"}]'},
+        {"role": "user", "content": "hello"},
+        {"role": "assistant", "content": "hi"},
+    ]
+    assert session.messages(after=2) == [{"role": "assistant", "content": "hi"}]
+    assert session.reports() == [{"type": "analysis", "summary": "ok"}]
+    assert session.chain_state() == ("resp_1", 3)
+
+
+def test_open_unknown_session_raises(tmp_path: Path):
+    with pytest.raises(KeyError):
+        _store(tmp_path).open_session("missing")
+
+
+def test_only_the_latest_dataset_version_is_rendered(tmp_path: Path):
+    session = _store(tmp_path).create_session()
+    v1 = session.add_dataset_version([{"a": "1"}], source="input.csv")
+    session.append_message("user", "Data:", dataset_version=v1)
+    v2 = session.add_dataset_version([{"a": "2"}], source="transform")
+    session.append_message("system", "New data:", dataset_version=v2)
+
+    assert session.latest_dataset().rows == [{"a": "2"}]  # type: ignore[union-attr]
+    assert [m["content"] for m in session.messages()] == [
+        "Data: (superseded by a later version of the data)",
+        'New data: [{"a": "2"}]',
+    ]
+
+
+def test_context_view_abbreviates_older_messages(tmp_path: Path):
+    session = _store(tmp_path).create_session()
+    version = session.add_dataset_version([{"a": "1"}], source="input.csv")
+    session.append_message("user", "Data:", dataset_version=version)
+    for i in range(10):
+        session.append_message("user", f"question {i} " + "x" * 500)
+
+    view = session.context_view(tail=3)
+
+    summary, data, *tail = view
+    assert summary["role"] == "system"
+    assert "[dataset version 1]" in summary["content"]
+    assert "question 0" in summary["content"]
+    assert "x" * 500 not in summary["content"]
+    # The latest dataset is always included, even when its message is outside the tail.
+    assert data == {"role": "user", "content": 'Data: [{"a": "1"}]'}
+    assert [m["content"].split(" ")[1] for m in tail] == ["7", "8", "9"]
+
+
+def _result(output: Any, response_id: str | None = None) -> RunResult:
+    return RunResult(
+        input="x",
+        new_items=[],
+        raw_responses=[ModelResponse(output=[], usage=Usage(), response_id=response_id)],
+        final_output=output,
+        input_guardrail_results=[],
+        output_guardrail_results=[],
+        _last_agent=Agent(name="test"),
+        context_wrapper=RunContextWrapper(context=None),
+    )
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_resumes_a_session(monkeypatch, tmp_path: Path):
+    csv_path = tmp_path / "input.csv"
+    csv_path.write_text("a,b\n1,2\n")
+    db_path = str(tmp_path / "sessions.db")
+    monkeypatch.chdir(tmp_path)
+
+    sent: list[dict[str, Any]] = []
+
+    async def fake_run(agent: Agent, input: Any, **kwargs: Any) -> RunResult:
+        sent.append({"input": input, "previous_response_id": kwargs["previous_response_id"]})
+        return _result(f"answer {len(sent)}", response_id=f"resp_{len(sent)}")
+
+    # Runner.run is called on the class, so a plain function isn't bound
+    monkeypatch.setattr(Runner, "run", fake_run)
+    monkeypatch.setattr(orchestrator, "print", lambda *args, **kwargs: None, raising=False)
+
+    inputs = iter(["first question", "quit"])
+    monkeypatch.setattr(orchestrator, "input", lambda _: next(inputs), raising=False)
+    monkeypatch.setattr(sys, "argv", ["prog", str(csv_path), "--session-db", db_path, "--chain"])
+    await orchestrator.main()
+
+    (session_id,) = SessionStore(db_path).list_sessions()
+    assert sent[0]["previous_response_id"] is None
+    assert [m["content"] for m in sent[0]["input"]] == [
+        'Here is the data we will be working with: [{"a": "1", "b": "2"}]',
+        "first question",
+    ]
+
+    # A new process resumes the session without reloading the CSV, and continues the chain.
+    inputs = iter(["second question", "quit"])
+    monkeypatch.setattr(
+        sys, "argv", ["prog", "--session-db", db_path, "--session", session_id, "--chain"]
+    )
+    await orchestrator.main()
+
+    assert sent[1] == {
+        "input": [{"role": "user", "content": "second question"}],
+        "previous_response_id": "resp_1",
+    }
+    session = SessionStore(db_path).open_session(session_id)
+    assert session.message_count == 5
+    assert session.chain_state() == ("resp_2", 5)
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any
+
+import pytest
+from openai.types.responses import ResponseCompletedEvent, ResponseTextDeltaEvent
+
+from agents import Agent, RawResponsesStreamEvent, RunConfig, Runner
+from agents._run_impl import QueueCompleteSentinel
+from agents._stream_queue import StreamEventQueue
+from agents.items import TResponseStreamEvent
+from agents.stream_events import AgentUpdatedStreamEvent
+
+from .fake_model import FakeModel, get_response_obj
+from .test_responses import get_text_message
+
+
+def _delta(text: str, item_id: str = "msg_1") -> ResponseTextDeltaEvent:
+    return ResponseTextDeltaEvent(
+        type="response.output_text.delta",
+        item_id=item_id,
+        output_index=0,
+        content_index=0,
+        delta=text,
+    )
+
+
+class DeltaStreamingModel(FakeModel):
+    """Streams the final message as one text delta per word before completing."""
+
+    def __init__(self):
+        super().__init__()
+        self.events_streamed = 0
+
+    async def stream_response(
+        self, *args: Any, **kwargs: Any
+    ) -> AsyncIterator[TResponseStreamEvent]:
+        output = self.get_next_output()
+        assert isinstance(output, list)
+        for word in ["one ", "two ", "three ", "four"]:
+            self.events_streamed += 1
+            yield _delta(word)
+        yield ResponseCompletedEvent(type="response.completed", response=get_response_obj(output))
+
+
+def _text_deltas(events: list[Any]) -> list[str]:
+    return [
+        event.data.delta
+        for event in events
+        if isinstance(event, RawResponsesStreamEvent)
+        and isinstance(event.data, ResponseTextDeltaEvent)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stream_events_filters_types():
+    model = DeltaStreamingModel()
+    model.set_next_output([get_text_message("one two three four")])
+    agent = Agent(name="test", model=model)
+
+    result = Runner.run_streamed(agent, input="hi")
+    events = [e async for e in result.stream_events(types=["run_item_stream_event"])]
+
+    assert [e.type for e in events] == ["run_item_stream_event"]
+    assert result.final_output == "one two three four"
+
+
+@pytest.mark.asyncio
+async def test_stream_events_coalesces_text_deltas():
+    model = DeltaStreamingModel()
+    model.set_next_output([get_text_message("one two three four")])
+    agent = Agent(name="test", model=model)
+
+    result = Runner.run_streamed(agent, input="hi")
+    events = [e async for e in result.stream_events(coalesce_text_ms=1000)]
+
+    # All the deltas arrive within the window, so they're merged into one event.
+    assert _text_deltas(events) == ["one two three four"]
+
+
+@pytest.mark.asyncio
+async def test_stream_events_without_coalescing_yields_every_delta():
+    model = DeltaStreamingModel()
+    model.set_next_output([get_text_message("one two three four")])
+    agent = Agent(name="test", model=model)
+
+    result = Runner.run_streamed(agent, input="hi")
+    events = [e async for e in result.stream_events()]
+
+    assert _text_deltas(events) == ["one ", "two ", "three ", "four"]
+
+
+@pytest.mark.asyncio
+async def test_bounded_queue_blocks_the_run_until_the_consumer_catches_up():
+    model = DeltaStreamingModel()
+    model.set_next_output([get_text_message("one two three four")])
+    agent = Agent(name="test", model=model)
+
+    result = Runner.run_streamed(agent, input="hi", run_config=RunConfig(stream_queue_max_size=1))
+    events = []
+    async for event in result.stream_events():
+        events.append(event)
+        if len(events) == 2:
+            # "one" was consumed and "two" is queued, so the run waits with "three" until there's
+            # room, instead of reading the rest of the model's stream.
+            await asyncio.sleep(0.05)
+            assert model.events_streamed == 3
+            assert result._event_queue.qsize() == 1
+
+    assert _text_deltas(events) == ["one ", "two ", "three ", "four"]
+    assert result.dropped_events == 0
+
+
+@pytest.mark.asyncio
+async def test_bounded_queue_drops_raw_events():
+    model = DeltaStreamingModel()
+    model.set_next_output([get_text_message("one two three four")])
+    agent = Agent(name="test", model=model)
+
+    result = Runner.run_streamed(
+        agent,
+        input="hi",
+        run_config=RunConfig(stream_queue_max_size=2, stream_backpressure="drop_oldest"),
+    )
+    # Let the run finish before consuming anything.
+    await asyncio.sleep(0.05)
+    events = [e async for e in result.stream_events()]
+
+    # The completed event pushed out all the deltas but the last, and no run items were dropped.
+    assert _text_deltas(events) == ["four"]
+    assert result.dropped_events == 3
+    assert [e.type for e in events if e.type != "raw_response_event"] == [
+        "agent_updated_stream_event",
+        "run_item_stream_event",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_queue_drop_newest_and_unbounded_events():
+    queue = StreamEventQueue(maxsize=1, backpressure="drop_newest")
+    await queue.put_raw(_delta("a"))
+    await queue.put_raw(_delta("b"))
+    queue.put_nowait(AgentUpdatedStreamEvent(new_agent=Agent(name="test")))
+    queue.put_nowait(QueueCompleteSentinel())
+
+    assert queue.dropped == 1
+    items = [await queue.get() for _ in range(3)]
+    assert isinstance(items[0], RawResponsesStreamEvent)
+    assert isinstance(items[0].data, ResponseTextDeltaEvent)
+    assert items[0].data.delta == "a"
+    assert isinstance(items[1], AgentUpdatedStreamEvent)
+    assert isinstance(items[2], QueueCompleteSentinel)
+    assert queue.empty()
+
+
+@pytest.mark.asyncio
+async def test_queue_only_coalesces_deltas_for_the_same_content_part():
+    queue = StreamEventQueue()
+    queue.subscribe(types=None, coalesce_text_ms=1000)
+    await queue.put_raw(_delta("a"))
+    await queue.put_raw(_delta("b"))
+    await queue.put_raw(_delta("c", item_id="msg_2"))
+    queue.put_nowait(QueueCompleteSentinel())
+
+    items = [await queue.get() for _ in range(3)]
+    assert _text_deltas(items) == ["ab", "c"]
+    assert isinstance(items[2], QueueCompleteSentinel)
+
+
+@pytest.mark.asyncio
+async def test_queue_releases_a_coalesced_delta_when_its_window_closes():
+    queue = StreamEventQueue()
+    queue.subscribe(types=None, coalesce_text_ms=20)
+    await queue.put_raw(_delta("a"))
+
+    item = await asyncio.wait_for(queue.get(), timeout=1)
+    assert _text_deltas([item]) == ["a"]
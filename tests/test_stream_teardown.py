@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any, Callable
+
+import pytest
+from openai import AsyncOpenAI
+
+from agents import Agent, ModelSettings, Runner
+from agents.models.interface import ModelTracing
+from agents.models.openai_chatcompletions import OpenAIChatCompletionsModel
+from agents.models.openai_responses import OpenAIResponsesModel
+
+from .testing_processor import SPAN_PROCESSOR_TESTING
+
+
+class StreamingServer:
+    """A local stand-in for the API, which streams server-sent events until the client hangs up."""
+
+    def __init__(self, make_event: Callable[[int], dict[str, Any]]) -> None:
+        self.make_event = make_event
+        self.events_sent = 0
+        self.disconnected = asyncio.Event()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        headers = await reader.readuntil(b"\r\n\r\n")
+        length = next(
+            int(line.split(b":")[1])
+            for line in headers.lower().split(b"\r\n")
+            if line.startswith(b"content-length:")
+        )
+        await reader.readexactly(length)
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream\r\n"
+            b"Transfer-Encoding: chunked\r\n\r\n"
+        )
+
+        async def wait_for_disconnect() -> None:
+            await reader.read()
+            self.disconnected.set()
+
+        watcher = asyncio.create_task(wait_for_disconnect())
+        try:
+            while not self.disconnected.is_set():
+                data = f"data: {json.dumps(self.make_event(self.events_sent))}\n\n".encode()
+                writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                await writer.drain()
+                self.events_sent += 1
+                await asyncio.sleep(0.01)
+        except ConnectionError:
+            self.disconnected.set()
+        finally:
+            watcher.cancel()
+            writer.close()
+
+
+@asynccontextmanager
+async def serve(server: StreamingServer) -> AsyncIterator[AsyncOpenAI]:
+    tcp_server = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+    port = tcp_server.sockets[0].getsockname()[1]
+    client = AsyncOpenAI(api_key="test", base_url=f"http://127.0.0.1:{port}/v1", max_retries=0)
+    try:
+        yield client
+    finally:
+        await client.close()
+        tcp_server.close()
+        await tcp_server.wait_closed()
+
+
+def _responses_delta(i: int) -> dict[str, Any]:
+    return {
+        "type": "response.output_text.delta",
+        "item_id": "msg_1",
+        "output_index": 0,
+        "content_index": 0,
+        "delta": f"token{i} ",
+        "sequence_number": i,
+    }
+
+
+def _chat_completions_chunk(i: int) -> dict[str, Any]:
+    return {
+        "id": "chatcmpl_1",
+        "object": "chat.completion.chunk",
+        "created": 0,
+        "model": "gpt-4o",
+        "choices": [{"index": 0, "delta": {"content": f"token{i} "}, "finish_reason": None}],
+    }
+
+
+async def _cancel_after_first_events(agent: Agent[Any], server: StreamingServer) -> Any:
+    result = Runner.run_streamed(agent, input="user_message")
+    raw_events = 0
+    async for event in result.stream_events():
+        if event.type == "raw_response_event":
+            raw_events += 1
+            if raw_events == 3:
+                await result.aclose()
+
+    # The server sees the client hang up right away, so generation stops.
+    await asyncio.wait_for(server.disconnected.wait(), timeout=2)
+    events_sent = server.events_sent
+    await asyncio.sleep(0.05)
+    assert server.events_sent == events_sent
+    return result
+
+
+@pytest.mark.allow_call_model_methods
+@pytest.mark.asyncio
+async def test_cancel_closes_the_responses_stream():
+    server = StreamingServer(_responses_delta)
+    async with serve(server) as client:
+        model = OpenAIResponsesModel(model="gpt-4o", openai_client=client)
+        result = await _cancel_after_first_events(Agent(name="test", model=model), server)
+
+    assert result.is_complete
+    # The request is recorded, even though the token counts never arrived.
+    assert result.context_wrapper.usage.requests == 1
+
+    spans = SPAN_PROCESSOR_TESTING.get_ordered_spans(including_empty=True)
+    (response_span,) = [span for span in spans if span.span_data.type == "response"]
+    assert response_span.ended_at is not None
+    assert response_span.error is not None
+    assert response_span.error["message"] == "Response stream cancelled"
+    assert all(span.ended_at is not None for span in spans)
+
+
+@pytest.mark.allow_call_model_methods
+@pytest.mark.asyncio
+async def test_cancel_closes_the_chat_completions_stream():
+    server = StreamingServer(_chat_completions_chunk)
+    async with serve(server) as client:
+        model = OpenAIChatCompletionsModel(model="gpt-4o", openai_client=client)
+        result = await _cancel_after_first_events(Agent(name="test", model=model), server)
+
+    assert result.context_wrapper.usage.requests == 1
+    spans = SPAN_PROCESSOR_TESTING.get_ordered_spans(including_empty=True)
+    (generation_span,) = [span for span in spans if span.span_data.type == "generation"]
+    assert generation_span.ended_at is not None
+    assert generation_span.error is not None
+    assert generation_span.error["message"] == "Response stream cancelled"
+
+
+@pytest.mark.allow_call_model_methods
+@pytest.mark.asyncio
+async def test_request_errors_reach_the_caller(monkeypatch):
+    model = OpenAIResponsesModel(model="gpt-4o", openai_client=AsyncOpenAI(api_key="test"))
+
+    async def fetch_response(*args: Any, **kwargs: Any) -> Any:
+        raise ConnectionError("API unavailable")
+
+    monkeypatch.setattr(model, "_fetch_response", fetch_response)
+
+    with pytest.raises(ConnectionError, match="API unavailable"):
+        async for _ in model.stream_response(
+            system_instructions=None,
+            input="user_message",
+            model_settings=ModelSettings(),
+            tools=[],
+            output_schema=None,
+            handoffs=[],
+            tracing=ModelTracing.DISABLED,
+            previous_response_id=None,
+        ):
+            pass
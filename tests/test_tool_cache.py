@@ -0,0 +1,228 @@
+import asyncio
+import json
+from typing import Any
+
+import pytest
+
+from agents import (
+    Agent,
+    ModelBehaviorError,
+    RunContextWrapper,
+    Runner,
+    ToolResultCache,
+    function_tool,
+)
+from agents.items import ToolCallOutputItem
+from agents.tool_cache import default_tool_result_cache
+
+from .fake_model import FakeModel
+from .test_responses import get_function_tool_call, get_text_message
+from .testing_processor import SPAN_PROCESSOR_TESTING
+
+
+def _ctx(context: Any = None) -> RunContextWrapper[Any]:
+    return RunContextWrapper(context)
+
+
+@pytest.mark.asyncio
+async def test_cache_hits_with_canonicalized_arguments():
+    calls: list[dict[str, Any]] = []
+    cache = ToolResultCache()
+
+    @function_tool(cache=cache)
+    def describe(column: str, limit: int) -> str:
+        calls.append({"column": column, "limit": limit})
+        return f"{column}:{limit}"
+
+    assert await describe.on_invoke_tool(_ctx(), '{"column": "a", "limit": 1}') == "a:1"
+    assert await describe.on_invoke_tool(_ctx(), '{"limit":1,"column":"a"}') == "a:1"
+    assert await describe.on_invoke_tool(_ctx(), '{"column": "b", "limit": 1}') == "b:1"
+
+    assert len(calls) == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+@pytest.mark.asyncio
+async def test_cache_version_is_part_of_the_key():
+    calls = 0
+
+    def dataset_version(ctx: RunContextWrapper[dict[str, int]]) -> int:
+        return ctx.context["version"]
+
+    @function_tool(cache=ToolResultCache(), cache_version=dataset_version)
+    def row_count() -> int:
+        nonlocal calls
+        calls += 1
+        return calls
+
+    context = {"version": 1}
+    assert await row_count.on_invoke_tool(_ctx(context), "") == 1
+    assert await row_count.on_invoke_tool(_ctx(context), "{}") == 1
+    context["version"] = 2
+    assert await row_count.on_invoke_tool(_ctx(context), "") == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_are_deduplicated():
+    calls = 0
+
+    @function_tool(cache=ToolResultCache())
+    async def slow_lookup(key: str) -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return key.upper()
+
+    results = await asyncio.gather(
+        *(slow_lookup.on_invoke_tool(_ctx(), json.dumps({"key": "a"})) for _ in range(5))
+    )
+
+    assert results == ["A"] * 5
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_tools_with_the_same_name_do_not_share_results():
+    default_tool_result_cache().clear()
+
+    def make_tool(prefix: str):
+        @function_tool(cache=True)
+        def describe(column: str) -> str:
+            return f"{prefix}:{column}"
+
+        return describe
+
+    first, second = make_tool("A"), make_tool("B")
+
+    assert await first.on_invoke_tool(_ctx(), '{"column": "x"}') == "A:x"
+    assert await second.on_invoke_tool(_ctx(), '{"column": "x"}') == "B:x"
+    assert await first.on_invoke_tool(_ctx(), '{"column": "x"}') == "A:x"
+
+
+@pytest.mark.asyncio
+async def test_timed_out_calls_are_cancelled_and_not_cached():
+    calls = 0
+    finished = False
+
+    @function_tool(cache=ToolResultCache(), timeout=0.01)
+    async def slow_lookup() -> str:
+        nonlocal calls, finished
+        calls += 1
+        await asyncio.sleep(0.05 if calls == 1 else 0)
+        finished = True
+        return f"result_{calls}"
+
+    model = FakeModel()
+    agent = Agent(name="test", model=model, tools=[slow_lookup])
+    model.add_multiple_turn_outputs(
+        [
+            [get_function_tool_call("slow_lookup", "")],
+            [get_function_tool_call("slow_lookup", "")],
+            [get_text_message("done")],
+        ]
+    )
+
+    result = await Runner.run(agent, input="user_message")
+
+    outputs = [item.output for item in result.new_items if isinstance(item, ToolCallOutputItem)]
+    assert "did not finish" in outputs[0]
+    # The first invocation was cancelled rather than cached, so the second call ran again
+    assert outputs[1] == "result_2"
+    await asyncio.sleep(0.1)
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelling_one_caller_keeps_the_invocation_for_the_others():
+    cache = ToolResultCache()
+    started = asyncio.Event()
+
+    async def invoke() -> str:
+        started.set()
+        await asyncio.sleep(0.01)
+        return "result"
+
+    first = asyncio.create_task(cache.get_or_invoke("key", invoke))
+    second = asyncio.create_task(cache.get_or_invoke("key", invoke))
+    await started.wait()
+    first.cancel()
+
+    assert await second == ("result", True)
+    assert cache.get("key") == (True, "result")
+
+
+@pytest.mark.asyncio
+async def test_errors_are_not_cached():
+    calls = 0
+
+    @function_tool(cache=ToolResultCache(), failure_error_function=None)
+    def flaky() -> str:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise ValueError("boom")
+        return "ok"
+
+    with pytest.raises(ValueError):
+        await flaky.on_invoke_tool(_ctx(), "")
+    assert await flaky.on_invoke_tool(_ctx(), "") == "ok"
+    assert await flaky.on_invoke_tool(_ctx(), "") == "ok"
+    assert calls == 2
+
+    # Invalid JSON bypasses the cache and fails as usual.
+    with pytest.raises(ModelBehaviorError):
+        await flaky.on_invoke_tool(_ctx(), "{not json")
+
+
+def test_cache_evicts_least_recently_used_and_expired_entries(monkeypatch):
+    now = 100.0
+    monkeypatch.setattr("agents.tool_cache.time.monotonic", lambda: now)
+    cache = ToolResultCache(max_size=2, ttl=10)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == (True, 1)
+    cache.set("c", 3)
+    assert cache.get("b") == (False, None)
+    assert cache.size == 2
+
+    now = 111.0
+    assert cache.get("a") == (False, None)
+    assert cache.get("c") == (False, None)
+    assert cache.size == 0
+
+
+def test_make_key_ignores_argument_order_and_whitespace():
+    assert ToolResultCache.make_key("t", '{"a": 1, "b": [1, 2]}') == ToolResultCache.make_key(
+        "t", '{"b":[1,2],"a":1}'
+    )
+    assert ToolResultCache.make_key("t", "") == ToolResultCache.make_key("t", "{}")
+    assert ToolResultCache.make_key("t", "{") is None
+
+
+@pytest.mark.asyncio
+async def test_cache_hits_are_marked_in_function_spans():
+    default_tool_result_cache().clear()
+
+    @function_tool(cache=True)
+    def schema() -> str:
+        return "a: int"
+
+    model = FakeModel()
+    agent = Agent(name="test", model=model, tools=[schema])
+    model.add_multiple_turn_outputs(
+        [
+            [get_function_tool_call("schema", "")],
+            [get_function_tool_call("schema", "{}")],
+            [get_text_message("done")],
+        ]
+    )
+
+    await Runner.run(agent, input="user_message")
+
+    function_spans = [
+        span.span_data.export()
+        for span in SPAN_PROCESSOR_TESTING.get_ordered_spans()
+        if span.span_data.type == "function"
+    ]
+    assert [data.get("cache_hit", False) for data in function_spans] == [False, True]
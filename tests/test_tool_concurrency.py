@@ -0,0 +1,188 @@
+import asyncio
+import json
+from typing import Any
+
+import pytest
+
+from agents import Agent, RunConfig, Runner, function_tool
+from agents.items import ToolCallOutputItem
+from agents.stream_events import RunItemStreamEvent
+
+from .fake_model import FakeModel
+from .test_responses import get_function_tool_call, get_text_message
+
+
+class InFlightTracker:
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def run(self, delay: float) -> None:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            self.in_flight -= 1
+
+
+def _tool_outputs(items: list[Any]) -> list[Any]:
+    return [item.output for item in items if isinstance(item, ToolCallOutputItem)]
+
+
+@pytest.mark.asyncio
+async def test_slow_tools_time_out_without_failing_the_run():
+    @function_tool(timeout=0.01)
+    async def slow() -> str:
+        await asyncio.sleep(10)
+        return "never"
+
+    @function_tool
+    async def fast() -> str:
+        return "fast_result"
+
+    model = FakeModel()
+    agent = Agent(name="test", model=model, tools=[slow, fast])
+    model.add_multiple_turn_outputs(
+        [
+            [get_function_tool_call("slow", ""), get_function_tool_call("fast", "")],
+            [get_text_message("done")],
+        ]
+    )
+
+    result = await Runner.run(agent, input="user_message")
+
+    assert result.final_output == "done"
+    timeout_message, fast_output = _tool_outputs(result.new_items)
+    assert "did not finish within 0.01 seconds" in timeout_message
+    assert fast_output == "fast_result"
+
+
+@pytest.mark.asyncio
+async def test_run_config_tool_timeout_is_the_default():
+    @function_tool
+    async def slow() -> str:
+        await asyncio.sleep(10)
+        return "never"
+
+    @function_tool(timeout=5)
+    async def slowish() -> str:
+        await asyncio.sleep(0.05)
+        return "slowish_result"
+
+    model = FakeModel()
+    agent = Agent(name="test", model=model, tools=[slow, slowish])
+    model.add_multiple_turn_outputs(
+        [
+            [get_function_tool_call("slow", ""), get_function_tool_call("slowish", "")],
+            [get_text_message("done")],
+        ]
+    )
+
+    result = await Runner.run(agent, input="user_message", run_config=RunConfig(tool_timeout=0.01))
+
+    timeout_message, slowish_output = _tool_outputs(result.new_items)
+    assert "did not finish" in timeout_message
+    assert slowish_output == "slowish_result"
+
+
+@pytest.mark.asyncio
+async def test_run_concurrency_limit():
+    tracker = InFlightTracker()
+
+    @function_tool
+    async def work(i: int) -> int:
+        await tracker.run(0.01)
+        return i
+
+    model = FakeModel()
+    agent = Agent(name="test", model=model, tools=[work])
+    model.add_multiple_turn_outputs(
+        [
+            [get_function_tool_call("work", json.dumps({"i": i})) for i in range(4)],
+            [get_text_message("done")],
+        ]
+    )
+
+    result = await Runner.run(
+        agent, input="user_message", run_config=RunConfig(max_concurrent_tool_calls=1)
+    )
+
+    assert tracker.max_in_flight == 1
+    # Outputs stay in the order of the calls.
+    assert _tool_outputs(result.new_items) == [0, 1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_per_tool_concurrency_limit():
+    limited_tracker = InFlightTracker()
+    other_tracker = InFlightTracker()
+
+    @function_tool(max_concurrency=2)
+    async def limited() -> str:
+        await limited_tracker.run(0.01)
+        return "limited"
+
+    @function_tool
+    async def other() -> str:
+        await other_tracker.run(0.01)
+        return "other"
+
+    model = FakeModel()
+    agent = Agent(name="test", model=model, tools=[limited, other])
+    model.add_multiple_turn_outputs(
+        [
+            [get_function_tool_call("limited", "") for _ in range(4)]
+            + [get_function_tool_call("other", "") for _ in range(3)],
+            [get_text_message("done")],
+        ]
+    )
+
+    await Runner.run(agent, input="user_message")
+
+    assert limited_tracker.max_in_flight == 2
+    assert other_tracker.max_in_flight == 3
+
+
+@pytest.mark.asyncio
+async def test_tool_outputs_are_streamed_as_each_tool_completes():
+    release_slow = asyncio.Event()
+
+    @function_tool
+    async def slow() -> str:
+        await release_slow.wait()
+        return "slow_result"
+
+    @function_tool
+    async def fast() -> str:
+        return "fast_result"
+
+    model = FakeModel()
+    agent = Agent(name="test", model=model, tools=[slow, fast])
+    model.add_multiple_turn_outputs(
+        [
+            [get_function_tool_call("slow", ""), get_function_tool_call("fast", "")],
+            [get_text_message("done")],
+        ]
+    )
+
+    result = Runner.run_streamed(agent, input="user_message")
+    events: list[tuple[str, Any]] = []
+    async for event in result.stream_events():
+        if not isinstance(event, RunItemStreamEvent):
+            continue
+        output = event.item.output if isinstance(event.item, ToolCallOutputItem) else None
+        events.append((event.name, output))
+        if output == "fast_result":
+            # The slow tool is still running when the fast tool's output arrives.
+            release_slow.set()
+
+    assert events == [
+        ("tool_called", None),
+        ("tool_called", None),
+        ("tool_output", "fast_result"),
+        ("tool_output", "slow_result"),
+        ("message_output_created", None),
+    ]
+    # The items of the turn keep the order of the calls.
+    assert _tool_outputs(result.new_items) == ["slow_result", "fast_result"]
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from agents.tracing.analysis import TraceAnalyzer, analyze_trace
+from agents.tracing.file_exporter import FileSpanExporter
+from agents.tracing.file_reader import main
+from agents.tracing.span_data import AgentSpanData, FunctionSpanData, ResponseSpanData
+from agents.tracing.spans import SpanImpl
+
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def span(
+    span_id: str,
+    parent_id: str | None,
+    start: float,
+    end: float,
+    span_data: dict[str, Any],
+    trace_id: str = "trace_1",
+    error: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    return {
+        "object": "trace.span",
+        "id": span_id,
+        "trace_id": trace_id,
+        "parent_id": parent_id,
+        "started_at": (START + timedelta(seconds=start)).isoformat(),
+        "ended_at": (START + timedelta(seconds=end)).isoformat(),
+        "span_data": span_data,
+        "error": error,
+    }
+
+
+def agent_run(trace_id: str = "trace_1", scale: float = 1.0) -> list[dict[str, Any]]:
+    """An agent that calls the model, runs two tools in parallel, and calls the model again."""
+    return [
+        {"object": "trace", "id": trace_id, "workflow_name": "Support"},
+        span("agent", None, 0, 10 * scale, {"type": "agent", "name": "Triage"}, trace_id),
+        span("response_1", "agent", 0, 2 * scale, {"type": "response"}, trace_id),
+        span(
+            "tool_1",
+            "agent",
+            2 * scale,
+            6 * scale,
+            {"type": "function", "name": "search"},
+            trace_id,
+        ),
+        span(
+            "tool_2", "agent", 2 * scale, 8 * scale, {"type": "function", "name": "fetch"}, trace_id
+        ),
+        span("response_2", "agent", 8 * scale, 10 * scale, {"type": "response"}, trace_id),
+    ]
+
+
+def test_critical_path_self_time_and_parallelism():
+    summary = analyze_trace(agent_run())
+
+    assert summary.trace_id == "trace_1"
+    assert summary.workflow_name == "Support"
+    assert summary.duration == pytest.approx(10)
+    assert summary.span_count == 5
+    # 2s + 4s + 6s + 2s of work in 10s
+    assert summary.parallelism == pytest.approx(1.4)
+    assert [(entry.span_id, entry.label) for entry in summary.critical_path] == [
+        ("agent", "agent:Triage"),
+        ("response_1", "response"),
+        ("tool_2", "function:fetch"),
+        ("response_2", "response"),
+    ]
+    assert [entry.time for entry in summary.critical_path] == pytest.approx([0, 2, 6, 2])
+
+
+def test_gaps_between_children_are_the_parents_own_time():
+    items = [
+        span("agent", None, 0, 5, {"type": "agent", "name": "Triage"}),
+        span("guardrail", "agent", 0, 1, {"type": "guardrail", "name": "no_pii"}),
+        span("handoff", "agent", 3, 4, {"type": "handoff", "from_agent": "A", "to_agent": "B"}),
+        span("tools", "agent", 4, 5, {"type": "mcp_tools", "server": "files"}),
+        # Spans without a known parent are roots
+        span("orphan", "missing", 5, 6, {"type": "custom", "name": "cleanup"}),
+    ]
+
+    summary = analyze_trace(items)
+
+    assert summary.duration == pytest.approx(6)
+    assert summary.parallelism == pytest.approx(1.0)
+    assert [(entry.label, round(entry.time, 6)) for entry in summary.critical_path] == [
+        ("agent:Triage", 2),
+        ("guardrail:no_pii", 1),
+        ("handoff:A -> B", 1),
+        ("mcp_tools:files", 1),
+        ("custom:cleanup", 1),
+    ]
+
+
+def test_analyzer_aggregates_traces_into_a_stable_report():
+    analyzer = TraceAnalyzer(slowest_traces=2)
+    for i, scale in enumerate([1.0, 2.0, 0.5, 1.5]):
+        analyzer.add_trace(agent_run(f"trace_{i}", scale))
+    analyzer.add_trace(
+        [
+            span(
+                "agent",
+                None,
+                0,
+                1,
+                {"type": "agent", "name": "Triage"},
+                "trace_4",
+                {"message": "x"},
+            )
+        ]
+    )
+
+    report = analyzer.report()
+
+    assert report.trace_count == 5
+    assert report.span_count == 21
+    assert list(report.spans) == ["agent:Triage", "function:fetch", "function:search", "response"]
+    agent = report.spans["agent:Triage"]
+    assert (agent.count, agent.errors) == (5, 1)
+    assert agent.total_time == pytest.approx(51)
+    assert agent.self_time == pytest.approx(1)
+    fetch = report.spans["function:fetch"]
+    assert fetch.critical_path_time == pytest.approx(30)
+    assert fetch.max == pytest.approx(12)
+    assert fetch.p50 == pytest.approx(6, rel=0.02)
+    assert report.spans["response"].count == 8
+    assert report.duration_p50 == pytest.approx(10, rel=0.02)
+    assert [summary.trace_id for summary in report.slowest_traces] == ["trace_1", "trace_3"]
+
+    data = json.loads(report.to_json())
+    assert data["spans"]["function:fetch"]["max"] == 12.0
+    assert data == report.to_dict()
+
+
+def test_cli_analyzes_exported_traces(tmp_path, capsys):
+    exporter = FileSpanExporter(tmp_path)
+    items: list[Any] = []
+    for span_id, parent_id, span_data in [
+        ("agent", None, AgentSpanData(name="Triage")),
+        ("response", "agent", ResponseSpanData()),
+        ("tool", "agent", FunctionSpanData(name="search", input="", output="")),
+    ]:
+        item: SpanImpl[Any] = SpanImpl(
+            trace_id="trace_1",
+            span_id=span_id,
+            parent_id=parent_id,
+            processor=MagicMock(),
+            span_data=span_data,
+        )
+        item.start()
+        item.finish()
+        items.append(item)
+    exporter.export(items)
+    exporter.close()
+
+    main([str(tmp_path), "analyze"])
+
+    report = json.loads(capsys.readouterr().out)
+    assert report["trace_count"] == 1
+    assert sorted(report["spans"]) == ["agent:Triage", "function:search", "response"]
+    assert report["slowest_traces"][0]["trace_id"] == "trace_1"
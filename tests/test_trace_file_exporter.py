@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import gzip
+import json
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from agents.tracing.file_exporter import FileSpanExporter
+from agents.tracing.file_reader import TraceFileReader, main
+from agents.tracing.span_data import AgentSpanData, FunctionSpanData
+from agents.tracing.spans import Span, SpanImpl
+from agents.tracing.traces import Trace, TraceImpl
+
+
+def make_trace(trace_id: str) -> TraceImpl:
+    return TraceImpl(
+        name=f"workflow_{trace_id}",
+        trace_id=trace_id,
+        group_id=None,
+        metadata=None,
+        processor=MagicMock(),
+    )
+
+
+def make_span(trace_id: str, span_id: str, parent_id: str | None = None) -> SpanImpl[Any]:
+    span: SpanImpl[Any] = SpanImpl(
+        trace_id=trace_id,
+        span_id=span_id,
+        parent_id=parent_id,
+        processor=MagicMock(),
+        span_data=AgentSpanData(name=span_id)
+        if parent_id is None
+        else FunctionSpanData(name=span_id, input="{}", output="ok"),
+    )
+    span.start()
+    span.finish()
+    return span
+
+
+def make_batch(*trace_ids: str) -> list[Trace | Span[Any]]:
+    items: list[Trace | Span[Any]] = []
+    for trace_id in trace_ids:
+        items.append(make_trace(trace_id))
+        items.append(make_span(trace_id, f"{trace_id}_agent"))
+        items.append(make_span(trace_id, f"{trace_id}_tool", parent_id=f"{trace_id}_agent"))
+    return items
+
+
+@pytest.mark.parametrize("compression", [None, "gzip"])
+def test_exported_traces_are_loaded_by_id(tmp_path, compression):
+    exporter = FileSpanExporter(tmp_path, compression=compression)
+    exporter.export(make_batch("trace_1", "trace_2"))
+    # The spans of a trace can be spread over several batches
+    exporter.export([make_span("trace_1", "trace_1_late")])
+    exporter.close()
+
+    with TraceFileReader(tmp_path) as reader:
+        assert reader.trace_ids() == ["trace_1", "trace_2"]
+        items = reader.load_trace("trace_1")
+        assert [item["id"] for item in items] == [
+            "trace_1",
+            "trace_1_agent",
+            "trace_1_tool",
+            "trace_1_late",
+        ]
+        assert items[0]["workflow_name"] == "workflow_trace_1"
+        assert items[2]["parent_id"] == "trace_1_agent"
+        assert items[2]["span_data"]["output"] == "ok"
+        assert reader.load_trace("missing") == []
+
+
+def test_gzip_files_can_be_decompressed_as_a_whole(tmp_path):
+    exporter = FileSpanExporter(tmp_path, compression="gzip")
+    exporter.export(make_batch("trace_1", "trace_2"))
+    exporter.close()
+
+    [path] = TraceFileReader(tmp_path).files()
+    assert path.name.endswith(".jsonl.gz")
+    lines = gzip.decompress(path.read_bytes()).splitlines()
+    assert [json.loads(line)["id"] for line in lines][::3] == ["trace_1", "trace_2"]
+
+
+def test_files_are_rotated_by_size(tmp_path):
+    exporter = FileSpanExporter(tmp_path, max_bytes=1)
+    for i in range(3):
+        exporter.export(make_batch(f"trace_{i}"))
+    exporter.close()
+
+    reader = TraceFileReader(tmp_path)
+    assert len(reader.files()) == 3
+    assert reader.trace_ids() == ["trace_0", "trace_1", "trace_2"]
+    assert len(reader.load_trace("trace_2")) == 3
+
+
+def test_files_are_rotated_by_age(tmp_path):
+    exporter = FileSpanExporter(tmp_path, max_age=0)
+    exporter.export(make_batch("trace_1"))
+    first = exporter.current_path
+    exporter.export(make_batch("trace_2"))
+
+    assert exporter.current_path != first
+    exporter.close()
+
+
+def test_reader_only_reads_files_with_its_prefix(tmp_path):
+    for prefix, trace_id in [("traces", "trace_1"), ("traces-eu", "trace_2")]:
+        exporter = FileSpanExporter(tmp_path, prefix=prefix, compression="gzip")
+        exporter.export(make_batch(trace_id))
+        exporter.close()
+
+    with TraceFileReader(tmp_path) as reader:
+        assert len(reader.files()) == 1
+        assert reader.trace_ids() == ["trace_1"]
+    with TraceFileReader(tmp_path, prefix="traces-eu") as reader:
+        assert reader.trace_ids() == ["trace_2"]
+
+
+def test_reader_picks_up_new_items_on_refresh(tmp_path):
+    exporter = FileSpanExporter(tmp_path)
+    exporter.export(make_batch("trace_1"))
+
+    reader = TraceFileReader(tmp_path)
+    assert len(reader.load_trace("trace_1")) == 3
+
+    exporter.export([make_span("trace_1", "trace_1_late")])
+    assert exporter.current_path is not None
+    with open(f"{exporter.current_path}.idx", "ab") as index_file:
+        # A line that's still being written
+        index_file.write(b"trace_2\t0")
+    reader.refresh()
+
+    assert len(reader.load_trace("trace_1")) == 4
+    assert reader.trace_ids() == ["trace_1"]
+    reader.close()
+    exporter.close()
+
+
+def test_zstd_compression(tmp_path):
+    pytest.importorskip("zstandard")
+    exporter = FileSpanExporter(tmp_path, compression="zstd")
+    exporter.export(make_batch("trace_1"))
+    exporter.close()
+
+    with TraceFileReader(tmp_path) as reader:
+        assert len(reader.load_trace("trace_1")) == 3
+
+
+def test_write_errors_are_not_raised(tmp_path):
+    path = tmp_path / "not_a_directory"
+    path.write_text("")
+    exporter = FileSpanExporter(path)
+
+    exporter.export(make_batch("trace_1"))
+
+    assert exporter.current_path is None
+
+
+def test_cli_lists_and_shows_traces(tmp_path, capsys):
+    exporter = FileSpanExporter(tmp_path)
+    exporter.export(make_batch("trace_1", "trace_2"))
+    exporter.close()
+
+    main([str(tmp_path), "list"])
+    assert capsys.readouterr().out.split() == ["trace_1", "trace_2"]
+
+    main([str(tmp_path), "show", "trace_2"])
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [
+        "trace_2",
+        "trace_2_agent",
+        "trace_2_tool",
+    ]
+
+    with pytest.raises(SystemExit):
+        main([str(tmp_path), "show", "missing"])
@@ -269,8 +269,31 @@ def test_backend_span_exporter_request_error(mock_client, patched_time_sleep):
 
 @patch("httpx.Client")
 def test_backend_span_exporter_close(mock_client):
+    mock_client.return_value.post.return_value.status_code = 200
+
     exporter = BackendSpanExporter(api_key="test_key")
+    exporter.export([get_span(mock_processor())])
     exporter.close()
 
     # Ensure underlying http client is closed
     mock_client.return_value.close.assert_called_once()
+
+
+@patch("httpx.Client")
+def test_backend_span_exporter_creates_client_lazily(mock_client):
+    exporter = BackendSpanExporter(api_key="test_key")
+    exporter.close()
+
+    # No client should be created until there is something to export
+    mock_client.assert_not_called()
+
+
+def test_batch_trace_processor_starts_thread_lazily(mocked_exporter):
+    processor = BatchTraceProcessor(exporter=mocked_exporter, schedule_delay=0.1)
+    assert processor._worker_thread is None
+
+    processor.on_span_end(get_span(processor))
+    assert processor._worker_thread is not None
+
+    processor.shutdown()
+    assert mocked_exporter.export.call_count >= 1
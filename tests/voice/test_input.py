@@ -2,11 +2,12 @@ import io
 import wave
 
 import numpy as np
+import numpy.typing as npt
 import pytest
 
 try:
     from agents import UserError
-    from agents.voice import AudioInput, StreamedAudioInput
+    from agents.voice import AudioInput, StreamedAudioInput, VADSettings, VoiceActivityDetector
     from agents.voice.input import DEFAULT_SAMPLE_RATE, _buffer_to_audio_file
 except ImportError:
     pass
@@ -125,3 +126,76 @@ class TestStreamedAudioInput:
         # Test blocking get
         assert np.array_equal(await streamed_input.queue.get(), audio2)
         assert streamed_input.queue.empty()
+
+
+def _tone(seconds: float) -> npt.NDArray[np.int16]:
+    t = np.arange(int(DEFAULT_SAMPLE_RATE * seconds)) / DEFAULT_SAMPLE_RATE
+    return (np.sin(2 * np.pi * 440 * t) * 0.3 * 32767).astype(np.int16)
+
+
+def _silence(seconds: float) -> npt.NDArray[np.int16]:
+    return np.zeros(int(DEFAULT_SAMPLE_RATE * seconds), dtype=np.int16)
+
+
+def _speech_with_pauses() -> npt.NDArray[np.int16]:
+    return np.concatenate((_silence(1), _tone(0.5), _silence(2), _tone(0.5), _silence(1)))
+
+
+class TestVoiceActivityDetector:
+    def test_trim_silence_keeps_speech_with_padding_and_hangover(self):
+        audio_input = AudioInput(buffer=_speech_with_pauses())
+
+        trimmed = audio_input.trim_silence()
+
+        # 100ms of padding before and 600ms of hangover after each tone, the rest is dropped.
+        expected = np.concatenate(
+            (
+                _silence(0.1),
+                _tone(0.5),
+                _silence(0.6),
+                _silence(0.1),
+                _tone(0.5),
+                _silence(0.6),
+            )
+        )
+        assert trimmed.buffer.dtype == np.int16
+        assert np.array_equal(trimmed.buffer, expected)
+        assert trimmed.frame_rate == audio_input.frame_rate
+        assert np.array_equal(audio_input.buffer, _speech_with_pauses())
+
+    def test_streamed_audio_gives_the_same_result(self):
+        audio = _speech_with_pauses()
+        expected = AudioInput(buffer=audio).trim_silence().buffer
+
+        detector = VoiceActivityDetector()
+        rng = np.random.default_rng(0)
+        kept: list[npt.NDArray[np.int16]] = []
+        start = 0
+        while start < len(audio):
+            end = start + int(rng.integers(1, 3000))
+            kept.append(detector.process(audio[start:end]).reshape(-1))
+            start = end
+        kept.append(detector.flush())
+
+        assert np.array_equal(np.concatenate(kept), expected)
+
+    def test_quiet_noisy_frames_count_as_speech(self):
+        rng = np.random.default_rng(0)
+        frame = 480
+        # Quiet, but with a high zero-crossing rate, like an "s"
+        hiss = (rng.standard_normal(frame) * 0.007 * 32767).astype(np.int16)
+        # Even quieter background noise
+        noise = (rng.standard_normal(frame) * 0.002 * 32767).astype(np.int16)
+        settings = VADSettings(hangover_ms=0, padding_ms=0)
+
+        assert len(VoiceActivityDetector(settings).process(hiss)) == 1
+        assert len(VoiceActivityDetector(settings).process(noise)) == 0
+
+    def test_float32_and_multichannel_input(self):
+        mono = _speech_with_pauses()
+        stereo = (np.stack((mono, mono), axis=1) / 32767).astype(np.float32)
+
+        trimmed = AudioInput(buffer=stereo, channels=2).trim_silence()
+
+        assert trimmed.buffer.dtype == np.int16
+        assert trimmed.buffer.shape == (int(2.4 * DEFAULT_SAMPLE_RATE), 2)
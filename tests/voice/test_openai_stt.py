@@ -1,6 +1,7 @@
 # test_openai_stt_transcription_session.py
 
 import asyncio
+import base64
 import json
 import time
 from unittest.mock import AsyncMock, patch
@@ -9,7 +10,14 @@ import numpy as np
 import pytest
 
 try:
-    from agents.voice import OpenAISTTTranscriptionSession, StreamedAudioInput, STTModelSettings
+    from agents.voice import (
+        AudioInput,
+        OpenAISTTModel,
+        OpenAISTTTranscriptionSession,
+        StreamedAudioInput,
+        STTModelSettings,
+        VADSettings,
+    )
     from agents.voice.exceptions import STTWebsocketConnectionError
     from agents.voice.models.openai_stt import EVENT_INACTIVITY_TIMEOUT
 
@@ -365,3 +373,90 @@ async def test_inactivity_timeout():
         assert len(collected_turns) == 0, "No transcripts expected, but we got something?"
 
         await session.close()
+
+
+@pytest.mark.asyncio
+async def test_stream_audio_drops_silence_and_sends_fixed_size_chunks():
+    """With VAD settings, silence isn't sent, and the speech is sent in chunks of `chunk_ms`."""
+    audio_input = StreamedAudioInput()
+    session = OpenAISTTTranscriptionSession(
+        input=audio_input,
+        client=AsyncMock(api_key="FAKE_KEY"),
+        model="whisper-1",
+        settings=STTModelSettings(vad=VADSettings(chunk_ms=100)),
+        trace_include_sensitive_data=False,
+        trace_include_sensitive_audio_data=False,
+    )
+    mock_ws = AsyncMock()
+    session._websocket = mock_ws
+
+    t = np.arange(12000) / 24000
+    tone = (np.sin(2 * np.pi * 440 * t) * 10000).astype(np.int16)
+    silence = np.zeros(24000, dtype=np.int16)
+    for audio in (silence, tone[:7000], tone[7000:], silence, silence):
+        await audio_input.add_audio(audio)
+    await audio_input.queue.put(None)  # type: ignore[arg-type]
+
+    await session._stream_audio(audio_input.queue)
+
+    sent = [json.loads(call.args[0]) for call in mock_ws.send.call_args_list]
+    assert all(message["type"] == "input_audio_buffer.append" for message in sent)
+    chunks = [np.frombuffer(base64.b64decode(message["audio"]), np.int16) for message in sent]
+    # 100ms of padding, 500ms of speech and 600ms of hangover, in chunks of 100ms
+    assert [len(chunk) for chunk in chunks] == [2400] * 12
+    assert np.array_equal(np.concatenate(chunks)[2400:14400], tone)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("trace_audio", [True, False])
+async def test_stream_audio_keeps_a_bounded_amount_of_audio_for_tracing(trace_audio):
+    """Only the last `trace_audio_max_seconds` of audio are kept, and only if it's traced."""
+    audio_input = StreamedAudioInput()
+    session = OpenAISTTTranscriptionSession(
+        input=audio_input,
+        client=AsyncMock(api_key="FAKE_KEY"),
+        model="whisper-1",
+        settings=STTModelSettings(trace_audio_max_seconds=0.5),
+        trace_include_sensitive_data=False,
+        trace_include_sensitive_audio_data=trace_audio,
+    )
+    sent: list[str] = []
+
+    class FakeWebsocket:
+        async def send(self, message: str) -> None:
+            sent.append(message)
+
+    session._websocket = FakeWebsocket()  # type: ignore[assignment]
+
+    audio = np.arange(72000, dtype=np.int16)
+    for chunk in np.split(audio, 6):
+        await audio_input.add_audio(chunk)
+    await audio_input.queue.put(None)  # type: ignore[arg-type]
+
+    await session._stream_audio(audio_input.queue)
+
+    assert len(sent) == 6
+    if not trace_audio:
+        assert session._turn_audio_buffer is None
+        return
+    assert session._turn_audio_buffer is not None
+    assert len(session._turn_audio_buffer._buffer) == 12000
+    kept = np.frombuffer(base64.b64decode(session._turn_audio_buffer.to_base64()), np.int16)
+    assert np.array_equal(kept, audio[-12000:])
+
+
+@pytest.mark.asyncio
+async def test_transcribe_skips_the_request_for_silence():
+    client = AsyncMock()
+    client.audio.transcriptions.create.return_value.text = "hello"
+    model = OpenAISTTModel("whisper-1", client)
+    settings = STTModelSettings(vad=VADSettings())
+
+    silence = AudioInput(buffer=np.zeros(24000, dtype=np.int16))
+    assert await model.transcribe(silence, settings, False, False) == ""
+    client.audio.transcriptions.create.assert_not_called()
+
+    tone = (np.sin(np.arange(24000) / 5) * 10000).astype(np.int16)
+    speech = AudioInput(buffer=np.concatenate([silence.buffer, tone]))
+    assert await model.transcribe(speech, settings, False, False) == "hello"
+    client.audio.transcriptions.create.assert_called_once()
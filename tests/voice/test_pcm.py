@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import base64
+
+import numpy as np
+import pytest
+
+try:
+    from agents import UserError
+    from agents.voice._pcm import PCMAccumulator, PCMRingBuffer, _b64encode_parts
+except ImportError:
+    pass
+
+
+def _chunks() -> list[bytes]:
+    audio = np.array([0, 1, -1, 32767, -32767, 1234, -4321, 42], dtype=np.int16).tobytes()
+    return [audio[:3], audio[3:8], audio[8:]]
+
+
+def test_pcm_accumulator_int16():
+    buffer = PCMAccumulator(np.int16)
+    assert buffer.take() is None
+
+    for chunk in _chunks():
+        buffer.add(chunk)
+
+    assert len(buffer) == 3
+    audio = buffer.take()
+    assert audio is not None
+    assert audio.dtype == np.int16
+    assert audio.tolist() == [0, 1, -1, 32767, -32767, 1234, -4321, 42]
+    assert len(buffer) == 0
+    assert buffer.take() is None
+
+
+def test_pcm_accumulator_float32_matches_plain_conversion():
+    buffer = PCMAccumulator(np.float32)
+    for chunk in _chunks():
+        buffer.add(chunk)
+
+    audio = buffer.take()
+
+    expected = (
+        np.frombuffer(b"".join(_chunks()), dtype=np.int16).astype(np.float32) / 32767.0
+    ).reshape(-1, 1)
+    assert audio is not None
+    assert audio.dtype == np.float32
+    assert audio.shape == (8, 1)
+    np.testing.assert_array_equal(audio, expected)
+
+
+def test_pcm_accumulator_keeps_split_samples_for_the_next_take():
+    buffer = PCMAccumulator(np.int16)
+    buffer.add(np.array([7, 8], dtype=np.int16).tobytes()[:3])
+
+    first = buffer.take()
+    assert first is not None and first.tolist() == [7]
+
+    buffer.add(np.array([8], dtype=np.int16).tobytes()[1:])
+    second = buffer.take()
+    assert second is not None and second.tolist() == [8]
+
+
+def test_pcm_accumulator_does_not_copy_a_single_chunk():
+    chunk = np.arange(4, dtype=np.int16).tobytes()
+    buffer = PCMAccumulator(np.int16)
+    buffer.add(chunk)
+
+    audio = buffer.take()
+
+    assert audio is not None
+    assert audio.base is not None
+    assert audio.tolist() == [0, 1, 2, 3]
+
+
+def test_pcm_accumulator_rejects_other_dtypes():
+    with pytest.raises(UserError):
+        PCMAccumulator(np.float64)
+
+
+def test_pcm_ring_buffer_keeps_the_most_recent_samples():
+    buffer = PCMRingBuffer(max_samples=5)
+    assert buffer.to_base64() == ""
+
+    buffer.write(np.array([1, 2, 3], dtype=np.int16))
+    buffer.write(np.array([4, 5, 6, 7], dtype=np.int16))
+
+    assert len(buffer) == 5
+    assert len(buffer._buffer) == 5
+    expected = np.array([3, 4, 5, 6, 7], dtype=np.int16).tobytes()
+    assert buffer.to_base64() == base64.b64encode(expected).decode("utf-8")
+
+    buffer.write(np.arange(10, dtype=np.int16))
+    assert np.frombuffer(base64.b64decode(buffer.to_base64()), np.int16).tolist() == [5, 6, 7, 8, 9]
+
+    buffer.clear()
+    assert len(buffer) == 0
+    assert buffer.to_base64() == ""
+
+
+def test_pcm_ring_buffer_accepts_empty_chunks():
+    buffer = PCMRingBuffer(max_samples=5)
+    buffer.write(np.empty(0, dtype=np.int16))
+    assert len(buffer) == 0
+
+    buffer.write(np.array([1, 2], dtype=np.int16))
+    buffer.clear()
+    buffer.write(np.empty((0, 1), dtype=np.float32))
+    assert len(buffer) == 0
+    assert buffer.to_base64() == ""
+
+
+def test_pcm_ring_buffer_converts_float32_audio():
+    buffer = PCMRingBuffer(max_samples=10)
+    buffer.write(np.array([[0.0], [1.0], [-2.0]], dtype=np.float32))
+
+    assert np.frombuffer(base64.b64decode(buffer.to_base64()), np.int16).tolist() == [
+        0,
+        32767,
+        -32767,
+    ]
+
+
+@pytest.mark.parametrize("split", [0, 1, 2, 3, 4, 5, 7])
+def test_b64encode_parts_matches_plain_encoding(split):
+    data = bytes(range(256)) * 3 + b"end"
+    parts = [
+        memoryview(data[:split]),
+        memoryview(data[split : split + 1]),
+        memoryview(data)[split + 1 :],
+    ]
+
+    assert _b64encode_parts(parts) == base64.b64encode(data).decode("ascii")
@@ -1,11 +1,21 @@
 from __future__ import annotations
 
+import asyncio
+import time
+from collections.abc import AsyncIterator
+
 import numpy as np
 import numpy.typing as npt
 import pytest
 
 try:
-    from agents.voice import AudioInput, TTSModelSettings, VoicePipeline, VoicePipelineConfig
+    from agents.voice import (
+        AudioInput,
+        TTSModelSettings,
+        VoicePipeline,
+        VoicePipelineConfig,
+        VoiceWorkflowBase,
+    )
 
     from .fake_models import FakeStreamedAudioInput, FakeSTT, FakeTTS, FakeWorkflow
     from .helpers import extract_events
@@ -177,3 +187,27 @@ async def test_voicepipeline_transform_data() -> None:
         "session_ended",
     ]
     await fake_tts.verify_audio("out_1", audio_chunks[0], dtype=np.int16)
+
+
+@pytest.mark.asyncio
+async def test_voicepipeline_dispatcher_idles_while_waiting_for_text() -> None:
+    # While the workflow is slow to produce the next segment, the audio dispatcher should sleep
+    # instead of spinning the event loop.
+    idle_cpu_time: list[float] = []
+
+    class SlowWorkflow(VoiceWorkflowBase):
+        async def run(self, _: str) -> AsyncIterator[str]:
+            yield "This is the first sentence. And a second one. "
+            start = time.process_time()
+            await asyncio.sleep(0.3)
+            idle_cpu_time.append(time.process_time() - start)
+            yield "And this is the last one."
+
+    pipeline = VoicePipeline(
+        workflow=SlowWorkflow(), stt_model=FakeSTT(["first"]), tts_model=FakeTTS()
+    )
+    result = await pipeline.run(AudioInput(buffer=np.zeros(2, dtype=np.int16)))
+    events, _ = await extract_events(result)
+
+    assert events == ["turn_started", "audio", "audio", "turn_ended", "session_ended"]
+    assert idle_cpu_time[0] < 0.05
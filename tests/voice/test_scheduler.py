@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+
+import numpy as np
+import pytest
+
+try:
+    from agents.exceptions import UserError
+    from agents.voice import (
+        AudioInput,
+        StreamedAudioResult,
+        TTSModel,
+        TTSModelSettings,
+        TTSPhraseCache,
+        TTSScheduler,
+        VoicePipeline,
+        VoicePipelineConfig,
+    )
+
+    from .fake_models import FakeSTT, FakeWorkflow
+    from .helpers import extract_events
+except ImportError:
+    pass
+
+
+class SlowTTS(TTSModel):
+    """Takes a while per segment, returns the segment's length as audio, and records concurrency."""
+
+    def __init__(self) -> None:
+        self.texts: list[str] = []
+        self.running = 0
+        self.max_running = 0
+
+    @property
+    def model_name(self) -> str:
+        return "slow_tts"
+
+    async def run(self, text: str, settings: TTSModelSettings) -> AsyncIterator[bytes]:
+        self.texts.append(text)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(0.01)
+            yield np.array([len(text)], dtype=np.int16).tobytes()
+        finally:
+            self.running -= 1
+
+
+@pytest.mark.asyncio
+async def test_scheduler_runs_the_highest_priority_waiter_first():
+    scheduler = TTSScheduler(max_concurrency=1)
+    priorities = {"a": 3, "b": 1, "c": 2}
+    order: list[str] = []
+
+    async def request(name: str) -> None:
+        async with scheduler.slot(lambda: priorities[name]):
+            order.append(name)
+            await asyncio.sleep(0)
+
+    async with scheduler.slot():
+        tasks = [asyncio.create_task(request(name)) for name in "abc"]
+        await asyncio.sleep(0)
+        assert scheduler.waiting == 3
+        # Priorities are evaluated when a slot frees up, so they can change while waiting
+        priorities["a"] = 0
+    await asyncio.gather(*tasks)
+
+    assert order == ["a", "b", "c"]
+    assert scheduler.active == 0
+
+
+@pytest.mark.asyncio
+async def test_scheduler_cancelled_waiters_give_up_their_place():
+    scheduler = TTSScheduler(max_concurrency=1)
+
+    async def request() -> None:
+        async with scheduler.slot():
+            await asyncio.sleep(0)
+
+    async with scheduler.slot():
+        cancelled = asyncio.create_task(request())
+        waiting = asyncio.create_task(request())
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        assert scheduler.waiting == 1
+    await waiting
+
+    assert scheduler.active == 0
+    assert scheduler.waiting == 0
+
+
+def test_phrase_cache_evicts_least_recently_used_phrases():
+    cache = TTSPhraseCache(max_bytes=10, max_text_length=20)
+    settings = TTSModelSettings()
+
+    cache.put("model", "hello", settings, [b"12345"])
+    cache.put("model", "bye", settings, [b"123", b"45"])
+    assert cache.get("model", "hello", settings) == [b"12345"]
+    cache.put("model", "welcome", settings, [b"12345"])
+
+    assert cache.get("model", "bye", settings) is None
+    assert cache.get("model", "hello", settings) == [b"12345"]
+    assert cache.get("other_model", "hello", settings) is None
+    assert cache.get("model", "hello", TTSModelSettings(voice="nova")) is None
+    assert cache.size == 10
+    assert (cache.hits, cache.misses) == (2, 3)
+
+    cache.put("model", "this text is too long to cache", settings, [b"1"])
+    assert cache.get("model", "this text is too long to cache", settings) is None
+
+
+@pytest.mark.asyncio
+async def test_pipeline_synthesizes_a_limited_number_of_segments_ahead():
+    tts = SlowTTS()
+    sentences = [f"This is sentence number {i}. " for i in range(8)]
+    config = VoicePipelineConfig(
+        tts_settings=TTSModelSettings(buffer_size=1),
+        tts_prefetch_depth=1,
+        tts_scheduler=TTSScheduler(max_concurrency=10),
+    )
+    pipeline = VoicePipeline(
+        workflow=FakeWorkflow([sentences]),
+        stt_model=FakeSTT(["first"]),
+        tts_model=tts,
+        config=config,
+    )
+
+    result = await pipeline.run(AudioInput(buffer=np.zeros(2, dtype=np.int16)))
+    events, audio_chunks = await extract_events(result)
+
+    assert events.count("audio") == 8
+    assert tts.texts == [sentence.strip() for sentence in sentences]
+    # The playing segment, and one segment ahead of it
+    assert tts.max_running == 2
+    assert [np.frombuffer(chunk, np.int16)[0] for chunk in audio_chunks] == [
+        len(sentence.strip()) for sentence in sentences
+    ]
+
+
+def test_negative_prefetch_depth_is_rejected():
+    with pytest.raises(UserError):
+        StreamedAudioResult(
+            SlowTTS(), TTSModelSettings(), VoicePipelineConfig(tts_prefetch_depth=-1)
+        )
+
+
+@pytest.mark.asyncio
+async def test_pipeline_scheduler_limits_concurrency_across_pipelines():
+    tts = SlowTTS()
+    scheduler = TTSScheduler(max_concurrency=2)
+
+    async def run_pipeline() -> list[str]:
+        config = VoicePipelineConfig(
+            tts_settings=TTSModelSettings(buffer_size=1),
+            tts_prefetch_depth=5,
+            tts_scheduler=scheduler,
+        )
+        pipeline = VoicePipeline(
+            workflow=FakeWorkflow(
+                [["The first sentence is here. ", "The second sentence is here. ", "The end."]]
+            ),
+            stt_model=FakeSTT(["first"]),
+            tts_model=tts,
+            config=config,
+        )
+        result = await pipeline.run(AudioInput(buffer=np.zeros(2, dtype=np.int16)))
+        events, _ = await extract_events(result)
+        return events
+
+    results = await asyncio.gather(*(run_pipeline() for _ in range(3)))
+
+    assert all(events.count("audio") == 3 for events in results)
+    assert len(tts.texts) == 9
+    assert tts.max_running == 2
+
+
+@pytest.mark.asyncio
+async def test_pipeline_reuses_cached_phrases():
+    tts = SlowTTS()
+    cache = TTSPhraseCache()
+    config = VoicePipelineConfig(tts_settings=TTSModelSettings(buffer_size=1), tts_cache=cache)
+
+    for _ in range(2):
+        pipeline = VoicePipeline(
+            workflow=FakeWorkflow([["Hello, how can I help you today?"]]),
+            stt_model=FakeSTT(["first"]),
+            tts_model=tts,
+            config=config,
+        )
+        result = await pipeline.run(AudioInput(buffer=np.zeros(2, dtype=np.int16)))
+        events, audio_chunks = await extract_events(result)
+        assert events == ["turn_started", "audio", "turn_ended", "session_ended"]
+        assert np.frombuffer(audio_chunks[0], np.int16)[0] == 32
+
+    assert tts.texts == ["Hello, how can I help you today?"]
+    assert cache.hits == 1
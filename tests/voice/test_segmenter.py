@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+
+import pytest
+
+try:
+    from agents.voice import SentenceSegmenter, segment_text_stream
+except ImportError:
+    pass
+
+
+def _push_all(segmenter: SentenceSegmenter, deltas: list[str]) -> list[str]:
+    segments: list[str] = []
+    for delta in deltas:
+        segments.extend(segmenter.push(delta))
+    return segments
+
+
+def test_segmenter_emits_complete_sentences():
+    segmenter = SentenceSegmenter()
+    text = "Hello there, this is the first sentence. And here is the second one! And a third"
+
+    segments = _push_all(segmenter, list(text))
+
+    assert segments == [
+        "Hello there, this is the first sentence.",
+        "And here is the second one!",
+    ]
+    assert segmenter.flush() == "And a third"
+    assert segmenter.flush() == ""
+
+
+def test_segmenter_combines_short_sentences():
+    segmenter = SentenceSegmenter(min_sentence_length=20)
+
+    segments = _push_all(segmenter, ["Hi. ", "Yes. ", "It works fine. ", "Next"])
+
+    assert segments == ["Hi. Yes. It works fine."]
+    assert segmenter.flush() == "Next"
+
+
+def test_segmenter_skips_abbreviations_and_initials():
+    segmenter = SentenceSegmenter(min_sentence_length=0)
+    text = "Dr. Smith met J. R. Tolkien, e.g. at the pub. Then they left."
+
+    segments = _push_all(segmenter, [word + " " for word in text.split()] + ["Done"])
+
+    assert segments == ["Dr. Smith met J. R. Tolkien, e.g. at the pub.", "Then they left."]
+
+
+def test_segmenter_handles_closing_quotes():
+    segmenter = SentenceSegmenter(min_sentence_length=0)
+
+    segments = _push_all(segmenter, ['She said "stop." ', "Then"])
+
+    assert segments == ['She said "stop."']
+
+
+def test_segmenter_flushes_clauses_after_max_latency():
+    now = [0.0]
+    segmenter = SentenceSegmenter(max_latency_ms=100, clock=lambda: now[0])
+
+    assert segmenter.push("This is a very long sentence, ") == []
+    assert segmenter.push("with several clauses") == []
+    now[0] = 0.2
+    # The sentence isn't complete, so the text is emitted up to the last clause boundary.
+    assert segmenter.push(" and") == ["This is a very long sentence,"]
+
+    now[0] = 0.25
+    assert segmenter.push(" it keeps going") == []
+    now[0] = 0.4
+    # Without a clause boundary, the text is emitted up to the last complete word.
+    assert segmenter.push(" on") == ["with several clauses and it keeps going"]
+    assert segmenter.flush() == "on"
+
+
+def test_segmenter_scans_only_new_text():
+    segmenter = SentenceSegmenter()
+    scanned: list[int] = []
+    original_scan = segmenter._scan
+
+    def counting_scan() -> bool:
+        scanned.append(len(segmenter._buffer) - segmenter._scan_from)
+        return original_scan()
+
+    segmenter._scan = counting_scan  # type: ignore[method-assign]
+    for _ in range(2000):
+        segmenter.push("word ")
+
+    # Each push only scans the last word again, not the whole buffer.
+    assert max(scanned) <= len("word word ")
+
+
+@pytest.mark.asyncio
+async def test_segment_text_stream():
+    async def deltas() -> AsyncIterator[str]:
+        for word in "The first sentence is here. The second sentence is here. The end".split(" "):
+            yield word + " "
+
+    segments = [segment async for segment in segment_text_stream(deltas())]
+
+    assert segments == [
+        "The first sentence is here.",
+        "The second sentence is here.",
+        "The end",
+    ]
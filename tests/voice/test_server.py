@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+
+import numpy as np
+import pytest
+
+try:
+    from agents.voice import (
+        AudioInput,
+        StreamedAudioInput,
+        StreamedAudioResult,
+        STTModel,
+        STTModelSettings,
+        TTSModel,
+        VoiceModelProvider,
+        VoicePipelineConfig,
+        VoiceServer,
+        VoiceServerOverloadedError,
+        VoiceWorkflowBase,
+    )
+
+    from .fake_models import FakeStreamedAudioInput, FakeSTT, FakeTTS, FakeWorkflow
+    from .helpers import extract_events
+except ImportError:
+    pass
+
+
+class CountingProvider(VoiceModelProvider):
+    def __init__(self) -> None:
+        self.created = 0
+
+    def get_stt_model(self, model_name: str | None) -> STTModel:
+        self.created += 1
+        return FakeSTT(["hello"] * 10)
+
+    def get_tts_model(self, model_name: str | None) -> TTSModel:
+        self.created += 1
+        return FakeTTS()
+
+
+class BlockingWorkflow(VoiceWorkflowBase):
+    """Waits until it's released, so the session stays active."""
+
+    def __init__(self, release: asyncio.Event):
+        self.release = release
+
+    async def run(self, transcription: str) -> AsyncIterator[str]:
+        await self.release.wait()
+        yield "This is the reply to the session."
+
+
+def _audio() -> AudioInput:
+    return AudioInput(buffer=np.zeros(2, dtype=np.int16))
+
+
+async def _finish(result: StreamedAudioResult) -> list[str]:
+    events, _ = await extract_events(result)
+    # Let the session's task (which the end of the stream cancels) finish
+    assert result.text_generation_task is not None
+    await asyncio.gather(result.text_generation_task, return_exceptions=True)
+    return events
+
+
+@pytest.mark.asyncio
+async def test_server_shares_models_between_isolated_sessions():
+    provider = CountingProvider()
+    server = VoiceServer(config=VoicePipelineConfig(model_provider=provider))
+
+    workflows = [FakeWorkflow([["Hello from the first session."]]), FakeWorkflow([["Hi two."]])]
+    results = [await server.run(workflow, _audio()) for workflow in workflows]
+    outputs = [await _finish(result) for result in results]
+
+    assert provider.created == 2
+    assert all(
+        events == ["turn_started", "audio", "turn_ended", "session_ended"] for events in outputs
+    )
+    assert [result.total_output_text for result in results] == [
+        "Hello from the first session.",
+        "Hi two.",
+    ]
+    # Each session gets its own trace group
+    assert results[0]._voice_pipeline_config.group_id != results[1]._voice_pipeline_config.group_id
+
+    metrics = server.metrics()
+    assert metrics.active_sessions == 0
+    assert metrics.completed_sessions == 2
+    assert metrics.time_to_first_audio_p50 is not None
+    assert metrics.time_to_first_audio_p95 is not None
+
+
+@pytest.mark.asyncio
+async def test_server_admission_control():
+    server = VoiceServer(
+        stt_model=FakeSTT(["hello"] * 10),
+        tts_model=FakeTTS(),
+        max_sessions=2,
+        max_queued_sessions=1,
+    )
+    release = asyncio.Event()
+
+    results = [await server.run(BlockingWorkflow(release), _audio()) for _ in range(2)]
+    queued = asyncio.create_task(server.run(BlockingWorkflow(release), _audio()))
+    await asyncio.sleep(0)
+
+    metrics = server.metrics()
+    assert (metrics.active_sessions, metrics.queued_sessions) == (2, 1)
+
+    # The queue is full as well
+    with pytest.raises(VoiceServerOverloadedError):
+        await server.run(BlockingWorkflow(release), _audio())
+    assert server.metrics().rejected_sessions == 1
+
+    release.set()
+    for result in results:
+        await _finish(result)
+    await _finish(await queued)
+
+    metrics = server.metrics()
+    assert (metrics.active_sessions, metrics.queued_sessions) == (0, 0)
+    assert metrics.completed_sessions == 3
+
+
+@pytest.mark.asyncio
+async def test_server_rejects_sessions_after_the_admission_timeout():
+    server = VoiceServer(
+        stt_model=FakeSTT(["hello"] * 10),
+        tts_model=FakeTTS(),
+        max_sessions=1,
+        max_queued_sessions=5,
+        admission_timeout=0.01,
+    )
+    release = asyncio.Event()
+    result = await server.run(BlockingWorkflow(release), _audio())
+
+    with pytest.raises(VoiceServerOverloadedError):
+        await server.run(BlockingWorkflow(release), _audio())
+
+    release.set()
+    await _finish(result)
+    assert server.metrics().rejected_sessions == 1
+    assert server.metrics().active_sessions == 0
+
+
+@pytest.mark.asyncio
+async def test_server_counts_failed_and_streamed_sessions():
+    server = VoiceServer(stt_model=FakeSTT(["first", "second", "third"]), tts_model=FakeTTS())
+
+    failing = await server.run(FakeWorkflow([]), _audio())
+    with pytest.raises(ValueError):
+        await _finish(failing)
+    assert failing.text_generation_task is not None
+    await asyncio.gather(failing.text_generation_task, return_exceptions=True)
+
+    streamed_input: StreamedAudioInput = await FakeStreamedAudioInput.get(count=2)
+    streamed = await server.run(FakeWorkflow([["out_1"], ["out_2"]]), streamed_input)
+    events = await _finish(streamed)
+
+    assert events.count("turn_ended") == 2
+    metrics = server.metrics()
+    assert metrics.failed_sessions == 1
+    assert metrics.completed_sessions == 1
+    assert metrics.active_sessions == 0
+
+
+class BlockingSTT(FakeSTT):
+    """Transcribes until it's cancelled."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.started = asyncio.Event()
+
+    async def transcribe(self, _: AudioInput, __: STTModelSettings, ___: bool, ____: bool) -> str:
+        self.started.set()
+        await asyncio.Event().wait()
+        return ""
+
+
+@pytest.mark.asyncio
+async def test_server_releases_sessions_that_are_cancelled_before_they_start():
+    stt = BlockingSTT()
+    server = VoiceServer(stt_model=stt, tts_model=FakeTTS(), max_sessions=1)
+
+    session = asyncio.create_task(server.run(FakeWorkflow([["Hello."]]), _audio()))
+    await stt.started.wait()
+    session.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await session
+
+    metrics = server.metrics()
+    assert metrics.active_sessions == 0
+    assert metrics.completed_sessions == 1
+    assert metrics.failed_sessions == 0
+
+    server.stt_model = FakeSTT(["hello"])
+    events = await _finish(await server.run(FakeWorkflow([["Hello."]]), _audio()))
+    assert events[-1] == "session_ended"
+
+
+@pytest.mark.asyncio
+async def test_server_releases_sessions_whose_pipeline_cannot_be_created(monkeypatch):
+    server = VoiceServer(stt_model=FakeSTT(["hello"]), tts_model=FakeTTS(), max_sessions=1)
+
+    def fail(**kwargs: object) -> None:
+        raise ValueError("invalid pipeline")
+
+    with monkeypatch.context() as patch:
+        patch.setattr("agents.voice.server.VoicePipeline", fail)
+        with pytest.raises(ValueError):
+            await server.run(FakeWorkflow([["Hello."]]), _audio())
+
+    assert server.metrics().active_sessions == 0
+    assert server.metrics().failed_sessions == 1
+    await _finish(await server.run(FakeWorkflow([["Hello."]]), _audio()))